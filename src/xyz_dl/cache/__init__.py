@@ -1,5 +1,6 @@
 """缓存系统模块"""
 
 from .cache_manager import CacheManager, CacheEntry
+from .episode_cache import DEFAULT_EPISODE_CACHE_TTL, EpisodeCache
 
-__all__ = ["CacheManager", "CacheEntry"]
+__all__ = ["CacheManager", "CacheEntry", "EpisodeCache", "DEFAULT_EPISODE_CACHE_TTL"]
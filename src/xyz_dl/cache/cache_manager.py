@@ -76,32 +76,34 @@ class CacheManager:
     async def get(self, url: str) -> Optional[CacheEntry]:
         """获取缓存条目
 
+        查找过程中没有 await 点，在事件循环内天然是原子的，
+        因此读路径不获取锁，避免缓存命中时的锁开销
+
         Args:
             url: 请求URL
 
         Returns:
             缓存条目或None
         """
-        async with self._lock:
-            entry = self._cache.get(url)
+        entry = self._cache.get(url)
 
-            if entry is None:
-                self._stats["misses"] += 1
-                return None
+        if entry is None:
+            self._stats["misses"] += 1
+            return None
 
-            # 检查是否过期
-            if entry.is_expired(self.ttl_seconds):
-                del self._cache[url]
-                self._stats["misses"] += 1
-                self._update_memory_stats()
-                return None
+        # 检查是否过期
+        if entry.is_expired(self.ttl_seconds):
+            del self._cache[url]
+            self._stats["misses"] += 1
+            self._stats["current_memory"] -= entry.size_bytes
+            return None
 
-            # 更新访问计数和位置（LRU）
-            entry.access_count += 1
-            self._cache.move_to_end(url)
-            self._stats["hits"] += 1
+        # 更新访问计数和位置（LRU）
+        entry.access_count += 1
+        self._cache.move_to_end(url)
+        self._stats["hits"] += 1
 
-            return entry
+        return entry
 
     async def set(self, url: str, content: bytes, headers: Dict[str, str]) -> None:
         """设置缓存条目
@@ -156,17 +158,17 @@ class CacheManager:
             self._stats = {"hits": 0, "misses": 0, "evictions": 0, "current_memory": 0}
 
     async def get_stats(self) -> Dict[str, Any]:
-        """获取缓存统计信息"""
-        async with self._lock:
-            return {
-                **self._stats,
-                "entries": len(self._cache),
-                "hit_rate": (
-                    self._stats["hits"] / (self._stats["hits"] + self._stats["misses"])
-                    if (self._stats["hits"] + self._stats["misses"]) > 0
-                    else 0
-                ),
-            }
+        """获取缓存统计信息
+
+        只读取计数器，没有 await 点，无需获取锁
+        """
+        stats = self._stats
+        total = stats["hits"] + stats["misses"]
+        return {
+            **stats,
+            "entries": len(self._cache),
+            "hit_rate": stats["hits"] / total if total > 0 else 0,
+        }
 
     async def _evict_if_needed(self) -> None:
         """执行LRU淘汰"""
@@ -0,0 +1,123 @@
+"""节目解析结果磁盘缓存
+
+以节目ID为键，将解析出的节目信息和音频URL保存到JSON文件，
+重复处理同一节目时跳过页面请求和HTML解析
+"""
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+from urllib.parse import urlsplit
+
+from ..models import EpisodeInfo
+
+# 默认缓存有效期(秒)
+DEFAULT_EPISODE_CACHE_TTL = 6 * 60 * 60  # 6小时
+
+
+def default_cache_path() -> Path:
+    """返回默认缓存文件路径，遵循XDG_CACHE_HOME约定"""
+    cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(cache_home) / "xyz-dl" / "episodes.json"
+
+
+class EpisodeCache:
+    """节目解析结果缓存
+
+    缓存文件在首次访问时加载一次，之后的查询都在内存中完成；
+    写入时先写临时文件再替换，避免中断时留下损坏的缓存文件。
+    读写都加锁，可以在线程池中并发调用。
+    缓存只是加速手段，读写失败时静默退回正常解析流程
+    """
+
+    def __init__(
+        self,
+        cache_path: Optional[Path] = None,
+        ttl_seconds: int = DEFAULT_EPISODE_CACHE_TTL,
+    ):
+        """初始化节目缓存
+
+        Args:
+            cache_path: 缓存文件路径，None表示使用默认路径
+            ttl_seconds: 缓存有效期(秒)
+        """
+        self.cache_path = Path(cache_path) if cache_path else default_cache_path()
+        self.ttl_seconds = ttl_seconds
+        self._entries: Optional[Dict[str, Dict[str, Any]]] = None
+        self._lock = threading.Lock()
+
+    def get(self, episode_id: str) -> Optional[tuple[EpisodeInfo, str]]:
+        """获取未过期的缓存结果
+
+        Args:
+            episode_id: 节目ID
+
+        Returns:
+            (节目信息, 音频URL)，未命中或已过期时返回None
+        """
+        with self._lock:
+            entry = self._load().get(episode_id)
+        if entry is None or self._is_expired(entry):
+            return None
+
+        try:
+            episode_info = EpisodeInfo.model_validate(entry["episode"])
+            return episode_info, entry["audio_url"]
+        except (KeyError, ValueError):
+            return None
+
+    def set(self, episode_id: str, episode_info: EpisodeInfo, audio_url: str) -> None:
+        """缓存解析结果
+
+        带查询参数的音频URL通常是带签名、会过期的地址，不进行缓存
+
+        Args:
+            episode_id: 节目ID
+            episode_info: 节目信息
+            audio_url: 音频URL
+        """
+        if urlsplit(audio_url).query:
+            return
+
+        with self._lock:
+            entries = self._load()
+            entries[episode_id] = {
+                "ts": time.time(),
+                "episode": episode_info.model_dump(),
+                "audio_url": audio_url,
+            }
+
+            # 顺带清理过期条目，防止缓存文件无限增长
+            for key in [k for k, v in entries.items() if self._is_expired(v)]:
+                del entries[key]
+
+            self._save(entries)
+
+    def _is_expired(self, entry: Dict[str, Any]) -> bool:
+        """检查缓存条目是否过期"""
+        return time.time() - entry.get("ts", 0) >= self.ttl_seconds
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        """加载缓存文件，每个实例只读取一次"""
+        if self._entries is None:
+            try:
+                with open(self.cache_path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                self._entries = data if isinstance(data, dict) else {}
+            except (OSError, ValueError):
+                self._entries = {}
+        return self._entries
+
+    def _save(self, entries: Dict[str, Dict[str, Any]]) -> None:
+        """原子写入缓存文件"""
+        tmp_path = self.cache_path.with_name(self.cache_path.name + ".tmp")
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(entries, f, ensure_ascii=False)
+            os.replace(tmp_path, self.cache_path)
+        except OSError:
+            tmp_path.unlink(missing_ok=True)
@@ -25,6 +25,7 @@ from rich.table import Table
 from rich.text import Text
 
 from .async_adapter import smart_run
+from .cache import DEFAULT_EPISODE_CACHE_TTL
 from .config import get_config
 from .downloader import XiaoYuZhouDL
 from .exceptions import XyzDlException
@@ -96,13 +97,21 @@ class CLIApplication:
   xyz-dl -u https://www.xiaoyuzhoufm.com/episode/12345678  # 只获取下载地址
   xyz-dl --url-only 12345678  # 只获取下载地址(使用episode ID)
   xyz-dl --timeout 60 https://www.xiaoyuzhoufm.com/episode/12345678  # 设置超时时间
+  xyz-dl 12345678 87654321  # 批量下载多个节目
+  xyz-dl --from-file urls.txt  # 从文件读取节目列表，每行一个
 
 更多信息请访问: https://github.com/slarkio/xyz-dl
             """,
         )
 
         parser.add_argument(
-            "url", nargs="?", help="小宇宙播客episode页面URL或episode ID"
+            "url", nargs="*", help="小宇宙播客episode页面URL或episode ID，可传入多个"
+        )
+        parser.add_argument(
+            "-f",
+            "--from-file",
+            metavar="FILE",
+            help="从文件读取episode URL或ID，每行一个，#开头的行为注释",
         )
 
         parser.add_argument(
@@ -128,6 +137,42 @@ class CLIApplication:
         parser.add_argument("--timeout", type=int, help="请求超时时间(秒)，默认30")
         parser.add_argument("--max-retries", type=int, help="最大重试次数，默认3")
         parser.add_argument("--user-agent", help="用户代理字符串")
+        parser.add_argument(
+            "-n",
+            "--connections",
+            type=int,
+            help="单个音频文件的并行分段下载连接数，默认1（服务器不支持Range时自动使用单连接）",
+        )
+        parser.add_argument(
+            "-j",
+            "--concurrency",
+            type=int,
+            help="批量下载时同时下载的音频数，默认3",
+        )
+
+        existing = parser.add_mutually_exclusive_group()
+        existing.add_argument(
+            "--overwrite", action="store_true", help="覆盖已存在的文件，不再询问"
+        )
+        existing.add_argument(
+            "--skip-existing", action="store_true", help="跳过已存在的文件，不再询问"
+        )
+
+        parser.add_argument(
+            "--cache-ttl",
+            type=int,
+            default=None,
+            help=(
+                "节目解析结果缓存有效期(秒)，默认读取XYZ_DL_EPISODE_CACHE_TTL，"
+                f"未设置时为{DEFAULT_EPISODE_CACHE_TTL}"
+            ),
+        )
+        parser.add_argument(
+            "--no-cache", action="store_true", help="不读取也不写入节目解析缓存"
+        )
+        parser.add_argument(
+            "--refresh", action="store_true", help="忽略已缓存的解析结果，重新解析"
+        )
 
         parser.add_argument("--version", action="version", version="%(prog)s 2.0.0")
 
@@ -205,50 +250,130 @@ class CLIApplication:
         error_text = Text(f"❌ 错误: {error}", style="bold red")
         self.console.print(Panel(error_text, border_style="red"))
 
-    async def run_download(self, args: argparse.Namespace) -> int:
-        """执行下载任务"""
+    def collect_urls(self, args: argparse.Namespace) -> List[str]:
+        """汇总命令行和文件中的URL，去重并保持顺序"""
+        urls = list(args.url)
+        if args.from_file:
+            with open(args.from_file, "r", encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if line and not line.startswith("#"):
+                        urls.append(line)
+        return list(dict.fromkeys(urls))
+
+    def build_config(self, args: argparse.Namespace, batch: bool = False) -> Config:
+        """加载基础配置并用命令行参数覆盖
+
+        Args:
+            args: 命令行参数
+            batch: 是否批量下载多个节目
+        """
+        config = get_config()
+
+        # 从命令行参数覆盖配置
+        config_dict = config.model_dump()
+        if args.timeout is not None:
+            config_dict["timeout"] = args.timeout
+        if args.max_retries is not None:
+            config_dict["max_retries"] = args.max_retries
+        if args.user_agent is not None:
+            config_dict["user_agent"] = args.user_agent
+        if args.connections is not None:
+            config_dict["download_connections"] = args.connections
+        if args.concurrency is not None:
+            config_dict["max_concurrent_downloads"] = args.concurrency
+        if args.overwrite or args.skip_existing:
+            # 明确指定处理方式时不再交互询问，适合脚本和批量下载
+            config_dict["non_interactive"] = True
+            config_dict["default_overwrite_behavior"] = args.overwrite
+        elif batch and not config.non_interactive:
+            # 批量下载时多个节目可能同时询问，默认跳过已存在的文件
+            config_dict["non_interactive"] = True
+            config_dict["default_overwrite_behavior"] = False
+        if args.no_cache:
+            config_dict["episode_cache_ttl"] = 0
+        elif args.cache_ttl is not None:
+            config_dict["episode_cache_ttl"] = args.cache_ttl
+        elif config.episode_cache_ttl is None:
+            # 环境变量未设置时命令行默认启用缓存，设置为0可关闭缓存
+            config_dict["episode_cache_ttl"] = DEFAULT_EPISODE_CACHE_TTL
+        config_dict["episode_cache_refresh"] = args.refresh
+
+        # 重新创建配置对象
+        return Config(**config_dict)
+
+    async def download_one(
+        self, downloader: XiaoYuZhouDL, url: str, args: argparse.Namespace
+    ) -> int:
+        """下载单个节目并打印结果"""
         try:
             # 创建下载请求
             request = DownloadRequest(
-                url=args.url,
+                url=url,
                 download_dir=args.dir,
                 mode=args.mode,
                 url_only=args.url_only,
             )
 
-            # 加载基础配置
-            config = get_config()
+            # 显示开始信息
+            self.console.print(f"🔍 正在解析: [link]{url}[/link]")
+
+            # 执行下载
+            result = await downloader.download(request)
+        except XyzDlException as e:
+            self.print_error(str(e))
+            return 1
+        except Exception as e:
+            self.print_error(f"意外错误: {e}")
+            return 1
+
+        if not result.success:
+            self.print_error(result.error or "Unknown error")
+            return 1
+
+        self.print_episode_info(result)
+        if args.url_only:
+            self.print_url_only_result(result)
+        else:
+            self.print_success_result(result)
+        return 0
+
+    async def run_download(self, args: argparse.Namespace) -> int:
+        """执行下载任务
+
+        多个节目共用同一个下载器及其HTTP会话，同时处理的节目数受
+        max_concurrent_downloads限制；批量下载时不交互询问
+        """
+        try:
+            urls = self.collect_urls(args)
+        except OSError as e:
+            self.print_error(f"无法读取URL列表文件: {e}")
+            return 1
+
+        if not urls:
+            self.print_error("未提供episode URL或ID")
+            return 1
 
-            # 从命令行参数覆盖配置
-            config_dict = config.model_dump()
-            if args.timeout is not None:
-                config_dict["timeout"] = args.timeout
-            if args.max_retries is not None:
-                config_dict["max_retries"] = args.max_retries
-            if args.user_agent is not None:
-                config_dict["user_agent"] = args.user_agent
+        try:
+            config = self.build_config(args, batch=len(urls) > 1)
+            # 限制同时处理的节目数，解析、提示和结果输出不会一次全部涌出
+            semaphore = asyncio.Semaphore(config.max_concurrent_downloads)
 
-            # 重新创建配置对象
-            config = Config(**config_dict)
             async with XiaoYuZhouDL(
                 config=config, progress_callback=self.progress_callback
             ) as downloader:
 
-                # 显示开始信息
-                self.console.print(f"🔍 正在解析: [link]{args.url}[/link]")
+                async def download_bounded(url: str) -> int:
+                    async with semaphore:
+                        return await self.download_one(downloader, url, args)
+
+                exit_codes = await asyncio.gather(*map(download_bounded, urls))
 
-                # 执行下载
-                result = await downloader.download(request)
+            if len(urls) > 1:
+                succeeded = exit_codes.count(0)
+                self.console.print(f"📦 批量下载完成: {succeeded}/{len(urls)} 成功")
 
-                if result.success:
-                    self.print_episode_info(result)
-                    if args.url_only:
-                        self.print_url_only_result(result)
-                    else:
-                        self.print_success_result(result)
-                else:
-                    self.print_error(result.error or "Unknown error")
-                    return 1
+            return 1 if any(exit_codes) else 0
 
         except XyzDlException as e:
             self.print_error(str(e))
@@ -260,8 +385,6 @@ class CLIApplication:
             self.print_error(f"意外错误: {e}")
             return 1
 
-        return 0
-
     async def main(self, argv: Optional[List[str]] = None) -> int:
         """主入口函数"""
         parser = self.create_parser()
@@ -272,7 +395,7 @@ class CLIApplication:
             self.print_banner()
 
         # 验证URL参数
-        if not args.url:
+        if not args.url and not args.from_file:
             parser.print_help()
             return 1
 
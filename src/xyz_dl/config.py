@@ -20,7 +20,7 @@ class Settings(BaseSettings):
     # 网络配置
     xyz_dl_timeout: int = 30
     xyz_dl_max_retries: int = 3
-    xyz_dl_chunk_size: int = 8192
+    xyz_dl_chunk_size: int = 65536
 
     # 用户代理
     xyz_dl_user_agent: str = (
@@ -32,6 +32,7 @@ class Settings(BaseSettings):
 
     # 并发设置
     xyz_dl_max_concurrent_downloads: int = 3
+    xyz_dl_download_connections: int = 1
 
     # 交互模式设置
     xyz_dl_non_interactive: bool = False
@@ -48,6 +49,10 @@ class Settings(BaseSettings):
     xyz_dl_connection_pool_size: int = 10
     xyz_dl_connection_timeout: float = 10.0
     xyz_dl_read_timeout: float = 30.0
+    xyz_dl_force_ipv4: bool = False
+
+    # 节目解析缓存配置
+    xyz_dl_episode_cache_ttl: Optional[int] = None  # 未设置时由调用方决定默认值
 
     def to_config(self) -> Config:
         """转换为 Config 模型"""
@@ -58,6 +63,7 @@ class Settings(BaseSettings):
             user_agent=self.xyz_dl_user_agent,
             max_filename_length=self.xyz_dl_max_filename_length,
             max_concurrent_downloads=self.xyz_dl_max_concurrent_downloads,
+            download_connections=self.xyz_dl_download_connections,
             non_interactive=self.xyz_dl_non_interactive,
             default_overwrite_behavior=self.xyz_dl_default_overwrite_behavior,
             debug_mode=self.xyz_dl_debug_mode,
@@ -68,6 +74,8 @@ class Settings(BaseSettings):
             connection_pool_size=self.xyz_dl_connection_pool_size,
             connection_timeout=self.xyz_dl_connection_timeout,
             read_timeout=self.xyz_dl_read_timeout,
+            force_ipv4=self.xyz_dl_force_ipv4,
+            episode_cache_ttl=self.xyz_dl_episode_cache_ttl,
         )
 
     model_config = SettingsConfigDict(
@@ -14,6 +14,9 @@ import aiohttp
 from ..config import Config
 from ..exceptions import NetworkError
 
+# 空闲连接保活时间(秒)，让同一客户端的后续请求复用TCP/TLS连接
+KEEPALIVE_TIMEOUT = 75
+
 
 def _sanitize_url_for_logging(url: str) -> str:
     """清理URL中的敏感信息用于日志记录
@@ -142,6 +145,7 @@ class HTTPClient:
             limit_per_host=self.config.connections_per_host,
             ttl_dns_cache=self.config.dns_cache_ttl,
             use_dns_cache=True,
+            keepalive_timeout=KEEPALIVE_TIMEOUT,
             enable_cleanup_closed=True,
         )
 
@@ -4,14 +4,28 @@
 """
 
 import asyncio
+import contextlib
 import ipaddress
 import os
 import re
+import socket
 import ssl
+import time
 import urllib.parse
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Callable, Dict, List, Optional, Union
+from types import MappingProxyType
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Union,
+)
 
 import aiofiles
 import aiohttp
@@ -25,12 +39,27 @@ from rich.progress import (
     TransferSpeedColumn,
 )
 
+# aiohttp借助brotli或brotlicffi解码br响应，安装其一时才声明br压缩
+try:
+    import brotli  # noqa: F401
+except ImportError:
+    try:
+        import brotlicffi  # noqa: F401
+    except ImportError:
+        _HAS_BROTLI = False
+    else:
+        _HAS_BROTLI = True
+else:
+    _HAS_BROTLI = True
+
 # 常量定义
 MAX_PATH_LENGTH = 260  # Windows路径长度限制
 MAX_DECODE_ITERATIONS = 10  # Unicode解码最大迭代次数
 DEFAULT_UNKNOWN_PODCAST = "未知播客"
 DEFAULT_UNKNOWN_AUTHOR = "未知作者"
 DEFAULT_SHOW_NOTES = "暂无节目介绍"
+FILENAME_DANGEROUS_CHARS = ":*?<>|"  # 文件名中禁止出现的字符
+FILENAME_DANGEROUS_CHARS_TABLE = str.maketrans("", "", FILENAME_DANGEROUS_CHARS)
 TEMP_DIRS = [
     "/tmp",
     "/var/folders",
@@ -38,12 +67,62 @@ TEMP_DIRS = [
     "/private/tmp",
 ]  # 安全的临时目录前缀
 
+# 路径遍历攻击模式（小写，匹配前路径已统一转为小写）
+PATH_TRAVERSAL_PATTERNS = (
+    "../",
+    "..\\",
+    "/..",
+    "\\..",
+    "%2e%2e",  # URL编码的..
+    "%2f",  # URL编码的/
+    "%5c",  # URL编码的\
+)
+
+# 危险的系统目录前缀（小写，分隔符统一为/）
+DANGEROUS_SYSTEM_PATHS = (
+    # Unix系统危险目录
+    "/etc",
+    "/bin",
+    "/sbin",
+    "/usr/bin",
+    "/usr/sbin",
+    "/var/log",
+    "/root",
+    "/boot",
+    "/sys",
+    "/proc",
+    # Windows系统危险目录
+    "c:/windows",
+    "c:/program files",
+    "c:/program files (x86)",
+    "c:/system32",
+    "c:/syswow64",
+    "windows/system32",  # 相对路径形式
+    "/c/windows",  # Unix式Windows路径
+)
+
 # HTTP安全常量
 HTTP_RESPONSE_SIZE_LIMIT = 500 * 1024 * 1024  # 500MB
-HTTP_CHUNK_SIZE_DEFAULT = 8192
+HTTP_CHUNK_SIZE_DEFAULT = 65536
 HTTP_TIMEOUT_DEFAULT = 30
 HTTP_REDIRECT_LIMIT = 3
 
+# 错误消息中需要隐藏取值的敏感参数
+_SENSITIVE_PARAM_RE = re.compile(
+    r"(token|key|password|auth|api_key)=[^&\s]+", re.IGNORECASE
+)
+
+# "节目名 - 主播名" 格式的节目标题
+_EPISODE_TITLE_RE = re.compile(r"(.*?) - (.*)", re.DOTALL)
+
+# HTML转纯文本的清理模式，按顺序应用
+_HTML_CLEAN_PATTERNS = (
+    (re.compile(r"<p[^>]*>"), "\n"),
+    (re.compile(r"</p>"), "\n"),
+    (re.compile(r"<br[^>]*/?>"), "\n"),
+    (re.compile(r"<[^>]+>"), ""),
+)
+
 # 安全的内部IP范围 (RFC 1918)
 PRIVATE_IP_RANGES = [
     "127.0.0.0/8",  # 本地回环
@@ -56,6 +135,7 @@ PRIVATE_IP_RANGES = [
 ]
 
 from .async_adapter import smart_run
+from .cache.episode_cache import EpisodeCache
 from .config import get_config
 from .exceptions import (
     DownloadError,
@@ -82,6 +162,7 @@ from .retry import (
     calculate_resume_position,
     create_range_headers,
     create_retry_decorator,
+    get_resume_validator,
 )
 
 
@@ -115,17 +196,7 @@ def _sanitize_error_message(message: str, url: Optional[str] = None) -> str:
         清理后的错误消息
     """
     # 替换可能的敏感信息模式
-    sensitive_patterns = [
-        (r"token=[^&\s]+", "token=***"),
-        (r"key=[^&\s]+", "key=***"),
-        (r"password=[^&\s]+", "password=***"),
-        (r"auth=[^&\s]+", "auth=***"),
-        (r"api_key=[^&\s]+", "api_key=***"),
-    ]
-
-    sanitized = message
-    for pattern, replacement in sensitive_patterns:
-        sanitized = re.sub(pattern, replacement, sanitized, flags=re.IGNORECASE)
+    sanitized = _SENSITIVE_PARAM_RE.sub(r"\1=***", message)
 
     # 如果提供了URL，替换为清理后的版本
     if url:
@@ -135,6 +206,112 @@ def _sanitize_error_message(message: str, url: Optional[str] = None) -> str:
     return sanitized
 
 
+def _split_byte_ranges(
+    total_size: int, parts: int, min_part_size: int
+) -> List[tuple[int, int]]:
+    """把文件按字节均分为若干段
+
+    Args:
+        total_size: 文件总大小
+        parts: 期望的分段数
+        min_part_size: 每段最小字节数，文件较小时相应减少分段
+
+    Returns:
+        (起始字节, 结束字节) 列表，结束字节包含在内，与Range头语义一致
+    """
+    parts = max(1, min(parts, total_size // max(min_part_size, 1)))
+    bounds = [i * total_size // parts for i in range(parts + 1)]
+    return [(bounds[i], bounds[i + 1] - 1) for i in range(parts)]
+
+
+# 音频请求头：音频已是压缩格式，要求服务器按原样传输，跳过压缩和解压
+_AUDIO_REQUEST_HEADERS: Mapping[str, str] = MappingProxyType(
+    {"Accept-Encoding": "identity"}
+)
+
+# 支持的音频文件扩展名
+_AUDIO_EXTENSIONS = (".m4a", ".mp3", ".wav", ".ogg")
+
+# 音频写入缓冲大小，累积到该字节数后批量写盘
+_WRITE_BUFFER_SIZE = 1 << 20  # 1MB
+
+# 下载进度刷新的最小间隔(秒)，避免每个数据块都刷新进度条和触发回调
+_PROGRESS_REPORT_INTERVAL = 0.1
+
+
+# 进程内共享的SSL上下文，避免每个会话重复加载系统CA证书
+_PRELOADED_SSL_CONTEXT: Optional[ssl.SSLContext] = None
+
+
+def _preallocate_file(fd: int, size: int) -> None:
+    """按最终大小为文件预分配磁盘空间
+
+    一次性分配连续空间，避免文件随写入逐步增长带来的碎片和元数据更新；
+    平台或文件系统不支持posix_fallocate时退回ftruncate
+
+    Args:
+        fd: 以可写方式打开的文件描述符
+        size: 文件最终大小
+    """
+    if hasattr(os, "posix_fallocate"):
+        try:
+            os.posix_fallocate(fd, 0, size)
+            return
+        except OSError:
+            pass
+    os.ftruncate(fd, size)
+
+
+def _url_audio_extension(audio_url: str) -> Optional[str]:
+    """返回URL路径中的音频扩展名，不是已知音频格式时返回None"""
+    extension = os.path.splitext(urllib.parse.urlsplit(audio_url).path)[1].lower()
+    return extension if extension in _AUDIO_EXTENSIONS else None
+
+
+def _display_name(file_path: Path) -> str:
+    """返回用于进度显示的文件名，下载中的临时文件显示为正式文件名"""
+    return file_path.stem if file_path.suffix == ".part" else file_path.name
+
+
+def _finalize_part_file(part_path: Path, file_path: Path) -> None:
+    """将下载完成的临时文件落盘后原子替换为正式文件
+
+    Args:
+        part_path: 下载中的临时文件路径
+        file_path: 正式文件路径
+    """
+    with open(part_path, "rb") as f:
+        os.fsync(f.fileno())
+    os.replace(part_path, file_path)
+
+
+def _get_preloaded_ssl_context() -> ssl.SSLContext:
+    """获取共享的安全SSL上下文，首次调用时创建
+
+    Returns:
+        启用证书验证、最低TLS 1.2的SSL上下文
+    """
+    global _PRELOADED_SSL_CONTEXT
+    if _PRELOADED_SSL_CONTEXT is None:
+        # 创建安全的SSL上下文
+        ssl_context = ssl.create_default_context()
+
+        # 强制使用强加密算法
+        ssl_context.set_ciphers(
+            "ECDHE+AESGCM:ECDHE+CHACHA20:DHE+AESGCM:DHE+CHACHA20:" "!aNULL:!MD5:!DSS"
+        )
+
+        # 设置最低TLS版本
+        ssl_context.minimum_version = ssl.TLSVersion.TLSv1_2
+
+        # 启用证书验证
+        ssl_context.check_hostname = True
+        ssl_context.verify_mode = ssl.CERT_REQUIRED
+
+        _PRELOADED_SSL_CONTEXT = ssl_context
+    return _PRELOADED_SSL_CONTEXT
+
+
 class SecureHTTPSessionManager:
     """安全HTTP会话管理器
 
@@ -142,20 +319,35 @@ class SecureHTTPSessionManager:
     大小限制、连接池配置等安全功能
     """
 
-    def __init__(self, config: Config):
+    def __init__(
+        self, config: Config, connector: Optional[aiohttp.BaseConnector] = None
+    ):
+        """初始化会话管理器
+
+        Args:
+            config: 配置对象
+            connector: 外部共享的连接器，提供时复用而不是新建，且关闭会话时不会关闭它
+        """
         self.config = config
+        self._connector = connector
         self._session: Optional[aiohttp.ClientSession] = None
+        # 安全头只依赖配置，初始化时计算一次并以只读视图复用
+        self._secure_headers: Mapping[str, str] = MappingProxyType(
+            self._build_secure_headers()
+        )
 
     async def create_session(self) -> aiohttp.ClientSession:
         """创建安全配置的HTTP会话"""
         if self._session is not None:
             return self._session
 
-        # 配置SSL上下文
-        ssl_context = self._create_ssl_context()
-
-        # 配置连接器
-        connector = self._create_connector(ssl_context)
+        # 配置连接器 - 优先复用外部注入的连接器
+        connector: aiohttp.BaseConnector
+        if self._connector is not None:
+            connector = self._connector
+        else:
+            ssl_context = self._create_ssl_context()
+            connector = self._create_connector(ssl_context)
 
         # 配置超时
         timeout = self._create_timeout_config()
@@ -166,6 +358,7 @@ class SecureHTTPSessionManager:
         # 创建会话
         self._session = aiohttp.ClientSession(
             connector=connector,
+            connector_owner=self._connector is None,  # 共享连接器由调用方管理
             timeout=timeout,
             headers=headers,
             auto_decompress=True,  # 自动解压缩
@@ -192,22 +385,8 @@ class SecureHTTPSessionManager:
             )
             return False
 
-        # 创建安全的SSL上下文
-        ssl_context = ssl.create_default_context()
-
-        # 强制使用强加密算法
-        ssl_context.set_ciphers(
-            "ECDHE+AESGCM:ECDHE+CHACHA20:DHE+AESGCM:DHE+CHACHA20:" "!aNULL:!MD5:!DSS"
-        )
-
-        # 设置最低TLS版本
-        ssl_context.minimum_version = ssl.TLSVersion.TLSv1_2
-
-        # 启用证书验证
-        ssl_context.check_hostname = True
-        ssl_context.verify_mode = ssl.CERT_REQUIRED
-
-        return ssl_context
+        # 复用进程内共享的安全SSL上下文
+        return _get_preloaded_ssl_context()
 
     def _create_connector(
         self, ssl_context: Union[ssl.SSLContext, bool]
@@ -219,6 +398,8 @@ class SecureHTTPSessionManager:
             limit_per_host=self.config.connections_per_host,
             ttl_dns_cache=self.config.dns_cache_ttl,
             use_dns_cache=True,
+            # 仅IPv4时跳过AAAA查询；默认0表示同时解析IPv4/IPv6
+            family=socket.AF_INET if self.config.force_ipv4 else 0,
             enable_cleanup_closed=True,
         )
 
@@ -231,14 +412,23 @@ class SecureHTTPSessionManager:
             sock_connect=self.config.connection_timeout,  # Socket连接超时
         )
 
-    def _create_secure_headers(self) -> Dict[str, str]:
-        """创建安全的HTTP头"""
+    def _create_secure_headers(self) -> Mapping[str, str]:
+        """获取安全的HTTP头（只读，会话间共享）"""
+        return self._secure_headers
+
+    def _build_secure_headers(self) -> Dict[str, str]:
+        """构建安全的HTTP头"""
         headers = {"User-Agent": self.config.user_agent, **self.config.security_headers}
 
         # 移除可能暴露信息的头
         headers.pop("Server", None)
         headers.pop("X-Powered-By", None)
 
+        # 安装了brotli时额外声明br压缩，页面传输量比gzip更小
+        accept_encoding = headers.get("Accept-Encoding")
+        if _HAS_BROTLI and accept_encoding and "br" not in accept_encoding:
+            headers["Accept-Encoding"] = f"{accept_encoding}, br"
+
         return headers
 
     async def close_session(self) -> None:
@@ -258,8 +448,38 @@ class SecureHTTPSessionManager:
             True 表示安全，False 表示不安全
         """
         try:
-            parsed = urllib.parse.urlparse(url)
             original_parsed = urllib.parse.urlparse(original_url)
+        except Exception:
+            # 解析失败，认为不安全
+            return False
+        return self._validate_redirect_url_parsed(url, original_parsed)
+
+    def _validate_redirect_urls(
+        self, urls: Iterable[str], original_url: str
+    ) -> List[bool]:
+        """批量验证重定向URL，原始URL只解析一次
+
+        Args:
+            urls: 重定向目标URL序列
+            original_url: 原始URL
+
+        Returns:
+            与输入顺序一致的验证结果列表
+        """
+        try:
+            original_parsed = urllib.parse.urlparse(original_url)
+        except Exception:
+            return [False for _ in urls]
+        return [
+            self._validate_redirect_url_parsed(url, original_parsed) for url in urls
+        ]
+
+    def _validate_redirect_url_parsed(
+        self, url: str, original_parsed: urllib.parse.ParseResult
+    ) -> bool:
+        """使用已解析的原始URL验证重定向目标"""
+        try:
+            parsed = urllib.parse.urlparse(url)
 
             # 检查协议是否安全
             if parsed.scheme not in ["http", "https"]:
@@ -424,6 +644,8 @@ class XiaoYuZhouDL:
         parser: Optional[CompositeParser] = None,
         progress_callback: Optional[Callable[[DownloadProgress], None]] = None,
         secure_filename: bool = True,
+        connector: Optional[aiohttp.BaseConnector] = None,
+        episode_cache: Optional[EpisodeCache] = None,
     ):
         """初始化下载器
 
@@ -432,13 +654,22 @@ class XiaoYuZhouDL:
             parser: 解析器对象，如果为None则使用默认解析器
             progress_callback: 进度回调函数
             secure_filename: 是否使用安全的文件名清理器
+            connector: 共享的HTTP连接器，如果为None则每个会话新建连接器
+            episode_cache: 节目解析结果缓存，如果为None则按配置的episode_cache_ttl创建
         """
         self.config = config or get_config()
         self.parser = parser or CompositeParser()
         self.progress_callback = progress_callback
 
+        # 节目解析结果缓存，episode_cache_ttl未设置或为0时不使用缓存
+        if episode_cache is None and self.config.episode_cache_ttl:
+            episode_cache = EpisodeCache(ttl_seconds=self.config.episode_cache_ttl)
+        self._episode_cache = episode_cache
+
         # HTTP会话管理器
-        self._session_manager = SecureHTTPSessionManager(self.config)
+        self._session_manager = SecureHTTPSessionManager(
+            self.config, connector=connector
+        )
         self._session: Optional[aiohttp.ClientSession] = None
         self._semaphore = asyncio.Semaphore(self.config.max_concurrent_downloads)
 
@@ -446,8 +677,16 @@ class XiaoYuZhouDL:
         self._overwrite_all = False
         self._skip_all = False
 
-        # Rich进度条配置
+        # Rich进度条配置，并发下载共用同一个进度条显示
         self._progress: Optional[Progress] = None
+        self._progress_users = 0
+
+        # 音频HEAD探测结果，按URL缓存
+        self._audio_probes: Dict[str, Optional[Mapping[str, str]]] = {}
+
+        # 进行中的节目解析任务，按节目ID缓存，批量下载时重复的节目只解析一次；
+        # 下载结束即移除，长期使用的实例不会复用过期的音频URL
+        self._episode_parses: Dict[str, asyncio.Future] = {}
 
         # 文件名清理器
         self._filename_sanitizer = create_filename_sanitizer(secure=secure_filename)
@@ -475,6 +714,42 @@ class XiaoYuZhouDL:
         await self._session_manager.close_session()
         self._session = None
 
+    def _report_progress(self, filename: str, downloaded: int, total: int) -> None:
+        """触发进度回调
+
+        Args:
+            filename: 下载文件名
+            downloaded: 已下载字节数
+            total: 文件总字节数
+        """
+        if self.progress_callback:
+            # 字节数由下载器自身统计，无需再经过Pydantic校验
+            self.progress_callback(
+                DownloadProgress.model_construct(
+                    filename=filename, downloaded=downloaded, total=total
+                )
+            )
+
+    @contextlib.contextmanager
+    def _shared_progress(self) -> Iterator[Progress]:
+        """获取共享的rich进度条
+
+        rich同一时间只允许一个实时显示，并发下载各自在共享进度条上添加任务，
+        最后一个使用者退出时停止显示
+        """
+        if self._progress is None:
+            self._progress = self._create_progress_bar()
+            self._progress.start()
+        progress = self._progress
+        self._progress_users += 1
+        try:
+            yield progress
+        finally:
+            self._progress_users -= 1
+            if self._progress_users == 0:
+                progress.stop()
+                self._progress = None
+
     def _create_progress_bar(self) -> Progress:
         """创建rich进度条"""
         return Progress(
@@ -504,6 +779,7 @@ class XiaoYuZhouDL:
         if isinstance(request, str):
             request = DownloadRequest(url=request)
 
+        episode_id: Optional[str] = None
         try:
             await self._create_session()
 
@@ -512,6 +788,7 @@ class XiaoYuZhouDL:
                 normalized_url = UrlValidator.normalize_to_url(str(request.url))
                 # 更新请求对象的 URL 为标准化后的 URL
                 request.url = normalized_url
+                episode_id = UrlValidator.extract_episode_id(normalized_url)
             except Exception as e:
                 raise ValidationError(
                     f"Invalid episode URL or ID: {request.url}. {str(e)}"
@@ -597,20 +874,66 @@ class XiaoYuZhouDL:
                 audio_path=None,
                 md_path=None,
             )
+        finally:
+            if episode_id is not None:
+                self._episode_parses.pop(episode_id, None)
 
     async def _parse_episode(self, url: str) -> tuple[EpisodeInfo, Optional[str]]:
-        """解析节目信息，支持重试机制"""
+        """解析节目信息
+
+        同一节目的并发请求共享同一个解析任务；解析失败的结果不保留，
+        之后的请求会重新解析。要求刷新时不使用共享结果
+        """
+        episode_id = UrlValidator.extract_episode_id(url)
+        if self.config.episode_cache_refresh:
+            return await self._load_episode(url, episode_id)
+
+        task = self._episode_parses.get(episode_id)
+        if task is None:
+            task = asyncio.ensure_future(self._load_episode(url, episode_id))
+            self._episode_parses[episode_id] = task
+
+        try:
+            # shield防止单个调用方被取消时连带取消共享的解析任务
+            return await asyncio.shield(task)
+        except Exception:
+            if self._episode_parses.get(episode_id) is task:
+                del self._episode_parses[episode_id]
+            raise
+
+    async def _load_episode(
+        self, url: str, episode_id: str
+    ) -> tuple[EpisodeInfo, Optional[str]]:
+        """获取节目信息，支持重试机制，启用缓存时优先使用缓存结果"""
+        # 缓存读写涉及文件IO，放到线程池执行，避免阻塞事件循环
+        loop = asyncio.get_running_loop()
+        if self._episode_cache is not None and not self.config.episode_cache_refresh:
+            cached = await loop.run_in_executor(
+                None, self._episode_cache.get, episode_id
+            )
+            if cached is not None:
+                return cached
+
         retry_decorator = create_retry_decorator(self.retry_config, self.retry_stats)
 
         @retry_decorator
         async def _parse_with_retry():
-            return await parse_episode_from_url(url, self.parser)
+            # 复用下载器的会话，页面请求与音频下载共享连接池
+            return await parse_episode_from_url(url, self.parser, session=self._session)
 
         try:
-            return await _parse_with_retry()
+            episode_info, audio_url = await _parse_with_retry()
         except Exception as e:
             raise ParseError(f"Failed to parse episode: {e}", url=url)
 
+        # 只缓存完整的解析结果
+        if self._episode_cache is not None and audio_url:
+            await loop.run_in_executor(
+                None, self._episode_cache.set, episode_id, episode_info, audio_url
+            )
+
+        return episode_info, audio_url
+
     def _generate_filename(self, episode_info: EpisodeInfo) -> str:
         """生成文件名 - 优化版本"""
         episode_id = episode_info.eid or self._extract_id_from_title(episode_info.title)
@@ -638,15 +961,12 @@ class XiaoYuZhouDL:
         Returns:
             (节目名, 主播名) 元组
         """
-        if " - " in title:
-            parts = title.split(" - ", 1)
-            episode_name = parts[0].strip()
-            host_name = parts[1].strip() if len(parts) > 1 else podcast_title
-        else:
-            episode_name = title
-            host_name = podcast_title
+        # 一次匹配同时取出节目名和主播名，按第一个" - "分隔
+        match = _EPISODE_TITLE_RE.fullmatch(title)
+        if match:
+            return match.group(1).strip(), match.group(2).strip()
 
-        return episode_name, host_name
+        return title, podcast_title
 
     def _extract_id_from_title(self, title: str) -> str:
         """从标题中提取ID（备用方案）"""
@@ -666,6 +986,11 @@ class XiaoYuZhouDL:
         max_len = self.config.max_filename_length
         return self._filename_sanitizer.sanitize(filename, max_len)
 
+    def _sanitize_filenames(self, filenames: Iterable[str]) -> List[str]:
+        """批量清理文件名，规则与 _sanitize_filename 一致"""
+        max_len = self.config.max_filename_length
+        return self._filename_sanitizer.sanitize_many(filenames, max_len)
+
     def _decode_all_encodings(self, path: str) -> str:
         """递归解码所有可能的编码格式，防止编码攻击 - 优化版本
 
@@ -729,6 +1054,17 @@ class XiaoYuZhouDL:
             # 递归解码所有可能的编码格式
             decoded_path = self._decode_all_encodings(download_dir)
 
+            # 先做不涉及文件系统的廉价检查，再调用 resolve()
+            if len(decoded_path) > MAX_PATH_LENGTH:
+                raise PathSecurityError(
+                    f"Path too long: exceeds {MAX_PATH_LENGTH} characters limit",
+                    path=decoded_path,
+                    attack_type="path_length_limit",
+                )
+
+            # 检查是否包含危险的路径遍历模式
+            self._check_path_traversal_attacks(decoded_path)
+
             # 创建Path对象并解析为绝对路径
             path = Path(decoded_path).resolve()
 
@@ -740,9 +1076,6 @@ class XiaoYuZhouDL:
                     attack_type="path_length_limit",
                 )
 
-            # 检查是否包含危险的路径遍历模式
-            self._check_path_traversal_attacks(decoded_path)
-
             # 检查是否为符号链接（Unix系统）
             if path.is_symlink():
                 # 解析符号链接的真实路径
@@ -813,19 +1146,9 @@ class XiaoYuZhouDL:
 
     def _check_path_traversal_attacks(self, decoded_path: str) -> None:
         """检查路径遍历攻击模式"""
-        # 危险的路径遍历模式
-        dangerous_patterns = [
-            "../",
-            "..\\",
-            "/..",
-            "\\..",
-            "%2e%2e",  # URL编码的..
-            "%2f",  # URL编码的/
-            "%5c",  # URL编码的\
-        ]
-
-        for pattern in dangerous_patterns:
-            if pattern.lower() in decoded_path.lower():
+        lowered_path = decoded_path.lower()
+        for pattern in PATH_TRAVERSAL_PATTERNS:
+            if pattern in lowered_path:
                 raise PathSecurityError(
                     f"Path traversal attack detected: contains '{pattern}'",
                     path=decoded_path,
@@ -857,39 +1180,7 @@ class XiaoYuZhouDL:
             True表示危险路径，False表示安全路径
         """
         path_str = str(path).lower().replace("\\", "/")
-
-        # Unix系统危险目录
-        unix_dangerous = [
-            "/etc",
-            "/bin",
-            "/sbin",
-            "/usr/bin",
-            "/usr/sbin",
-            "/var/log",
-            "/root",
-            "/boot",
-            "/sys",
-            "/proc",
-        ]
-
-        # Windows系统危险目录
-        windows_dangerous = [
-            "c:/windows",
-            "c:/program files",
-            "c:/program files (x86)",
-            "c:/system32",
-            "c:/syswow64",
-            "windows/system32",  # 相对路径形式
-            "/c/windows",  # Unix式Windows路径
-        ]
-
-        dangerous_paths = unix_dangerous + windows_dangerous
-
-        for dangerous in dangerous_paths:
-            if path_str.startswith(dangerous):
-                return True
-
-        return False
+        return path_str.startswith(DANGEROUS_SYSTEM_PATHS)
 
     def _ask_file_overwrite_confirmation(
         self, file_path: Path, file_type: str = "文件"
@@ -996,15 +1287,16 @@ class XiaoYuZhouDL:
                 attack_type="invalid_filename",
             ) from e
 
-        # 检查文件名中是否包含其他危险字符
-        other_dangerous_chars = [":", "*", "?", "<", ">", "|"]
-        for char in other_dangerous_chars:
-            if char in safe_filename:
-                raise PathSecurityError(
-                    f"Dangerous character '{char}' found in filename",
-                    path=filename,
-                    attack_type="path_traversal",
-                )
+        # 检查文件名中是否包含其他危险字符 - 单次translate扫描，命中后再定位字符
+        if len(safe_filename.translate(FILENAME_DANGEROUS_CHARS_TABLE)) != len(
+            safe_filename
+        ):
+            char = next(c for c in safe_filename if c in FILENAME_DANGEROUS_CHARS)
+            raise PathSecurityError(
+                f"Dangerous character '{char}' found in filename",
+                path=filename,
+                attack_type="path_traversal",
+            )
 
         # 检查是否为空或只包含点号和空格
         if (
@@ -1079,15 +1371,10 @@ class XiaoYuZhouDL:
             elif "ogg" in content_type:
                 return ".ogg"
 
-        # 从URL扩展名判断
-        if audio_url.endswith(".m4a"):
-            return ".m4a"
-        elif audio_url.endswith(".mp3"):
-            return ".mp3"
-        elif audio_url.endswith(".wav"):
-            return ".wav"
-        elif audio_url.endswith(".ogg"):
-            return ".ogg"
+        # 从URL路径的扩展名判断，忽略查询参数
+        url_extension = _url_audio_extension(audio_url)
+        if url_extension:
+            return url_extension
 
         # 默认使用m4a（小宇宙大多数音频是m4a格式）
         return ".m4a"
@@ -1101,16 +1388,36 @@ class XiaoYuZhouDL:
         Returns:
             内容类型字符串，如果检测失败返回None
         """
+        # 如果HEAD请求失败，返回None然后使用URL判断
+        headers = await self._probe_audio(audio_url)
+        return headers.get("content-type") if headers else None
+
+    async def _probe_audio(self, audio_url: str) -> Optional[Mapping[str, str]]:
+        """HEAD探测音频文件，返回响应头
+
+        同一次下载中扩展名检测和分段规划共用一次探测结果
+
+        Args:
+            audio_url: 音频文件URL
+
+        Returns:
+            响应头，请求失败或状态码不是200时返回None
+        """
+        if audio_url in self._audio_probes:
+            return self._audio_probes[audio_url]
+
+        headers: Optional[Mapping[str, str]] = None
         try:
             async with await self._session_manager.safe_request(
-                "HEAD", audio_url
+                "HEAD", audio_url, headers=_AUDIO_REQUEST_HEADERS
             ) as response:
                 if response.status == 200:
-                    return response.headers.get("content-type")
+                    headers = response.headers
         except Exception:
-            # 如果HEAD请求失败，返回None然后使用URL判断
             pass
-        return None
+
+        self._audio_probes[audio_url] = headers
+        return headers
 
     async def _prepare_download_file_path(
         self, audio_url: str, filename: str, download_dir: str
@@ -1129,8 +1436,10 @@ class XiaoYuZhouDL:
         download_path = self._validate_download_path(download_dir)
         download_path.mkdir(parents=True, exist_ok=True)
 
-        # 检测文件类型并确定扩展名
-        content_type = await self._detect_audio_content_type(audio_url)
+        # 检测文件类型并确定扩展名；URL已带音频扩展名时直接使用，省去HEAD请求
+        content_type = None
+        if not _url_audio_extension(audio_url):
+            content_type = await self._detect_audio_content_type(audio_url)
         extension = self._get_audio_extension(audio_url, content_type)
 
         # 确保文件名安全，防止路径遍历攻击
@@ -1207,7 +1516,7 @@ class XiaoYuZhouDL:
         file_path_obj = Path(file_path)
 
         # 使用rich进度条
-        with self._create_progress_bar() as progress:
+        with self._shared_progress() as progress:
             task = progress.add_task(
                 f"🎵 下载音频: {file_path_obj.name}", total=total_size
             )
@@ -1229,7 +1538,7 @@ class XiaoYuZhouDL:
 
                     # 保持原有的进度回调兼容性
                     if self.progress_callback:
-                        progress_info = DownloadProgress(
+                        progress_info = DownloadProgress.model_construct(
                             filename=file_path_obj.name,
                             downloaded=downloaded,
                             total=total_size,
@@ -1250,37 +1559,61 @@ class XiaoYuZhouDL:
         Returns:
             下载后的文件路径
         """
-        # 准备下载文件路径
-        download_path, file_path, progress_path = (
-            await self._prepare_download_file_path(audio_url, filename, download_dir)
-        )
-
-        # 检查文件是否已存在
-        if not self._check_file_exists_and_handle(file_path, "音频文件"):
-            return str(file_path)
+        try:
+            # 准备下载文件路径
+            download_path, file_path, progress_path = (
+                await self._prepare_download_file_path(
+                    audio_url, filename, download_dir
+                )
+            )
 
-        # 尝试断点续传
-        if progress_path.exists():
-            if await self._resume_download(audio_url, file_path, progress_path):
-                print(f"✅ 音频文件续传完成: {file_path.name}")
+            # 正式文件只包含完整下载的内容，已存在时按用户选择处理
+            if not self._check_file_exists_and_handle(file_path, "音频文件"):
                 return str(file_path)
 
-        # 创建重试装饰器
-        retry_decorator = create_retry_decorator(self.retry_config, self.retry_stats)
+            # 下载过程中写入临时文件，完成后再替换为正式文件，未完成的下载一目了然
+            part_path = file_path.with_name(file_path.name + ".part")
 
-        @retry_decorator
-        async def _download_with_retry():
-            return await self._perform_download(audio_url, file_path, progress_path)
+            # 创建重试装饰器
+            retry_decorator = create_retry_decorator(
+                self.retry_config, self.retry_stats
+            )
 
-        async with self._semaphore:  # 限制并发下载数
-            try:
-                result = await _download_with_retry()
+            @retry_decorator
+            async def _download_with_retry():
+                # 上次运行或上一次重试中断时，从已写入的位置续传
+                if progress_path.exists() and await self._resume_download(
+                    audio_url, part_path, progress_path
+                ):
+                    print(f"✅ 音频文件续传完成: {file_path.name}")
+                    return
+
+                # 服务器支持Range时按配置的连接数并行分段下载
+                ranges = await self._plan_ranged_download(audio_url)
+                if ranges:
+                    await self._download_ranges(audio_url, part_path, ranges)
+                    # 续传失败后改为分段下载时，进度文件已经没有用处
+                    DownloadProgressManager.cleanup_progress(progress_path)
+                else:
+                    await self._perform_download(audio_url, part_path, progress_path)
+
+            async with self._semaphore:  # 限制并发下载数
+                try:
+                    await _download_with_retry()
+                except Exception as e:
+                    # 已写入部分数据时保留临时文件和进度文件供下次续传，否则清理
+                    if not part_path.exists():
+                        DownloadProgressManager.cleanup_progress(progress_path)
+                    raise e
+
+                await asyncio.get_running_loop().run_in_executor(
+                    None, _finalize_part_file, part_path, file_path
+                )
                 print(f"✅ 音频文件已保存: {file_path.name}")
-                return result
-            except Exception as e:
-                # 清理失败的进度文件
-                DownloadProgressManager.cleanup_progress(progress_path)
-                raise e
+                return str(file_path)
+        finally:
+            # 探测结果只在本次下载中复用，批量下载时不在内存中累积
+            self._audio_probes.pop(audio_url, None)
 
     async def _perform_download(
         self, audio_url: str, file_path: Path, progress_path: Path
@@ -1289,7 +1622,9 @@ class XiaoYuZhouDL:
         if self._session is None:
             raise NetworkError("Session not initialized", url=audio_url)
 
-        response = await self._session_manager.safe_request("GET", audio_url)
+        response = await self._session_manager.safe_request(
+            "GET", audio_url, headers=_AUDIO_REQUEST_HEADERS
+        )
         async with response:
             if response.status != 200:
                 raise NetworkError(
@@ -1308,53 +1643,227 @@ class XiaoYuZhouDL:
                 )
 
             downloaded = 0
+            display_name = _display_name(file_path)
 
-            # 创建进度数据
+            # 创建进度数据，记录校验值供续传时作为If-Range条件
             progress_data = {
                 "downloaded": downloaded,
                 "total": total_size,
                 "url": audio_url,
+                "validator": get_resume_validator(response.headers),
             }
 
             # 使用rich进度条
-            with self._create_progress_bar() as progress:
+            with self._shared_progress() as progress:
                 task = progress.add_task(
-                    f"🎵 下载音频: {file_path.name}", total=total_size
+                    f"🎵 下载音频: {display_name}", total=total_size
                 )
 
+                write_buffer: List[bytes] = []
+                buffered = 0
+                last_report_time = 0.0
                 async with aiofiles.open(file_path, "wb") as f:
-                    async for chunk in response.content.iter_chunked(
-                        self.config.chunk_size
-                    ):
-                        # 流式下载时检查累积大小
-                        if downloaded + len(chunk) > self.config.max_response_size:
-                            raise NetworkError(
-                                "Download size limit exceeded during streaming",
-                                url=_sanitize_url_for_logging(audio_url),
-                            )
-
-                        await f.write(chunk)
-                        downloaded += len(chunk)
-                        progress.update(task, completed=downloaded)
-
-                        # 定期保存进度
-                        if downloaded % (self.config.chunk_size * 10) == 0:
-                            progress_data["downloaded"] = downloaded
-                            self._save_download_progress(progress_path, progress_data)
+                    # 已知文件大小时预分配空间，在线程池中执行避免阻塞事件循环
+                    if total_size > 0:
+                        await asyncio.get_running_loop().run_in_executor(
+                            None, _preallocate_file, f.fileno(), total_size
+                        )
+
+                    try:
+                        async for chunk in response.content.iter_chunked(
+                            self.config.chunk_size
+                        ):
+                            # 流式下载时检查累积大小
+                            if downloaded + len(chunk) > self.config.max_response_size:
+                                raise NetworkError(
+                                    "Download size limit exceeded during streaming",
+                                    url=_sanitize_url_for_logging(audio_url),
+                                )
+
+                            # 缓冲数据块，攒够后一次写入，减少线程池写文件调用
+                            write_buffer.append(chunk)
+                            buffered += len(chunk)
+                            downloaded += len(chunk)
+                            if buffered >= _WRITE_BUFFER_SIZE:
+                                await f.writelines(write_buffer)
+                                write_buffer.clear()
+                                buffered = 0
+
+                                # 每次批量写入后保存进度
+                                progress_data["downloaded"] = downloaded
+                                self._save_download_progress(
+                                    progress_path, progress_data
+                                )
+
+                            # 限制进度刷新频率
+                            now = time.monotonic()
+                            if now - last_report_time >= _PROGRESS_REPORT_INTERVAL:
+                                last_report_time = now
+                                progress.update(task, completed=downloaded)
+                                self._report_progress(
+                                    display_name, downloaded, total_size
+                                )
+                    except (aiohttp.ClientError, asyncio.TimeoutError):
+                        # 网络中断时写入已收到的数据并记录字节数，重试或下次运行时从此处续传
+                        await f.writelines(write_buffer)
+                        progress_data["downloaded"] = downloaded
+                        self._save_download_progress(progress_path, progress_data)
+                        raise
+
+                    # 写入剩余的缓冲数据
+                    if write_buffer:
+                        await f.writelines(write_buffer)
 
-                        # 保持原有的进度回调兼容性
-                        if self.progress_callback:
-                            progress_info = DownloadProgress(
-                                filename=file_path.name,
-                                downloaded=downloaded,
-                                total=total_size,
-                            )
-                            self.progress_callback(progress_info)
+                    # 截掉预分配但未写入的部分，文件大小与实际下载量一致
+                    await f.truncate()
+
+                # 结束时报告最终进度
+                progress.update(task, completed=downloaded)
+                self._report_progress(display_name, downloaded, total_size)
 
             # 下载完成，清理进度文件
             DownloadProgressManager.cleanup_progress(progress_path)
             return str(file_path)
 
+    async def _plan_ranged_download(
+        self, audio_url: str
+    ) -> Optional[List[tuple[int, int]]]:
+        """通过HEAD请求判断能否并行分段下载
+
+        Args:
+            audio_url: 音频文件URL
+
+        Returns:
+            分段列表；未开启多连接、服务器不支持Range或文件太小时返回None
+        """
+        if self.config.download_connections <= 1 or self._session is None:
+            return None
+
+        # 探测失败时退回单连接下载
+        headers = await self._probe_audio(audio_url)
+        if not headers or headers.get("accept-ranges", "").lower() != "bytes":
+            return None
+        try:
+            total_size = int(headers.get("content-length", 0))
+        except ValueError:
+            return None
+
+        if total_size > self.config.max_response_size:
+            return None
+
+        ranges = _split_byte_ranges(
+            total_size, self.config.download_connections, self.config.chunk_size
+        )
+        return ranges if len(ranges) > 1 else None
+
+    async def _download_ranges(
+        self, audio_url: str, file_path: Path, ranges: List[tuple[int, int]]
+    ) -> str:
+        """多连接并行下载各个分段，写入预分配文件的对应位置
+
+        Args:
+            audio_url: 音频文件URL
+            file_path: 目标文件路径
+            ranges: (起始字节, 结束字节) 分段列表
+
+        Returns:
+            下载后的文件路径
+
+        Raises:
+            NetworkError: 任一分段请求失败或返回内容与分段不符时
+        """
+        total_size = ranges[-1][1] + 1
+        downloaded = 0
+        display_name = _display_name(file_path)
+        last_report_time = 0.0
+
+        # 各分段携带探测到的校验值，文件在下载期间变化时服务器返回200而不是206，
+        # 避免把两个版本的内容拼接到一起
+        probe_headers = await self._probe_audio(audio_url)
+        request_headers = dict(_AUDIO_REQUEST_HEADERS)
+        validator = get_resume_validator(probe_headers) if probe_headers else None
+        if validator:
+            request_headers["If-Range"] = validator
+
+        # 预分配完整文件，各分段直接写入自己的区间
+        async with aiofiles.open(file_path, "wb") as f:
+            await asyncio.get_running_loop().run_in_executor(
+                None, _preallocate_file, f.fileno(), total_size
+            )
+
+        with self._shared_progress() as progress:
+            task = progress.add_task(f"🎵 下载音频: {display_name}", total=total_size)
+
+            async def fetch_range(start: int, end: int) -> None:
+                nonlocal downloaded, last_report_time
+                response = await self._session_manager.safe_request(
+                    "GET",
+                    audio_url,
+                    headers={**request_headers, "Range": f"bytes={start}-{end}"},
+                )
+                async with response:
+                    if response.status == 200 and validator:
+                        # 丢弃过期的探测结果，重试时重新探测
+                        self._audio_probes.pop(audio_url, None)
+                        raise NetworkError(
+                            "Audio changed during ranged download",
+                            url=_sanitize_url_for_logging(audio_url),
+                        )
+                    if response.status != 206:
+                        raise NetworkError(
+                            f"HTTP {response.status}: Range request not honored",
+                            url=_sanitize_url_for_logging(audio_url),
+                            status_code=response.status,
+                        )
+
+                    position = start
+                    async with aiofiles.open(file_path, "r+b") as f:
+                        await f.seek(start)
+                        async for chunk in response.content.iter_chunked(
+                            self.config.chunk_size
+                        ):
+                            if position + len(chunk) > end + 1:
+                                raise NetworkError(
+                                    "Range response exceeds requested size",
+                                    url=_sanitize_url_for_logging(audio_url),
+                                )
+
+                            await f.write(chunk)
+                            position += len(chunk)
+                            downloaded += len(chunk)
+
+                            # 各分段共享同一个刷新时间，整体限制刷新频率
+                            now = time.monotonic()
+                            if now - last_report_time >= _PROGRESS_REPORT_INTERVAL:
+                                last_report_time = now
+                                progress.update(task, completed=downloaded)
+                                self._report_progress(
+                                    display_name, downloaded, total_size
+                                )
+
+                if position != end + 1:
+                    raise NetworkError(
+                        "Incomplete range response",
+                        url=_sanitize_url_for_logging(audio_url),
+                    )
+
+            tasks = [asyncio.ensure_future(fetch_range(*r)) for r in ranges]
+            try:
+                await asyncio.gather(*tasks)
+            except BaseException:
+                # 任一分段失败时取消其余分段，删除不完整的文件
+                for pending in tasks:
+                    pending.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+                file_path.unlink(missing_ok=True)
+                raise
+
+            # 结束时报告最终进度
+            progress.update(task, completed=downloaded)
+            self._report_progress(display_name, downloaded, total_size)
+
+        return str(file_path)
+
     def _save_download_progress(
         self, progress_path: Path, progress_data: Dict[str, Any]
     ) -> None:
@@ -1378,16 +1887,23 @@ class XiaoYuZhouDL:
             return False
 
         try:
-            headers = create_range_headers(resume_pos)
+            headers = create_range_headers(resume_pos, progress_data.get("validator"))
             if self._session is not None:
                 response = await self._session_manager.safe_request(
-                    "GET", audio_url, headers=headers
+                    "GET", audio_url, headers={**_AUDIO_REQUEST_HEADERS, **headers}
                 )
                 async with response:
+                    # 416表示续传位置已到文件末尾，上次下载其实已经完成
+                    if response.status == 416:
+                        if resume_pos == progress_data.get("total"):
+                            DownloadProgressManager.cleanup_progress(progress_path)
+                            return True
+                        return False
+
                     if response.status not in [206, 200]:  # Partial Content or OK
                         return False
 
-                    # 如果服务器不支持Range请求，重新开始
+                    # 服务器不支持Range请求或文件已变化（If-Range不匹配），重新开始
                     if resume_pos > 0 and response.status != 206:
                         return False
 
@@ -1398,35 +1914,63 @@ class XiaoYuZhouDL:
                     else:
                         total_size = progress_data.get("total", 0)
 
-                    downloaded = resume_pos
-
-                    # 以追加模式打开文件
-                    async with aiofiles.open(file_path, "ab") as f:
-                        async for chunk in response.content.iter_chunked(
-                            self.config.chunk_size
-                        ):
-                            await f.write(chunk)
-                            downloaded += len(chunk)
+                    # 续传同样受文件大小限制约束
+                    if total_size > self.config.max_response_size:
+                        return False
 
-                            # 更新进度
+                    downloaded = resume_pos
+                    display_name = _display_name(file_path)
+
+                    write_buffer: List[bytes] = []
+                    buffered = 0
+                    last_report_time = 0.0
+
+                    # 从续传位置开始写入，文件可能已按总大小预分配，不能使用追加模式
+                    async with aiofiles.open(file_path, "r+b") as f:
+                        await f.seek(resume_pos)
+                        try:
+                            async for chunk in response.content.iter_chunked(
+                                self.config.chunk_size
+                            ):
+                                # 缓冲数据块，攒够后一次写入并更新进度
+                                write_buffer.append(chunk)
+                                buffered += len(chunk)
+                                downloaded += len(chunk)
+                                if buffered >= _WRITE_BUFFER_SIZE:
+                                    await f.writelines(write_buffer)
+                                    write_buffer.clear()
+                                    buffered = 0
+                                    progress_data["downloaded"] = downloaded
+                                    self._save_download_progress(
+                                        progress_path, progress_data
+                                    )
+
+                                # 进度回调（限制频率）
+                                now = time.monotonic()
+                                if now - last_report_time >= _PROGRESS_REPORT_INTERVAL:
+                                    last_report_time = now
+                                    self._report_progress(
+                                        display_name, downloaded, total_size
+                                    )
+                        finally:
+                            # 中断时同样写入已收到的数据，记录的进度与文件保持一致
+                            await f.writelines(write_buffer)
                             progress_data["downloaded"] = downloaded
                             self._save_download_progress(progress_path, progress_data)
 
-                            # 进度回调
-                            if self.progress_callback:
-                                progress_info = DownloadProgress(
-                                    filename=file_path.name,
-                                    downloaded=downloaded,
-                                    total=total_size,
-                                )
-                                self.progress_callback(progress_info)
+                        # 截掉预分配但未写入的部分，文件大小与实际下载量一致
+                        await f.truncate()
 
-                    # 下载完成，清理进度文件
+                    # 下载完成，报告最终进度并清理进度文件
+                    self._report_progress(display_name, downloaded, total_size)
                     DownloadProgressManager.cleanup_progress(progress_path)
                     return True
 
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            # 网络中断时进度已经保存，交给重试机制从新的位置继续续传
+            raise
         except Exception:
-            # 恢复失败，返回False让调用者重新开始下载
+            # 无法续传，返回False让调用者重新开始下载
             return False
 
         return False
@@ -1503,17 +2047,9 @@ class XiaoYuZhouDL:
 
     def _clean_html_content(self, content: str) -> str:
         """清理HTML内容，转换为纯文本"""
-        # HTML标签清理模式
-        html_patterns = [
-            (r"<p[^>]*>", "\n"),
-            (r"</p>", "\n"),
-            (r"<br[^>]*/?>", "\n"),
-            (r"<[^>]+>", ""),
-        ]
-
         cleaned = content
-        for pattern, replacement in html_patterns:
-            cleaned = re.sub(pattern, replacement, cleaned)
+        for pattern, replacement in _HTML_CLEAN_PATTERNS:
+            cleaned = pattern.sub(replacement, cleaned)
 
         return cleaned.strip()
 
@@ -4,11 +4,25 @@
 """
 
 from datetime import datetime
+from functools import lru_cache
 from typing import Any, Dict, Optional
 
 from pydantic import BaseModel, ConfigDict, Field, HttpUrl, field_validator
 
 
+@lru_cache(maxsize=256)
+def _format_date(date_str: str, fmt: str) -> str:
+    """按格式输出ISO日期字符串，解析失败时原样返回
+
+    以日期字符串为键缓存，重复访问同一节目的日期属性不会重复解析
+    """
+    try:
+        dt = datetime.fromisoformat(date_str.replace("Z", "+00:00"))
+        return dt.strftime(fmt)
+    except:
+        return date_str
+
+
 class PodcastInfo(BaseModel):
     """播客信息模型"""
 
@@ -56,11 +70,7 @@ class EpisodeInfo(BaseModel):
         date_str = self.published_datetime or self.pub_date
         if not date_str:
             return "未知"
-        try:
-            dt = datetime.fromisoformat(date_str.replace("Z", "+00:00"))
-            return dt.strftime("%Y年%m月%d日")
-        except:
-            return date_str
+        return _format_date(date_str, "%Y年%m月%d日")
 
     @property
     def formatted_datetime(self) -> str:
@@ -68,11 +78,7 @@ class EpisodeInfo(BaseModel):
         date_str = self.published_datetime or self.pub_date
         if not date_str:
             return "未知"
-        try:
-            dt = datetime.fromisoformat(date_str.replace("Z", "+00:00"))
-            return dt.strftime("%Y-%m-%d %H:%M:%S UTC")
-        except:
-            return date_str
+        return _format_date(date_str, "%Y-%m-%d %H:%M:%S UTC")
 
     @property
     def duration_text(self) -> str:
@@ -127,11 +133,14 @@ class DownloadResult(BaseModel):
 
 
 class DownloadProgress(BaseModel):
-    """下载进度模型"""
+    """下载进度模型
+
+    下载过程中频繁创建，下载器内部使用 model_construct 跳过校验
+    """
 
     filename: str = Field(..., description="文件名")
-    downloaded: int = Field(default=0, description="已下载字节数")
-    total: int = Field(default=0, description="总字节数")
+    downloaded: int = Field(default=0, ge=0, description="已下载字节数")
+    total: int = Field(default=0, ge=0, description="总字节数")
     speed: float = Field(default=0.0, description="下载速度(bytes/s)")
 
     @property
@@ -171,7 +180,7 @@ class Config(BaseModel):
     # 网络配置
     timeout: int = Field(default=30, description="请求超时时间(秒)")
     max_retries: int = Field(default=3, description="最大重试次数")
-    chunk_size: int = Field(default=8192, description="下载块大小")
+    chunk_size: int = Field(default=65536, description="下载块大小(64KB)")
 
     # 用户代理
     user_agent: str = Field(
@@ -184,6 +193,9 @@ class Config(BaseModel):
 
     # 并发设置
     max_concurrent_downloads: int = Field(default=3, description="最大并发下载数")
+    download_connections: int = Field(
+        default=1, description="单个音频文件的并行分段下载连接数，1表示单连接"
+    )
 
     # 交互模式设置
     non_interactive: bool = Field(
@@ -210,6 +222,16 @@ class Config(BaseModel):
     connection_timeout: float = Field(default=10.0, description="连接超时时间(秒)")
     read_timeout: float = Field(default=30.0, description="读取超时时间(秒)")
     dns_cache_ttl: int = Field(default=300, description="DNS缓存TTL(秒)")
+    episode_cache_ttl: Optional[int] = Field(
+        default=None,
+        description="节目解析结果磁盘缓存有效期(秒)，0表示不使用缓存，None表示未设置",
+    )
+    episode_cache_refresh: bool = Field(
+        default=False, description="忽略已缓存的解析结果，重新解析并更新缓存"
+    )
+    force_ipv4: bool = Field(
+        default=False, description="仅使用IPv4连接，跳过IPv6(AAAA)解析"
+    )
 
     # 重定向安全配置
     allowed_redirect_hosts: Optional[list[str]] = Field(
@@ -240,6 +262,7 @@ class Config(BaseModel):
         "chunk_size",
         "max_filename_length",
         "max_concurrent_downloads",
+        "download_connections",
         "max_redirects",
         "max_request_size",
         "max_response_size",
@@ -254,6 +277,14 @@ class Config(BaseModel):
             raise ValueError("Value must be positive")
         return v
 
+    @field_validator("episode_cache_ttl")
+    @classmethod
+    def validate_non_negative(cls, v: Optional[int]) -> Optional[int]:
+        """验证不能为负数"""
+        if v is not None and v < 0:
+            raise ValueError("Value must be non-negative")
+        return v
+
     @field_validator("connection_timeout", "read_timeout")
     @classmethod
     def validate_positive_float(cls, v: float) -> float:
@@ -3,6 +3,7 @@
 采用策略模式和协议接口设计，支持多种解析策略
 """
 
+import html
 import json
 import re
 from abc import ABC, abstractmethod
@@ -16,6 +17,25 @@ from bs4.element import NavigableString
 from .exceptions import NetworkError, ParseError, wrap_exception
 from .models import EpisodeInfo, PodcastInfo
 
+try:
+    import lxml  # noqa: F401
+except ImportError:
+    _HTML_PARSER = "html.parser"
+else:
+    # 安装了lxml时使用C实现的解析器，未安装时回退到纯Python的html.parser
+    _HTML_PARSER = "lxml"
+
+# 音频URL快速路径：直接匹配JSON-LD脚本和audio标签，未命中时才构建文档树；
+# 属性名前要求空白，避免匹配到data-src等同名后缀的属性
+_JSON_LD_SCRIPT_RE = re.compile(
+    r'<script\b[^>]*\sname="schema:podcast-show"[^>]*>(.*?)</script>',
+    re.IGNORECASE | re.DOTALL,
+)
+_AUDIO_SRC_RE = re.compile(r'<audio\b[^>]*\ssrc="([^"]+)"', re.IGNORECASE)
+
+# ISO 8601时长中的分钟数，如 PT73M
+_DURATION_MINUTES_RE = re.compile(r"PT(\d+)M")
+
 
 class ParserProtocol(ABC):
     """解析器协议接口"""
@@ -47,7 +67,7 @@ class JsonScriptParser(ParserProtocol):
     @wrap_exception
     async def parse_episode_info(self, html_content: str, url: str) -> EpisodeInfo:
         """从页面脚本中解析节目信息"""
-        soup = BeautifulSoup(html_content, "html.parser")
+        soup = BeautifulSoup(html_content, _HTML_PARSER)
 
         # 首先尝试从JSON-LD script提取数据
         json_ld_script = soup.find(
@@ -74,7 +94,9 @@ class JsonScriptParser(ParserProtocol):
 
                 # 尝试从HTML中获取完整的Show Notes
                 try:
-                    html_show_notes = self.extract_show_notes_from_html(html_content)
+                    html_show_notes = self.extract_show_notes_from_html(
+                        html_content, soup=soup
+                    )
                     if html_show_notes and len(html_show_notes) > len(
                         episode_info.shownotes
                     ):
@@ -106,7 +128,7 @@ class JsonScriptParser(ParserProtocol):
                         # 尝试从HTML中获取完整的Show Notes
                         try:
                             html_show_notes = self.extract_show_notes_from_html(
-                                html_content
+                                html_content, soup=soup
                             )
                             if html_show_notes and len(html_show_notes) > len(
                                 episode_info.shownotes
@@ -131,7 +153,12 @@ class JsonScriptParser(ParserProtocol):
     @wrap_exception
     async def extract_audio_url(self, html_content: str, url: str) -> Optional[str]:
         """从页面中提取音频URL"""
-        soup = BeautifulSoup(html_content, "html.parser")
+        # 快速路径：正则直接读取JSON-LD，不为提取一个URL构建整个文档树
+        content_url = self._extract_audio_url_from_json_ld(html_content)
+        if content_url:
+            return content_url
+
+        soup = BeautifulSoup(html_content, _HTML_PARSER)
 
         # 首先尝试从JSON-LD script提取音频URL
         json_ld_script = soup.find(
@@ -189,6 +216,26 @@ class JsonScriptParser(ParserProtocol):
 
         return None
 
+    @staticmethod
+    def _extract_audio_url_from_json_ld(html_content: str) -> Optional[str]:
+        """用正则从JSON-LD脚本中提取音频URL，未找到时返回None"""
+        match = _JSON_LD_SCRIPT_RE.search(html_content)
+        if not match:
+            return None
+
+        try:
+            json_data = json.loads(match.group(1))
+        except ValueError:
+            return None
+
+        # JSON-LD中音频URL在associatedMedia.contentUrl
+        associated_media = (
+            json_data.get("associatedMedia") if isinstance(json_data, dict) else None
+        )
+        if isinstance(associated_media, dict) and associated_media.get("contentUrl"):
+            return cast(str, associated_media["contentUrl"])
+        return None
+
     def _extract_json_from_script(self, script_content: str) -> Dict[str, Any]:
         """从脚本内容中提取JSON数据"""
         json_start = script_content.find("{")
@@ -242,16 +289,20 @@ class JsonScriptParser(ParserProtocol):
             shownotes=episode_data.get("shownotes", ""),
         )
 
-    def extract_show_notes_from_html(self, html_content: str) -> str:
+    def extract_show_notes_from_html(
+        self, html_content: str, soup: Optional[BeautifulSoup] = None
+    ) -> str:
         """从HTML中提取完整的Show Notes内容
 
         Args:
             html_content: HTML页面内容
+            soup: 已解析的文档树，提供时复用而不再重复解析HTML
 
         Returns:
             格式化后的Show Notes内容
         """
-        soup = BeautifulSoup(html_content, "html.parser")
+        if soup is None:
+            soup = BeautifulSoup(html_content, _HTML_PARSER)
 
         # 查找Show Notes容器
         show_notes_section = soup.find("section", {"aria-label": "节目show notes"})
@@ -403,9 +454,7 @@ class JsonScriptParser(ParserProtocol):
         time_required = json_data.get("timeRequired", "")
         if time_required:
             # PT73M -> 73分钟 -> 73 * 60 * 1000毫秒
-            import re
-
-            minutes_match = re.search(r"PT(\d+)M", time_required)
+            minutes_match = _DURATION_MINUTES_RE.search(time_required)
             if minutes_match:
                 minutes = int(minutes_match.group(1))
                 duration = minutes * 60 * 1000
@@ -447,7 +496,7 @@ class HtmlFallbackParser(ParserProtocol):
     @wrap_exception
     async def parse_episode_info(self, html_content: str, url: str) -> EpisodeInfo:
         """从HTML元素解析节目信息"""
-        soup = BeautifulSoup(html_content, "html.parser")
+        soup = BeautifulSoup(html_content, _HTML_PARSER)
 
         # 提取标题
         title = self._extract_title(soup)
@@ -470,7 +519,12 @@ class HtmlFallbackParser(ParserProtocol):
     @wrap_exception
     async def extract_audio_url(self, html_content: str, url: str) -> Optional[str]:
         """从HTML中提取音频URL"""
-        soup = BeautifulSoup(html_content, "html.parser")
+        # 快速路径：正则匹配audio标签的src属性
+        match = _AUDIO_SRC_RE.search(html_content)
+        if match:
+            return html.unescape(match.group(1))
+
+        soup = BeautifulSoup(html_content, _HTML_PARSER)
 
         # 查找 audio 标签
         audio_tag = soup.find("audio")
@@ -484,11 +538,8 @@ class HtmlFallbackParser(ParserProtocol):
         # 从 title 标签提取
         title_tag = soup.find("title")
         if title_tag:
-            title = title_tag.get_text().strip()
-            # 移除网站标识
-            if "|" in title:
-                title = title.split("|")[0].strip()
-            return title
+            # 移除"|"之后的网站标识，只做一次切分和strip
+            return title_tag.get_text().partition("|")[0].strip()
 
         # 从 h1 标签提取
         h1_tag = soup.find("h1")
@@ -591,10 +642,14 @@ class UrlValidator:
     def is_episode_id(input_str: str) -> bool:
         """判断输入是否为episode ID（而非URL）"""
         # episode ID 格式判断：不包含协议、域名和路径分隔符，且不为空
-        if not input_str or input_str.strip() == "":
+        if not input_str:
             return False
         input_str = input_str.strip()
-        return not input_str.startswith("http") and "/" not in input_str
+        return (
+            bool(input_str)
+            and not input_str.startswith("http")
+            and "/" not in input_str
+        )
 
     @staticmethod
     def normalize_to_url(url_or_id: str) -> str:
@@ -635,10 +690,33 @@ def create_default_parser() -> CompositeParser:
     return CompositeParser()
 
 
+async def _fetch_episode_page(session: aiohttp.ClientSession, url: str) -> str:
+    """获取节目页面HTML"""
+    try:
+        async with session.get(url) as response:
+            if response.status != 200:
+                raise NetworkError(
+                    f"HTTP {response.status}: {response.reason}",
+                    url=url,
+                    status_code=response.status,
+                )
+            return await response.text()
+    except aiohttp.ClientError as e:
+        raise NetworkError(f"Network error: {e}", url=url)
+
+
 async def parse_episode_from_url(
-    url: str, parser: Optional[CompositeParser] = None
+    url: str,
+    parser: Optional[CompositeParser] = None,
+    session: Optional[aiohttp.ClientSession] = None,
 ) -> tuple[EpisodeInfo, Optional[str]]:
-    """从URL解析节目信息和音频URL"""
+    """从URL解析节目信息和音频URL
+
+    Args:
+        url: 节目页面URL
+        parser: 解析器，None表示使用默认解析器
+        session: 复用的HTTP会话，None表示临时创建一个会话
+    """
     if parser is None:
         parser = create_default_parser()
 
@@ -646,20 +724,13 @@ async def parse_episode_from_url(
     if not UrlValidator.validate_xiaoyuzhou_url(url):
         raise ParseError(f"Invalid Xiaoyuzhou URL: {url}")
 
-    # 获取页面内容
-    timeout = aiohttp.ClientTimeout(total=30)
-    async with aiohttp.ClientSession(timeout=timeout) as session:
-        try:
-            async with session.get(url) as response:
-                if response.status != 200:
-                    raise NetworkError(
-                        f"HTTP {response.status}: {response.reason}",
-                        url=url,
-                        status_code=response.status,
-                    )
-                html_content = await response.text()
-        except aiohttp.ClientError as e:
-            raise NetworkError(f"Network error: {e}", url=url)
+    # 获取页面内容，优先复用调用方的会话及其连接池
+    if session is not None:
+        html_content = await _fetch_episode_page(session, url)
+    else:
+        timeout = aiohttp.ClientTimeout(total=30)
+        async with aiohttp.ClientSession(timeout=timeout) as new_session:
+            html_content = await _fetch_episode_page(new_session, url)
 
     # 解析节目信息和音频URL
     episode_info = await parser.parse_episode_info(html_content, url)
@@ -7,7 +7,7 @@ import asyncio
 import time
 import hashlib
 from typing import Dict, Any, Optional
-from collections import OrderedDict
+from collections import OrderedDict, deque
 
 from ..config import Config, ConfigManager, config_manager
 
@@ -40,9 +40,9 @@ class ConfigCache:
         self._max_cache_size = max_cache_size
         self._max_validation_cache_size = max_validation_cache_size
 
-        # 主配置缓存
+        # 主配置缓存，过期时间为 time.monotonic() 时刻
         self._cache: Optional[Config] = None
-        self._cache_timestamp: float = 0
+        self._cache_expiry: float = 0
 
         # 验证结果缓存 {config_hash: (is_valid, timestamp)}
         self._validation_cache: OrderedDict[str, tuple[bool, float]] = OrderedDict()
@@ -52,50 +52,49 @@ class ConfigCache:
 
         self._validation_stats = {"cached_validations": 0, "new_validations": 0}
 
-        # 性能监控
-        self._access_times = []
+        # 性能监控，保留最近100次访问记录
+        self._access_times: deque[float] = deque(maxlen=100)
         self._lock = asyncio.Lock()
 
     async def get_cached_config(self) -> Config:
         """获取缓存的配置对象
 
+        整个过程没有 await 点，在事件循环内天然是原子的，因此不获取锁；
+        命中时只需一次过期时间比较
+
         Returns:
             配置对象
 
         Raises:
             Exception: 配置加载失败时
         """
-        async with self._lock:
-            start_time = time.time()
-
-            try:
-                # 检查缓存是否有效
-                if self._is_cache_valid():
-                    self._cache_stats["hits"] += 1
-                    self._record_access_time(start_time)
-                    return self._cache
-
-                # 缓存未命中，重新加载
-                self._cache_stats["misses"] += 1
-                self._cache = config_manager.get_config()
-                self._cache_timestamp = time.time()
-
-                self._record_access_time(start_time)
-                return self._cache
-
-            except Exception as e:
-                self._cache_stats["errors"] += 1
-                raise e
-
-    def _is_cache_valid(self) -> bool:
-        """检查缓存是否有效"""
-        if self._cache is None:
-            return False
+        start_time = time.monotonic()
 
-        if self._ttl_seconds <= 0:
-            return True
+        # 检查缓存是否有效
+        cached = self._cache
+        if cached is not None and start_time < self._cache_expiry:
+            self._cache_stats["hits"] += 1
+            self._record_access_time(start_time)
+            return cached
+
+        # 缓存未命中，重新加载
+        self._cache_stats["misses"] += 1
+        try:
+            cached = config_manager.get_config()
+        except Exception:
+            self._cache_stats["errors"] += 1
+            raise
+
+        self._cache = cached
+        # TTL不大于0时表示永不过期
+        self._cache_expiry = (
+            time.monotonic() + self._ttl_seconds
+            if self._ttl_seconds > 0
+            else float("inf")
+        )
 
-        return (time.time() - self._cache_timestamp) < self._ttl_seconds
+        self._record_access_time(start_time)
+        return cached
 
     async def is_config_valid(self, config: Config) -> bool:
         """检查配置是否有效（带缓存）
@@ -173,7 +172,7 @@ class ConfigCache:
         """手动失效缓存"""
         async with self._lock:
             self._cache = None
-            self._cache_timestamp = 0
+            self._cache_expiry = 0
             self._validation_cache.clear()
             self._cache_stats["invalidations"] += 1
 
@@ -241,15 +240,14 @@ class ConfigCache:
         """清理缓存"""
         async with self._lock:
             self._cache = None
-            self._cache_timestamp = 0
+            self._cache_expiry = 0
             self._validation_cache.clear()
             self._access_times.clear()
 
     def _record_access_time(self, start_time: float) -> None:
-        """记录访问时间"""
-        access_time = time.time() - start_time
-        self._access_times.append(access_time)
+        """记录访问时间
 
-        # 保持最近100次访问记录
-        if len(self._access_times) > 100:
-            self._access_times.pop(0)
+        Args:
+            start_time: 访问开始时的 time.monotonic() 值
+        """
+        self._access_times.append(time.monotonic() - start_time)
@@ -3,7 +3,6 @@
 提供HTTP连接池的优化功能，包括连接复用、自适应大小调整和性能监控
 """
 
-import asyncio
 import ssl
 import time
 from typing import Dict, Any, Optional, Union
@@ -23,6 +22,9 @@ class ConnectionPoolOptimizer:
     - 连接状态监控和统计
     - DNS缓存优化
     - 性能监控集成
+
+    统计计数只在单个事件循环内更新，且读写之间没有 await 点，
+    因此无需加锁
     """
 
     def __init__(self, config: Config):
@@ -40,13 +42,17 @@ class ConnectionPoolOptimizer:
             "start_time": time.time(),
         }
         self._dns_stats = {"cache_hits": 0, "cache_misses": 0}
-        self._lock = asyncio.Lock()
+        # 默认SSL配置下创建的连接器，重复调用时复用
+        self._connector: Optional[aiohttp.TCPConnector] = None
 
     async def create_optimized_connector(
         self, ssl_context: Optional[Union[ssl.SSLContext, bool]] = None
     ) -> aiohttp.TCPConnector:
         """创建优化的TCP连接器
 
+        未指定SSL上下文时，连接器只创建一次并在后续调用中复用，
+        避免重复构建解析器、SSL上下文和DNS缓存
+
         Args:
             ssl_context: SSL上下文，如果未提供将使用默认安全设置
 
@@ -54,8 +60,18 @@ class ConnectionPoolOptimizer:
             优化的TCP连接器
         """
         if ssl_context is None:
-            ssl_context = self._create_default_ssl_context()
+            if self._connector is None or self._connector.closed:
+                self._connector = await self._build_connector(
+                    self._create_default_ssl_context()
+                )
+            return self._connector
 
+        return await self._build_connector(ssl_context)
+
+    async def _build_connector(
+        self, ssl_context: Union[ssl.SSLContext, bool]
+    ) -> aiohttp.TCPConnector:
+        """按当前统计数据构建新的TCP连接器"""
         # 计算优化的连接池大小
         optimized_pool_size = await self._calculate_optimal_pool_size()
         optimized_per_host = await self._calculate_optimal_per_host_connections()
@@ -95,23 +111,20 @@ class ConnectionPoolOptimizer:
         base_size = self.config.connection_pool_size
 
         # 基于历史统计数据调整
-        async with self._lock:
-            total_connections = (
-                self._pool_stats["connections_created"]
-                + self._pool_stats["connections_reused"]
-            )
+        reused = self._pool_stats["connections_reused"]
+        total_connections = self._pool_stats["connections_created"] + reused
 
-            if total_connections > 0:
-                reuse_ratio = self._pool_stats["connections_reused"] / total_connections
+        if total_connections > 0:
+            reuse_ratio = reused / total_connections
 
-                # 如果复用率低，增加连接池大小
-                if reuse_ratio < 0.3:
-                    return min(base_size * 2, 50)  # 最大50个连接
-                # 如果复用率很高，可以适当减少
-                elif reuse_ratio > 0.8:
-                    return max(base_size // 2, 5)  # 最小5个连接
+            # 如果复用率低，增加连接池大小
+            if reuse_ratio < 0.3:
+                return min(base_size * 2, 50)  # 最大50个连接
+            # 如果复用率很高，可以适当减少
+            elif reuse_ratio > 0.8:
+                return max(base_size // 2, 5)  # 最小5个连接
 
-            return base_size
+        return base_size
 
     async def _calculate_optimal_per_host_connections(self) -> int:
         """计算每个主机的最优连接数"""
@@ -124,28 +137,23 @@ class ConnectionPoolOptimizer:
 
     async def record_connection_created(self) -> None:
         """记录连接创建事件"""
-        async with self._lock:
-            self._pool_stats["connections_created"] += 1
+        self._pool_stats["connections_created"] += 1
 
     async def record_connection_reused(self) -> None:
         """记录连接复用事件"""
-        async with self._lock:
-            self._pool_stats["connections_reused"] += 1
+        self._pool_stats["connections_reused"] += 1
 
     async def record_connection_closed(self) -> None:
         """记录连接关闭事件"""
-        async with self._lock:
-            self._pool_stats["connections_closed"] += 1
+        self._pool_stats["connections_closed"] += 1
 
     async def record_connection_error(self) -> None:
         """记录连接错误事件"""
-        async with self._lock:
-            self._pool_stats["connection_errors"] += 1
+        self._pool_stats["connection_errors"] += 1
 
     async def get_pool_stats(self) -> Dict[str, Any]:
         """获取连接池统计信息"""
-        async with self._lock:
-            return self._pool_stats.copy()
+        return self._pool_stats.copy()
 
     async def get_pool_size_recommendation(self) -> int:
         """获取连接池大小建议"""
@@ -153,21 +161,13 @@ class ConnectionPoolOptimizer:
 
     async def get_connection_reuse_efficiency(self) -> float:
         """获取连接复用效率"""
-        async with self._lock:
-            total_connections = (
-                self._pool_stats["connections_created"]
-                + self._pool_stats["connections_reused"]
-            )
-
-            if total_connections == 0:
-                return 0.0
-
-            return self._pool_stats["connections_reused"] / total_connections
+        reused = self._pool_stats["connections_reused"]
+        total_connections = self._pool_stats["connections_created"] + reused
+        return reused / total_connections if total_connections else 0.0
 
     async def get_dns_cache_stats(self) -> Dict[str, int]:
         """获取DNS缓存统计"""
-        async with self._lock:
-            return self._dns_stats.copy()
+        return self._dns_stats.copy()
 
     async def get_optimized_timeouts(self) -> Dict[str, float]:
         """获取优化的超时配置"""
@@ -208,11 +208,16 @@ class ConnectionPoolOptimizer:
             "recommendations": recommendations,
         }
 
+    async def close(self) -> None:
+        """关闭复用的连接器"""
+        if self._connector is not None:
+            await self._connector.close()
+            self._connector = None
+
     async def cleanup_connections(self) -> None:
         """清理连接池"""
-        # 这个方法主要用于测试和维护
-        # 实际的连接清理由aiohttp的连接器自动处理
-        pass
+        # 实际的连接清理由aiohttp的连接器自动处理，这里只需关闭复用的连接器
+        await self.close()
 
     async def get_performance_report(self) -> Dict[str, Any]:
         """获取性能报告"""
@@ -7,7 +7,7 @@ import asyncio
 import time
 import psutil
 from pathlib import Path
-from typing import Callable, Optional, Any
+from typing import Any, Callable, List, Optional
 from dataclasses import dataclass
 
 import aiofiles
@@ -15,6 +15,15 @@ import aiohttp
 
 from ..config import Config
 
+# 流式下载时每隔多少个数据块采样一次内存（2的幂，便于位运算判断）
+MEMORY_SAMPLE_INTERVAL = 1024
+
+# 流式写入缓冲大小，累积到该字节数后批量写盘
+WRITE_BUFFER_SIZE = 1 << 20  # 1MB
+
+# 限速等待的最小时长(秒)，更短的等待只会带来事件循环调度开销
+MIN_SPEED_LIMIT_SLEEP = 0.001
+
 
 @dataclass
 class DownloadResult:
@@ -55,6 +64,8 @@ class StreamingDownloader:
         """
         self.config = config
         self.memory_threshold_mb = memory_threshold_mb
+        # 预先换算为字节，每次下载只需一次整数比较
+        self._threshold_bytes = int(memory_threshold_mb * 1024 * 1024)
         self.speed_limit_mbps = speed_limit_mbps
 
         # 内存监控
@@ -66,6 +77,7 @@ class StreamingDownloader:
         response: aiohttp.ClientResponse,
         file_path: Path,
         progress_callback: Optional[Callable[[int, int, float], None]] = None,
+        chunk_size: Optional[int] = None,
     ) -> DownloadResult:
         """下载文件
 
@@ -73,6 +85,7 @@ class StreamingDownloader:
             response: HTTP响应对象
             file_path: 目标文件路径
             progress_callback: 进度回调函数 (downloaded, total, speed)
+            chunk_size: 流式下载块大小，默认使用配置中的 chunk_size
 
         Returns:
             下载结果
@@ -90,7 +103,11 @@ class StreamingDownloader:
 
             if use_streaming:
                 result = await self._stream_download(
-                    response, file_path, total_bytes, progress_callback
+                    response,
+                    file_path,
+                    total_bytes,
+                    progress_callback,
+                    chunk_size or self.config.chunk_size,
                 )
             else:
                 result = await self._regular_download(
@@ -132,8 +149,7 @@ class StreamingDownloader:
         if file_size <= 0:
             return False
 
-        size_mb = file_size / (1024 * 1024)
-        return size_mb > self.memory_threshold_mb
+        return file_size > self._threshold_bytes
 
     async def _regular_download(
         self,
@@ -179,26 +195,35 @@ class StreamingDownloader:
         file_path: Path,
         total_bytes: int,
         progress_callback: Optional[Callable[[int, int, float], None]] = None,
+        chunk_size: Optional[int] = None,
     ) -> DownloadResult:
         """流式下载"""
         downloaded_bytes = 0
+        chunk_count = 0
+        write_buffer: List[bytes] = []
+        buffered_bytes = 0
         start_time = time.time()
         last_callback_time = start_time
 
         try:
             async with aiofiles.open(file_path, "wb") as f:
                 async for chunk in response.content.iter_chunked(
-                    self.config.chunk_size
+                    chunk_size or self.config.chunk_size
                 ):
-                    if not chunk:
-                        break
-
-                    # 写入块
-                    await f.write(chunk)
+                    # iter_chunked在EOF时结束迭代，不会产出空块
+                    # 缓冲数据块，攒够后一次写入，减少写文件调用次数
+                    write_buffer.append(chunk)
+                    buffered_bytes += len(chunk)
                     downloaded_bytes += len(chunk)
+                    if buffered_bytes >= WRITE_BUFFER_SIZE:
+                        await f.writelines(write_buffer)
+                        write_buffer.clear()
+                        buffered_bytes = 0
 
-                    # 更新内存统计
-                    self._update_memory_stats()
+                    # 按块数间隔采样内存，避免每块都读取进程内存信息
+                    if chunk_count & (MEMORY_SAMPLE_INTERVAL - 1) == 0:
+                        self._update_memory_stats()
+                    chunk_count += 1
 
                     # 速度限制
                     if self.speed_limit_mbps:
@@ -206,13 +231,27 @@ class StreamingDownloader:
                             downloaded_bytes, start_time, self.speed_limit_mbps
                         )
 
-                    # 进度回调（限制频率）
-                    current_time = time.time()
-                    if progress_callback and (current_time - last_callback_time) >= 0.1:
-                        elapsed = current_time - start_time
-                        speed = downloaded_bytes / elapsed if elapsed > 0 else 0
-                        progress_callback(downloaded_bytes, total_bytes, speed)
-                        last_callback_time = current_time
+                    # 进度回调（限制频率），无回调时连时间都不读取
+                    if progress_callback is not None:
+                        current_time = time.time()
+                        if current_time - last_callback_time >= 0.1:
+                            elapsed = current_time - start_time
+                            speed = downloaded_bytes / elapsed if elapsed > 0 else 0
+                            progress_callback(downloaded_bytes, total_bytes, speed)
+                            last_callback_time = current_time
+
+                # 写入剩余的缓冲数据
+                if write_buffer:
+                    await f.writelines(write_buffer)
+
+            # 结束时报告最终进度，保证最后一次回调反映完整下载量
+            if progress_callback is not None:
+                elapsed = time.time() - start_time
+                speed = downloaded_bytes / elapsed if elapsed > 0 else 0
+                progress_callback(downloaded_bytes, total_bytes, speed)
+
+            # 下载结束时补充一次采样
+            self._update_memory_stats()
 
             return DownloadResult(
                 success=True, total_bytes=total_bytes, downloaded_bytes=downloaded_bytes
@@ -228,26 +267,19 @@ class StreamingDownloader:
     ) -> None:
         """应用下载速度限制
 
+        按累计字节数计算理想耗时，超前部分即为需要等待的时间。
+        不足 MIN_SPEED_LIMIT_SLEEP 的超前量不等待，累积到后续块一并补偿
+
         Args:
             downloaded_bytes: 已下载字节数
             start_time: 开始时间
             limit_mbps: 速度限制(MB/s)
         """
-        elapsed_time = time.time() - start_time
-        if elapsed_time <= 0:
-            return
-
-        # 计算当前速度
-        current_speed_mbps = (downloaded_bytes / (1024 * 1024)) / elapsed_time
-
-        # 如果超过限制，计算需要等待的时间
-        if current_speed_mbps > limit_mbps:
-            # 计算理想的下载时间
-            ideal_time = (downloaded_bytes / (1024 * 1024)) / limit_mbps
-            wait_time = ideal_time - elapsed_time
+        ideal_time = downloaded_bytes / (limit_mbps * 1024 * 1024)
+        wait_time = ideal_time - (time.time() - start_time)
 
-            if wait_time > 0:
-                await asyncio.sleep(wait_time)
+        if wait_time >= MIN_SPEED_LIMIT_SLEEP:
+            await asyncio.sleep(wait_time)
 
     def _update_memory_stats(self) -> None:
         """更新内存使用统计"""
@@ -9,7 +9,7 @@ import random
 import time
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Callable, Dict, Optional, Type, TypeVar, Union
+from typing import Any, Callable, Dict, Mapping, Optional, Type, TypeVar, Union
 
 import aiohttp
 from pydantic import BaseModel, Field, field_validator
@@ -224,6 +224,10 @@ def calculate_resume_position(file_path: Path, progress_data: Dict[str, Any]) ->
     if file_size == recorded_size:
         return file_size
 
+    # 文件按总大小预分配过，已写入的部分以记录为准
+    if file_size > recorded_size and file_size == progress_data.get("total"):
+        return recorded_size
+
     # 如果文件更大，可能是之前下载的不同文件，重新开始
     if file_size > recorded_size:
         return 0
@@ -232,8 +236,40 @@ def calculate_resume_position(file_path: Path, progress_data: Dict[str, Any]) ->
     return file_size
 
 
-def create_range_headers(start_byte: int) -> Dict[str, str]:
-    """创建Range请求头"""
-    if start_byte > 0:
-        return {"Range": f"bytes={start_byte}-"}
-    return {}
+def create_range_headers(
+    start_byte: int, validator: Optional[str] = None
+) -> Dict[str, str]:
+    """创建Range请求头
+
+    Args:
+        start_byte: 续传起始字节
+        validator: 首次下载时响应的ETag或Last-Modified，作为If-Range条件，
+            服务器上的文件已变化时会返回200完整内容而不是206
+
+    Returns:
+        请求头字典，无需续传时为空
+    """
+    if start_byte <= 0:
+        return {}
+
+    headers = {"Range": f"bytes={start_byte}-"}
+    if validator:
+        headers["If-Range"] = validator
+    return headers
+
+
+def get_resume_validator(headers: Mapping[str, str]) -> Optional[str]:
+    """从响应头中提取续传校验值
+
+    If-Range只接受强ETag，弱ETag（W/前缀）时退回Last-Modified
+
+    Args:
+        headers: 响应头
+
+    Returns:
+        ETag或Last-Modified，都没有时返回None
+    """
+    etag = headers.get("ETag")
+    if etag and not etag.startswith("W/"):
+        return etag
+    return headers.get("Last-Modified")
@@ -5,9 +5,46 @@ HTML安全清理模块
 """
 
 import html
+import re
+import threading
 from typing import Any, Dict, List
 
-import bleach
+from bleach.sanitizer import Cleaner
+
+# HTML转Markdown的转换规则，模块加载时编译一次，按顺序应用
+_MARKDOWN_RULES = (
+    # 转换标题
+    *(
+        (re.compile(rf"<h{i}[^>]*>(.*?)</h{i}>", re.IGNORECASE), rf'{"#" * i} \1\n')
+        for i in range(1, 7)
+    ),
+    # 转换段落
+    (re.compile(r"<p[^>]*>", re.IGNORECASE), "\n"),
+    (re.compile(r"</p>", re.IGNORECASE), "\n"),
+    # 转换换行
+    (re.compile(r"<br[^>]*/?>", re.IGNORECASE), "\n"),
+    # 转换粗体
+    (re.compile(r"<(strong|b)[^>]*>(.*?)</\1>", re.IGNORECASE), r"**\2**"),
+    # 转换斜体
+    (re.compile(r"<(em|i)[^>]*>(.*?)</\1>", re.IGNORECASE), r"*\2*"),
+    # 转换链接
+    (
+        re.compile(r'<a[^>]*href=["\']([^"\']*)["\'][^>]*>(.*?)</a>', re.IGNORECASE),
+        r"[\2](\1)",
+    ),
+    # 转换列表项
+    (re.compile(r"<li[^>]*>", re.IGNORECASE), "- "),
+    (re.compile(r"</li>", re.IGNORECASE), "\n"),
+    # 转换引用
+    (
+        re.compile(r"<blockquote[^>]*>(.*?)</blockquote>", re.IGNORECASE | re.DOTALL),
+        r"> \1\n",
+    ),
+    # 移除剩余的HTML标签
+    (re.compile(r"<[^>]+>"), ""),
+    # 清理多余的空行
+    (re.compile(r"\n\s*\n\s*\n"), "\n\n"),
+)
 
 
 class HtmlSanitizer:
@@ -44,6 +81,8 @@ class HtmlSanitizer:
 
     def __init__(self) -> None:
         """初始化HTML清理器"""
+        # bleach的Cleaner持有解析器状态，不能跨线程共享，按线程各建一个
+        self._local = threading.local()
         self._configure_bleach()
 
     def _configure_bleach(self) -> None:
@@ -57,6 +96,14 @@ class HtmlSanitizer:
             "strip_comments": True,  # 移除HTML注释
         }
 
+    def _get_cleaner(self) -> Cleaner:
+        """获取当前线程复用的Cleaner，避免每次清理都重建html5lib解析器和序列化器"""
+        cleaner = getattr(self._local, "cleaner", None)
+        if cleaner is None:
+            cleaner = Cleaner(**self.bleach_config)
+            self._local.cleaner = cleaner
+        return cleaner
+
     def sanitize_html(self, html_content: str) -> str:
         """
         安全清理HTML内容
@@ -80,15 +127,8 @@ class HtmlSanitizer:
         # 第二步：预处理，移除危险标签及其内容（在实体解码前）
         preprocessed_content = self._preprocess_dangerous_content(normalized_content)
 
-        # 第三步：使用bleach清理HTML
-        cleaned_html = bleach.clean(
-            preprocessed_content,
-            tags=self.ALLOWED_TAGS,
-            attributes=self.ALLOWED_ATTRIBUTES,
-            protocols=self.ALLOWED_PROTOCOLS,
-            strip=True,  # 移除不允许的标签
-            strip_comments=True,  # 移除HTML注释
-        )
+        # 第三步：使用bleach清理HTML（配置见 bleach_config：移除不允许的标签和注释）
+        cleaned_html = self._get_cleaner().clean(preprocessed_content)
 
         # 第四步：再次检查是否有遗漏的危险内容
         cleaned_html = self._additional_security_check(cleaned_html)
@@ -334,61 +374,9 @@ class HtmlSanitizer:
         Returns:
             Markdown格式内容
         """
-        import re
-
         result = safe_html
-
-        # 转换标题
-        for i in range(1, 7):
-            result = re.sub(
-                rf"<h{i}[^>]*>(.*?)</h{i}>",
-                rf'{"#" * i} \1\n',
-                result,
-                flags=re.IGNORECASE,
-            )
-
-        # 转换段落
-        result = re.sub(r"<p[^>]*>", "\n", result, flags=re.IGNORECASE)
-        result = re.sub(r"</p>", "\n", result, flags=re.IGNORECASE)
-
-        # 转换换行
-        result = re.sub(r"<br[^>]*/?>", "\n", result, flags=re.IGNORECASE)
-
-        # 转换粗体
-        result = re.sub(
-            r"<(strong|b)[^>]*>(.*?)</\1>", r"**\2**", result, flags=re.IGNORECASE
-        )
-
-        # 转换斜体
-        result = re.sub(
-            r"<(em|i)[^>]*>(.*?)</\1>", r"*\2*", result, flags=re.IGNORECASE
-        )
-
-        # 转换链接
-        result = re.sub(
-            r'<a[^>]*href=["\']([^"\']*)["\'][^>]*>(.*?)</a>',
-            r"[\2](\1)",
-            result,
-            flags=re.IGNORECASE,
-        )
-
-        # 转换列表项
-        result = re.sub(r"<li[^>]*>", "- ", result, flags=re.IGNORECASE)
-        result = re.sub(r"</li>", "\n", result, flags=re.IGNORECASE)
-
-        # 转换引用
-        result = re.sub(
-            r"<blockquote[^>]*>(.*?)</blockquote>",
-            r"> \1\n",
-            result,
-            flags=re.IGNORECASE | re.DOTALL,
-        )
-
-        # 移除剩余的HTML标签
-        result = re.sub(r"<[^>]+>", "", result)
-
-        # 清理多余的空行
-        result = re.sub(r"\n\s*\n\s*\n", "\n\n", result)
+        for pattern, replacement in _MARKDOWN_RULES:
+            result = pattern.sub(replacement, result)
 
         return result
 
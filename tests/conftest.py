@@ -2,22 +2,47 @@
 
 import asyncio
 import os
+from functools import lru_cache
 from pathlib import Path
+from types import SimpleNamespace
 
+import aiofiles
 import pytest
 
+from src.xyz_dl.models import EpisodeInfo, PodcastInfo
+
+from .utils.fake_aiofiles import FakeAiofiles
 from .utils.mock_http import HTTPMocker
 
 # 导入测试工具
 from .utils.test_data_manager import TestDataManager
 
 
+def pytest_addoption(parser):
+    """注册命令行选项"""
+    parser.addoption(
+        "--runslow", action="store_true", default=False, help="运行标记为slow的测试"
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    """未指定 --runslow 时跳过slow测试"""
+    if config.getoption("--runslow"):
+        return
+    skip_slow = pytest.mark.skip(reason="需要 --runslow 选项才会运行")
+    for item in items:
+        if "slow" in item.keywords:
+            item.add_marker(skip_slow)
+
+
 @pytest.fixture(scope="session")
-def event_loop():
-    """为异步测试提供事件循环"""
-    loop = asyncio.new_event_loop()
-    yield loop
-    loop.close()
+def event_loop_policy():
+    """异步测试使用的事件循环策略，安装了uvloop时优先使用"""
+    try:
+        import uvloop
+    except ImportError:
+        return asyncio.get_event_loop_policy()
+    return uvloop.EventLoopPolicy()
 
 
 @pytest.fixture
@@ -66,22 +91,113 @@ def sample_episode_data():
     }
 
 
+@pytest.fixture(scope="session")
+def sample_podcast():
+    """样本播客信息 - session级别共享，测试中不要修改"""
+    return PodcastInfo(title="测试播客", author="测试作者")
+
+
+@pytest.fixture(scope="session")
+def sample_episode(sample_podcast):
+    """样本节目信息 - session级别共享，测试中不要修改"""
+    return EpisodeInfo(
+        title="测试节目",
+        podcast=sample_podcast,
+        duration=3600000,  # 1小时
+        pub_date="2025-01-01T00:00:00Z",
+        eid="test123",
+        shownotes="这是测试show notes",
+        audio_url="https://example.com/test-audio.mp3",
+    )
+
+
+@pytest.fixture(scope="session")
+def shared_env():
+    """包对象与全局配置 - session级别共享，测试中不要修改
+
+    与测试模块一致使用 xyz_dl 顶层包导入，而不是 src.xyz_dl
+    """
+    import xyz_dl
+    from xyz_dl.config import get_config
+
+    return SimpleNamespace(config=get_config(), pkg=xyz_dl)
+
+
 @pytest.fixture(scope="session")
 def test_data_manager():
     """测试数据管理器fixture - session级别"""
     return TestDataManager()
 
 
+@pytest.fixture(scope="session")
+def sample_url_files():
+    """样本URL及其测试数据文件名的 (url, filename) 元组 - session级别"""
+    from .utils.test_data_manager import DEFAULT_URL_FILES
+
+    return DEFAULT_URL_FILES
+
+
+@pytest.fixture(scope="session")
+def html_cache(test_data_manager, sample_url_files):
+    """预加载的样本HTML，按文件名索引 - session级别只读取一次磁盘"""
+    return {
+        filename: test_data_manager.load_html_sync(filename)
+        for _, filename in sample_url_files
+    }
+
+
 @pytest.fixture(scope="function")
-def http_mocker(test_data_manager):
-    """HTTP Mock管理器fixture - function级别"""
+def http_mocker(test_data_manager, monkeypatch):
+    """HTTP Mock管理器fixture - function级别，由monkeypatch负责还原"""
     mocker = HTTPMocker(test_data_manager)
-    mocker.start_mock()
+    mocker.start_mock(monkeypatch)
+
+    return mocker
+
+
+@pytest.fixture(scope="function")
+def fake_aiofiles(monkeypatch):
+    """用内存文件替换 aiofiles.open - function级别，测试结束自动还原"""
+    fake = FakeAiofiles()
+    monkeypatch.setattr(aiofiles, "open", fake.open)
+    return fake
+
+
+@lru_cache(maxsize=None)
+def _filler_bytes(size: int) -> bytes:
+    """指定长度的填充数据，bytes不可变，同一长度在各测试间共享同一个对象"""
+    return b"x" * size
+
+
+@pytest.fixture(scope="session")
+def mock_response_factory():
+    """分块下载响应Mock工厂
+
+    返回 make(size, chunk_size) 函数，生成的响应带有 content-length 头，
+    iter_chunked 按块大小反复产出同一个数据块，最后产出余数块，read 返回完整内容。
+    响应用普通协程函数拼装，不经过 AsyncMock 的调用记录
+    """
+
+    def make(size: int, chunk_size: int) -> SimpleNamespace:
+        full_chunks, remainder = divmod(size, chunk_size)
+        payload = _filler_bytes(chunk_size)
+        tail = _filler_bytes(remainder)
+
+        async def iter_chunked(_size):
+            for _ in range(full_chunks):
+                yield payload
+            if tail:
+                yield tail
+
+        async def read():
+            return _filler_bytes(size)
 
-    yield mocker
+        return SimpleNamespace(
+            headers={"content-length": str(size)},
+            content=SimpleNamespace(iter_chunked=iter_chunked, read=read),
+        )
 
-    # 清理
-    mocker.stop_mock()
+    return make
 
 
 @pytest.fixture
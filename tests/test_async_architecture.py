@@ -14,7 +14,8 @@ import time
 
 from src.xyz_dl.cli import main, CLIApplication, async_main
 from src.xyz_dl.downloader import XiaoYuZhouDL, download_episode_sync
-from src.xyz_dl.models import DownloadRequest
+from src.xyz_dl.cache.episode_cache import DEFAULT_EPISODE_CACHE_TTL
+from src.xyz_dl.models import Config, DownloadRequest, DownloadResult
 
 
 class TestEventLoopNesting:
@@ -58,8 +59,7 @@ class TestEventLoopNesting:
                 config=test_config
             )
             # 验证返回了结构化的结果对象
-            assert hasattr(result, 'success')
-            assert hasattr(result, 'error')
+            assert isinstance(result, DownloadResult)
 
         asyncio.run(run_in_existing_loop())
 
@@ -82,8 +82,7 @@ class TestEventLoopNesting:
 
             # 现在应该正常工作而不是抛出异常
             result = downloader.download_sync(request)
-            assert hasattr(result, 'success')
-            assert hasattr(result, 'error')
+            assert isinstance(result, DownloadResult)
 
         asyncio.run(run_in_existing_loop())
 
@@ -185,6 +184,80 @@ class TestResourceManagement:
 
         await downloader._close_session()
 
+    @pytest.mark.asyncio
+    async def test_cli_batch_shares_one_downloader(self, tmp_path):
+        """测试：批量下载的所有节目共用同一个下载器会话"""
+        url_file = tmp_path / "urls.txt"
+        url_file.write_text("# 注释\nep2\n\nep1\n", encoding="utf-8")
+
+        app = CLIApplication()
+        args = app.create_parser().parse_args(
+            ["ep1", "--from-file", str(url_file), "--mode", "md", "-j", "2"]
+        )
+        assert app.collect_urls(args) == ["ep1", "ep2"]
+
+        downloaders = []
+
+        async def fake_download(self, request):
+            downloaders.append(self)
+            return DownloadResult(success=False, error="offline")
+
+        with patch.object(XiaoYuZhouDL, "download", fake_download):
+            exit_code = await app.run_download(args)
+
+        assert exit_code == 1
+        assert len(downloaders) == 2
+        assert downloaders[0] is downloaders[1]
+        assert downloaders[0].config.max_concurrent_downloads == 2
+        # 批量下载不交互询问，默认跳过已存在的文件
+        assert downloaders[0].config.non_interactive
+        assert not downloaders[0].config.default_overwrite_behavior
+
+    @pytest.mark.asyncio
+    async def test_cli_batch_limits_concurrent_episodes(self):
+        """测试：批量下载同时处理的节目数不超过--concurrency"""
+        app = CLIApplication()
+        args = app.create_parser().parse_args(["ep1", "ep2", "ep3", "-j", "1"])
+        active = 0
+        max_active = 0
+
+        async def fake_download(self, request):
+            nonlocal active, max_active
+            active += 1
+            max_active = max(max_active, active)
+            await asyncio.sleep(0)
+            active -= 1
+            return DownloadResult(success=False, error="offline")
+
+        with patch.object(XiaoYuZhouDL, "download", fake_download):
+            await app.run_download(args)
+
+        assert max_active == 1
+
+    def test_cli_cache_ttl_respects_environment(self):
+        """测试：未指定--cache-ttl时使用环境配置，未配置时使用默认缓存时间"""
+        app = CLIApplication()
+        parser = app.create_parser()
+
+        env_config = Config(episode_cache_ttl=100)
+        with patch("src.xyz_dl.cli.get_config", return_value=env_config):
+            config = app.build_config(parser.parse_args(["ep1"]))
+            assert config.episode_cache_ttl == 100
+            args = parser.parse_args(["ep1", "--cache-ttl", "5"])
+            assert app.build_config(args).episode_cache_ttl == 5
+            args = parser.parse_args(["ep1", "--no-cache"])
+            assert app.build_config(args).episode_cache_ttl == 0
+
+        with patch("src.xyz_dl.cli.get_config", return_value=Config()):
+            config = app.build_config(parser.parse_args(["ep1"]))
+            assert config.episode_cache_ttl == DEFAULT_EPISODE_CACHE_TTL
+
+        # 环境变量显式设置为0时关闭缓存
+        disabled_config = Config(episode_cache_ttl=0)
+        with patch("src.xyz_dl.cli.get_config", return_value=disabled_config):
+            config = app.build_config(parser.parse_args(["ep1"]))
+            assert config.episode_cache_ttl == 0
+
 
 class TestCurrentSyncWrapperIssues:
     """测试当前同步包装器的问题"""
@@ -206,7 +279,7 @@ class TestCurrentSyncWrapperIssues:
                     mode="md"  # 只下载md避免实际网络请求
                 )
                 # 期望：即使失败也应该返回结构化的错误，而不是崩溃
-                assert hasattr(result, 'success')
+                assert isinstance(result, DownloadResult)
             except Exception as e:
                 # 记录当前实现的问题
                 assert "cannot be called from a running event loop" not in str(e)
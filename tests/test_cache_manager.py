@@ -2,10 +2,14 @@
 
 import asyncio
 import pytest
-from unittest.mock import AsyncMock, Mock
+from unittest.mock import AsyncMock, Mock, patch
 
 from src.xyz_dl.cache.cache_manager import CacheManager, CacheEntry
+from src.xyz_dl.cache.episode_cache import EpisodeCache
 from src.xyz_dl.config import Config
+from src.xyz_dl.downloader import XiaoYuZhouDL
+from src.xyz_dl.exceptions import ParseError
+from src.xyz_dl.models import DownloadRequest, EpisodeInfo, PodcastInfo
 
 
 @pytest.fixture
@@ -123,6 +127,19 @@ async def test_cache_entry_expiration():
     assert result is None
 
 
+@pytest.mark.asyncio
+async def test_cache_get_does_not_wait_for_lock():
+    """测试读取缓存不需要等待写锁"""
+    cache_manager = CacheManager(Config())
+    await cache_manager.set("url", b"content", {})
+
+    async with cache_manager._lock:
+        result = await asyncio.wait_for(cache_manager.get("url"), timeout=0.1)
+
+    assert result is not None
+    assert result.content == b"content"
+
+
 @pytest.mark.asyncio
 async def test_cache_clear():
     """测试缓存清空功能"""
@@ -164,4 +181,119 @@ async def test_cache_statistics():
 
     stats = await cache_manager.get_stats()
     assert stats["hits"] == 1
-    assert stats["entries"] == 1
\ No newline at end of file
+    assert stats["entries"] == 1
+
+
+EPISODE_URL = "https://www.xiaoyuzhoufm.com/episode/abc123"
+AUDIO_URL = "https://media.xyzcdn.net/abc123.m4a"
+
+
+def _episode_info():
+    """构造测试用节目信息"""
+    return EpisodeInfo(
+        title="测试节目", podcast=PodcastInfo(title="测试播客", author="主播"), eid="abc123"
+    )
+
+
+def test_episode_cache_persists_between_instances(tmp_path):
+    """测试节目缓存写入后可被新实例读取"""
+    cache_path = tmp_path / "episodes.json"
+    EpisodeCache(cache_path=cache_path).set("abc123", _episode_info(), AUDIO_URL)
+
+    cached = EpisodeCache(cache_path=cache_path).get("abc123")
+    assert cached is not None
+    episode_info, audio_url = cached
+    assert episode_info == _episode_info()
+    assert audio_url == AUDIO_URL
+    assert not (tmp_path / "episodes.json.tmp").exists()
+
+
+def test_episode_cache_expiry_and_signed_urls(tmp_path):
+    """测试过期条目不命中，带签名参数的音频URL不缓存"""
+    cache = EpisodeCache(cache_path=tmp_path / "episodes.json", ttl_seconds=60)
+    cache.set("abc123", _episode_info(), AUDIO_URL)
+
+    with patch("src.xyz_dl.cache.episode_cache.time.time", return_value=1e12):
+        assert cache.get("abc123") is None
+
+    cache.set("signed", _episode_info(), AUDIO_URL + "?sign=xyz&t=1")
+    assert cache.get("signed") is None
+
+
+def test_episode_cache_ignores_corrupt_file(tmp_path):
+    """测试缓存文件损坏时视为空缓存"""
+    cache_path = tmp_path / "episodes.json"
+    cache_path.write_text("{not json", encoding="utf-8")
+
+    cache = EpisodeCache(cache_path=cache_path)
+    assert cache.get("abc123") is None
+
+    cache.set("abc123", _episode_info(), AUDIO_URL)
+    assert EpisodeCache(cache_path=cache_path).get("abc123") is not None
+
+
+@pytest.mark.asyncio
+async def test_downloader_uses_episode_cache(tmp_path):
+    """测试缓存命中时跳过页面请求，refresh时重新解析"""
+    cache = EpisodeCache(cache_path=tmp_path / "episodes.json")
+    parse_mock = AsyncMock(return_value=(_episode_info(), AUDIO_URL))
+
+    with patch("src.xyz_dl.downloader.parse_episode_from_url", parse_mock):
+        await XiaoYuZhouDL(episode_cache=cache)._parse_episode(EPISODE_URL)
+        downloader = XiaoYuZhouDL(episode_cache=cache)
+        episode_info, audio_url = await downloader._parse_episode(EPISODE_URL)
+        assert parse_mock.await_count == 1
+        assert audio_url == AUDIO_URL
+        assert episode_info.title == "测试节目"
+
+        refreshing = XiaoYuZhouDL(
+            config=Config(episode_cache_refresh=True), episode_cache=cache
+        )
+        await refreshing._parse_episode(EPISODE_URL)
+        assert parse_mock.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_downloader_memoizes_episode_parse():
+    """测试同一下载器内重复的节目只解析一次，解析失败不保留"""
+    parse_mock = AsyncMock(return_value=(_episode_info(), AUDIO_URL))
+
+    with patch("src.xyz_dl.downloader.parse_episode_from_url", parse_mock):
+        downloader = XiaoYuZhouDL()
+        results = await asyncio.gather(
+            downloader._parse_episode(EPISODE_URL),
+            downloader._parse_episode(EPISODE_URL),
+        )
+        await downloader._parse_episode(EPISODE_URL)
+        assert parse_mock.await_count == 1
+        assert results[0] == results[1]
+
+    failing_mock = AsyncMock(side_effect=ValueError("boom"))
+    with patch("src.xyz_dl.downloader.parse_episode_from_url", failing_mock):
+        downloader = XiaoYuZhouDL(config=Config(max_retries=1))
+        for _ in range(2):
+            with pytest.raises(ParseError):
+                await downloader._parse_episode(EPISODE_URL)
+        assert failing_mock.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_downloader_releases_episode_parse():
+    """测试下载结束后不再复用解析结果，要求刷新时不共享解析任务"""
+    signed_url = AUDIO_URL + "?sign=xyz&t=1"
+    parse_mock = AsyncMock(return_value=(_episode_info(), signed_url))
+
+    with patch("src.xyz_dl.downloader.parse_episode_from_url", parse_mock):
+        async with XiaoYuZhouDL() as downloader:
+            for _ in range(2):
+                result = await downloader.download(
+                    DownloadRequest(url=EPISODE_URL, url_only=True)
+                )
+                assert result.success
+            assert parse_mock.await_count == 2
+            assert not downloader._episode_parses
+
+        refreshing = XiaoYuZhouDL(config=Config(episode_cache_refresh=True))
+        await refreshing._parse_episode(EPISODE_URL)
+        await refreshing._parse_episode(EPISODE_URL)
+        assert parse_mock.await_count == 4
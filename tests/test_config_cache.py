@@ -5,7 +5,7 @@ import pytest
 from unittest.mock import patch, Mock
 
 from src.xyz_dl.performance.config_cache import ConfigCache
-from src.xyz_dl.config import Config, ConfigManager
+from src.xyz_dl.config import Config, ConfigManager, Settings
 
 
 @pytest.fixture
@@ -80,6 +80,20 @@ async def test_config_cache_ttl_expiration(config_cache):
         assert stats['misses'] == 2  # 两次都是缓存未命中
 
 
+@pytest.mark.asyncio
+async def test_config_cache_zero_ttl_never_expires():
+    """测试TTL为0时缓存永不过期"""
+    config_cache = ConfigCache(ttl_seconds=0)
+
+    with patch.object(ConfigManager, 'get_config', return_value=Config()) as mock_get:
+        config1 = await config_cache.get_cached_config()
+        await asyncio.sleep(0.01)
+        config2 = await config_cache.get_cached_config()
+
+        assert config1 is config2
+        assert mock_get.call_count == 1
+
+
 @pytest.mark.asyncio
 async def test_config_cache_validation_caching(config_cache):
     """测试配置验证结果缓存"""
@@ -219,4 +233,18 @@ async def test_config_cache_size_limit(config_cache):
 
     # 验证验证缓存大小限制（注意这里测试的是验证缓存，不是配置缓存）
     memory_stats = await config_cache.get_memory_stats()
-    assert memory_stats['validation_cache_size'] <= config_cache._max_validation_cache_size
\ No newline at end of file
+    assert memory_stats['validation_cache_size'] <= config_cache._max_validation_cache_size
+
+
+def test_settings_to_config_maps_env(monkeypatch):
+    """测试环境变量设置完整映射到Config"""
+    monkeypatch.setenv('XYZ_DL_DOWNLOAD_CONNECTIONS', '4')
+    monkeypatch.setenv('XYZ_DL_EPISODE_CACHE_TTL', '100')
+
+    config = Settings().to_config()
+    assert config.download_connections == 4
+    assert config.episode_cache_ttl == 100
+
+    # 未设置时保留None，由调用方决定默认值
+    monkeypatch.delenv('XYZ_DL_EPISODE_CACHE_TTL')
+    assert Settings().to_config().episode_cache_ttl is None
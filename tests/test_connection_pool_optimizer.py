@@ -94,6 +94,21 @@ async def test_connection_reuse_efficiency(optimizer):
     assert abs(efficiency - expected_efficiency) < 0.01
 
 
+@pytest.mark.asyncio
+async def test_optimized_connector_reused(optimizer):
+    """测试默认SSL配置下连接器被复用，关闭后重新创建"""
+    connector1 = await optimizer.create_optimized_connector()
+    connector2 = await optimizer.create_optimized_connector()
+    assert connector1 is connector2
+
+    await optimizer.close()
+    assert connector1.closed
+
+    connector3 = await optimizer.create_optimized_connector()
+    assert connector3 is not connector1
+    await optimizer.close()
+
+
 @pytest.mark.asyncio
 async def test_dns_cache_optimization(optimizer):
     """测试DNS缓存优化"""
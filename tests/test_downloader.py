@@ -1,13 +1,17 @@
 """测试下载器模块"""
 
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, Mock, patch
 
+import aiohttp
 import pytest
+from aioresponses import CallbackResult, aioresponses
 from pydantic import ValidationError as PydanticValidationError
+from yarl import URL
 
-from src.xyz_dl.downloader import XiaoYuZhouDL
-from src.xyz_dl.exceptions import ValidationError
+from src.xyz_dl.downloader import XiaoYuZhouDL, _split_byte_ranges
+from src.xyz_dl.exceptions import NetworkError, ValidationError
 from src.xyz_dl.models import Config, DownloadRequest, EpisodeInfo, PodcastInfo
+from src.xyz_dl.retry import DownloadProgressManager
 
 
 class TestXiaoYuZhouDL:
@@ -21,6 +25,17 @@ class TestXiaoYuZhouDL:
         assert downloader.parser is not None
         assert downloader.progress_callback is None
 
+    def test_shared_progress_reused_while_active(self):
+        """测试并发下载共用同一个进度条，全部退出后停止显示"""
+        downloader = XiaoYuZhouDL()
+
+        with downloader._shared_progress() as first:
+            with downloader._shared_progress() as second:
+                assert first is second
+            assert downloader._progress is first
+
+        assert downloader._progress is None
+
     def test_init_with_custom_config(self):
         """测试使用自定义配置初始化"""
         config = Config(timeout=60)
@@ -46,13 +61,36 @@ class TestXiaoYuZhouDL:
         """测试文件名生成"""
         downloader = XiaoYuZhouDL()
 
-        podcast = PodcastInfo(title="测试播客", author="测试作者")
-        episode = EpisodeInfo(title="第1期 - 主播名", podcast=podcast, eid="test123")
+        podcast = PodcastInfo.model_construct(title="测试播客", author="测试作者")
+        episode = EpisodeInfo.model_construct(
+            title="第1期 - 主播名", podcast=podcast, eid="test123"
+        )
 
         filename = downloader._generate_filename(episode)
         assert "test123" in filename
         assert "主播名" in filename
 
+    def test_parse_episode_title(self):
+        """测试按第一个分隔符拆分节目名和主播名"""
+        downloader = XiaoYuZhouDL()
+
+        assert downloader._parse_episode_title("第1期 - 主播名", "播客") == (
+            "第1期",
+            "主播名",
+        )
+        assert downloader._parse_episode_title(" 上 - 下 - 主播 ", "播客") == (
+            "上",
+            "下 - 主播",
+        )
+        assert downloader._parse_episode_title("没有分隔符", "播客") == (
+            "没有分隔符",
+            "播客",
+        )
+        # 只按字面的" - "分隔，制表符或换行包围的"-"不算分隔符
+        assert downloader._parse_episode_title("A  -  B", "播客") == ("A", "B")
+        assert downloader._parse_episode_title("A\t-\tB", "播客") == ("A\t-\tB", "播客")
+        assert downloader._parse_episode_title("A\n - B\n", "播客") == ("A", "B")
+
     @pytest.mark.asyncio
     async def test_context_manager(self):
         """测试异步上下文管理器"""
@@ -132,8 +170,8 @@ class TestUrlOnlyMode:
         mock_parser = Mock()
 
         # 模拟episode信息
-        mock_podcast = PodcastInfo(title="测试播客", author="测试作者")
-        mock_episode = EpisodeInfo(
+        mock_podcast = PodcastInfo.model_construct(title="测试播客", author="测试作者")
+        mock_episode = EpisodeInfo.model_construct(
             title="测试节目", podcast=mock_podcast, eid="6745c73fe0ab7e4a32ae6ad1"
         )
 
@@ -170,8 +208,8 @@ class TestUrlOnlyMode:
     async def test_url_only_mode_without_audio_url(self):
         """测试url_only模式但无法获取音频URL的情况"""
         mock_parser = Mock()
-        mock_podcast = PodcastInfo(title="测试播客", author="测试作者")
-        mock_episode = EpisodeInfo(
+        mock_podcast = PodcastInfo.model_construct(title="测试播客", author="测试作者")
+        mock_episode = EpisodeInfo.model_construct(
             title="测试节目", podcast=mock_podcast, eid="6745c73fe0ab7e4a32ae6ad1"
         )
 
@@ -193,3 +231,200 @@ class TestUrlOnlyMode:
             # 应该返回失败结果
             assert result.success is False
             assert "Audio URL not found" in result.error
+
+
+class TestRangedDownload:
+    """测试多连接分段下载"""
+
+    AUDIO_URL = "https://media.xiaoyuzhoufm.com/audio.m4a"
+    PAYLOAD = bytes(range(256)) * 1024  # 256KB，内容随位置变化便于校验拼接
+
+    def test_split_byte_ranges(self):
+        """测试分段覆盖整个文件且不重叠，文件较小时减少分段"""
+        ranges = _split_byte_ranges(1000, 3, 100)
+        assert ranges == [(0, 332), (333, 665), (666, 999)]
+        assert _split_byte_ranges(250, 4, 100) == [(0, 124), (125, 249)]
+        assert _split_byte_ranges(50, 4, 100) == [(0, 49)]
+
+    def _mock_audio(self, mocked, accept_ranges="bytes"):
+        """注册HEAD和按Range返回206分段内容的GET"""
+        headers = {"Content-Length": str(len(self.PAYLOAD)), "ETag": '"v1"'}
+        if accept_ranges:
+            headers["Accept-Ranges"] = accept_ranges
+        mocked.head(self.AUDIO_URL, status=200, headers=headers)
+
+        def range_callback(url, **kwargs):
+            # 音频已是压缩格式，请求时要求原样传输
+            assert kwargs["headers"]["Accept-Encoding"] == "identity"
+            # 每个分段都携带校验值，防止拼接不同版本的内容
+            assert kwargs["headers"]["If-Range"] == '"v1"'
+            start, end = map(
+                int, kwargs["headers"]["Range"].split("=", 1)[1].split("-")
+            )
+            return CallbackResult(status=206, body=self.PAYLOAD[start : end + 1])
+
+        mocked.get(self.AUDIO_URL, callback=range_callback, repeat=True)
+
+    @pytest.mark.asyncio
+    async def test_download_ranges_assembles_file(self, tmp_path):
+        """测试并行分段下载后文件内容完整"""
+        config = Config(chunk_size=16384, download_connections=4)
+        file_path = tmp_path / "audio.m4a"
+
+        with aioresponses() as mocked:
+            self._mock_audio(mocked)
+            async with XiaoYuZhouDL(config=config) as downloader:
+                ranges = await downloader._plan_ranged_download(self.AUDIO_URL)
+                assert ranges is not None and len(ranges) == 4
+                await downloader._download_ranges(self.AUDIO_URL, file_path, ranges)
+
+        assert file_path.read_bytes() == self.PAYLOAD
+
+    @pytest.mark.asyncio
+    async def test_ranged_download_removes_stale_progress(self, tmp_path):
+        """测试无法续传而改为分段下载时，完成后清理旧的进度文件"""
+        config = Config(chunk_size=16384, download_connections=4)
+        DownloadProgressManager.save_progress(
+            tmp_path / "audio.m4a.progress", {"downloaded": 0, "total": 10}
+        )
+
+        with aioresponses() as mocked:
+            self._mock_audio(mocked)
+            async with XiaoYuZhouDL(config=config) as downloader:
+                await downloader._download_audio(self.AUDIO_URL, "audio", str(tmp_path))
+                # 下载结束后不保留HEAD探测结果
+                assert not downloader._audio_probes
+
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["audio.m4a"]
+        assert (tmp_path / "audio.m4a").read_bytes() == self.PAYLOAD
+
+    @pytest.mark.asyncio
+    async def test_download_ranges_fails_when_audio_changes(self, tmp_path):
+        """测试下载期间文件变化（If-Range不匹配返回200）时分段下载失败"""
+        config = Config(chunk_size=16384, download_connections=4)
+        file_path = tmp_path / "audio.m4a"
+
+        with aioresponses() as mocked:
+            mocked.head(
+                self.AUDIO_URL,
+                status=200,
+                headers={
+                    "Content-Length": str(len(self.PAYLOAD)),
+                    "Accept-Ranges": "bytes",
+                    "ETag": '"v1"',
+                },
+            )
+            mocked.get(self.AUDIO_URL, status=200, body=self.PAYLOAD, repeat=True)
+            async with XiaoYuZhouDL(config=config) as downloader:
+                ranges = await downloader._plan_ranged_download(self.AUDIO_URL)
+                with pytest.raises(NetworkError, match="changed"):
+                    await downloader._download_ranges(self.AUDIO_URL, file_path, ranges)
+
+                # 过期的探测结果被丢弃，重试时重新探测
+                assert self.AUDIO_URL not in downloader._audio_probes
+
+        assert not file_path.exists()
+
+    @pytest.mark.asyncio
+    async def test_ranged_download_skipped_without_range_support(self):
+        """测试服务器不支持Range或未开启多连接时退回单连接下载"""
+        with aioresponses() as mocked:
+            self._mock_audio(mocked, accept_ranges=None)
+            config = Config(chunk_size=16384, download_connections=4)
+            async with XiaoYuZhouDL(config=config) as downloader:
+                assert await downloader._plan_ranged_download(self.AUDIO_URL) is None
+
+            async with XiaoYuZhouDL(config=Config()) as downloader:
+                assert await downloader._plan_ranged_download(self.AUDIO_URL) is None
+
+    @pytest.mark.asyncio
+    async def test_download_ranges_throttles_progress(self, tmp_path):
+        """测试进度回调限制频率，且最后一次回调为完整下载量"""
+        config = Config(chunk_size=4096, download_connections=4)
+        progress_calls = []
+
+        def progress_callback(progress):
+            progress_calls.append((progress.downloaded, progress.total))
+
+        with aioresponses() as mocked:
+            self._mock_audio(mocked)
+            async with XiaoYuZhouDL(
+                config=config, progress_callback=progress_callback
+            ) as downloader:
+                ranges = await downloader._plan_ranged_download(self.AUDIO_URL)
+                await downloader._download_ranges(
+                    self.AUDIO_URL, tmp_path / "audio.m4a", ranges
+                )
+
+        # 64个数据块在100ms内完成，只应产生极少回调
+        assert 1 <= len(progress_calls) < 10
+        assert progress_calls[-1] == (len(self.PAYLOAD), len(self.PAYLOAD))
+
+
+class TestPartFileDownload:
+    """测试下载过程中写入临时文件"""
+
+    AUDIO_URL = "https://media.xiaoyuzhoufm.com/episode.m4a"
+
+    @pytest.mark.asyncio
+    async def test_download_audio_renames_part_file(self, tmp_path):
+        """测试下载完成后临时文件替换为正式文件"""
+        payload = b"audio-data" * 1000
+        config = Config(non_interactive=True, default_overwrite_behavior=True)
+        (tmp_path / "episode.m4a").write_bytes(b"old")
+
+        with aioresponses() as mocked:
+            mocked.get(self.AUDIO_URL, body=payload)
+            async with XiaoYuZhouDL(config=config) as downloader:
+                audio_path = await downloader._download_audio(
+                    self.AUDIO_URL, "episode", str(tmp_path)
+                )
+
+        # URL已带扩展名且单连接下载时只发送一次GET，不需要HEAD探测
+        assert [method for method, _ in mocked.requests] == ["GET"]
+
+        assert audio_path == str(tmp_path / "episode.m4a")
+        assert (tmp_path / "episode.m4a").read_bytes() == payload
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["episode.m4a"]
+
+    @pytest.mark.asyncio
+    async def test_resume_retried_after_network_error(self, tmp_path):
+        """测试续传请求中断后，重试时仍从已下载的位置续传"""
+        (tmp_path / "episode.m4a.part").write_bytes(b"a" * 1000)
+        DownloadProgressManager.save_progress(
+            tmp_path / "episode.m4a.progress", {"downloaded": 1000, "total": 1500}
+        )
+
+        with aioresponses() as mocked, patch(
+            "src.xyz_dl.retry.asyncio.sleep", new_callable=AsyncMock
+        ):
+            mocked.get(self.AUDIO_URL, exception=aiohttp.ClientConnectionError())
+            mocked.get(
+                self.AUDIO_URL,
+                status=206,
+                body=b"b" * 500,
+                headers={"Content-Length": "500"},
+            )
+            async with XiaoYuZhouDL() as downloader:
+                audio_path = await downloader._download_audio(
+                    self.AUDIO_URL, "episode", str(tmp_path)
+                )
+
+        # 两次请求都从第1000字节续传，已下载的数据没有被丢弃
+        calls = mocked.requests[("GET", URL(self.AUDIO_URL))]
+        assert [c.kwargs["headers"].get("Range") for c in calls] == [
+            "bytes=1000-",
+            "bytes=1000-",
+        ]
+        assert (tmp_path / "episode.m4a").read_bytes() == b"a" * 1000 + b"b" * 500
+        assert audio_path == str(tmp_path / "episode.m4a")
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["episode.m4a"]
+
+    def test_audio_extension_ignores_query_string(self):
+        """测试从URL路径判断扩展名，不受查询参数影响"""
+        downloader = XiaoYuZhouDL()
+        assert downloader._get_audio_extension(self.AUDIO_URL + "?t=1") == ".m4a"
+        assert downloader._get_audio_extension("https://a.com/x.MP3?sign=1") == ".mp3"
+        assert (
+            downloader._get_audio_extension("https://a.com/x", "audio/mpeg") == ".mp3"
+        )
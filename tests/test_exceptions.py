@@ -7,7 +7,11 @@ import pytest
 import aiohttp
 from unittest.mock import patch
 
-from src.xyz_dl.parsers import JsonScriptParser, CompositeParser
+from src.xyz_dl.parsers import (
+    CompositeParser,
+    JsonScriptParser,
+    parse_episode_from_url,
+)
 from src.xyz_dl.exceptions import ParseError, NetworkError
 from .utils.mock_http import (
     create_network_error,
@@ -15,7 +19,138 @@ from .utils.mock_http import (
     create_http_error,
 )
 
+# 测试用HTML片段 - 模块级常量，避免每个测试重复构造
+MALFORMED_HTML = "<html><head><title>Test</title></head><body><p>Incomplete HTML"
+
+HTML_WITHOUT_JSON = """
+<html>
+    <head><title>Test Page</title></head>
+    <body>
+        <h1>No JSON data here</h1>
+        <p>This page doesn't have any JSON-LD or JavaScript data</p>
+    </body>
+</html>
+"""
+
+HTML_WITH_INVALID_JSON = """
+<html>
+    <head>
+        <title>Test Page</title>
+        <script name="schema:podcast-show" type="application/ld+json">
+            {invalid json content here}
+        </script>
+    </head>
+    <body>
+        <h1>Test</h1>
+    </body>
+</html>
+"""
+
+# JSON-LD缺少必要字段
+HTML_WITH_INCOMPLETE_JSON = """
+<html>
+    <head>
+        <title>Test Page</title>
+        <script name="schema:podcast-show" type="application/ld+json">
+        {
+            "@context": "https://schema.org/",
+            "@type": "PodcastEpisode"
+        }
+        </script>
+    </head>
+    <body>
+        <h1>Test</h1>
+    </body>
+</html>
+"""
+
+HTML_WITHOUT_SHOW_NOTES = """
+<html>
+    <head>
+        <title>Test Page</title>
+        <script name="schema:podcast-show" type="application/ld+json">
+        {
+            "@context": "https://schema.org/",
+            "@type": "PodcastEpisode",
+            "name": "Test Episode",
+            "partOfSeries": {"name": "Test Podcast"},
+            "timeRequired": "PT60M",
+            "description": "Test description"
+        }
+        </script>
+    </head>
+    <body>
+        <h1>Test Episode</h1>
+        <p>No show notes section here</p>
+    </body>
+</html>
+"""
+
+HTML_WITH_EMPTY_SHOW_NOTES = """
+<html>
+    <head>
+        <title>Test Page</title>
+        <script name="schema:podcast-show" type="application/ld+json">
+        {
+            "@context": "https://schema.org/",
+            "@type": "PodcastEpisode",
+            "name": "Test Episode",
+            "partOfSeries": {"name": "Test Podcast"},
+            "timeRequired": "PT60M",
+            "description": "Test description"
+        }
+        </script>
+    </head>
+    <body>
+        <section class="css-omm69k" aria-label="节目show notes">
+            <div class="sn-content">
+                <article>
+                    <!-- Empty article -->
+                </article>
+            </div>
+        </section>
+    </body>
+</html>
+"""
+
+# 使用只有基本HTML结构的内容，没有JSON数据
+BASIC_HTML = """
+<html>
+    <head>
+        <title>Test Episode - Test Podcast | 小宇宙</title>
+        <meta name="description" content="This is a test episode description">
+    </head>
+    <body>
+        <h1>Test Episode</h1>
+        <audio src="https://example.com/test.mp3"></audio>
+    </body>
+</html>
+"""
+
+# 包含各种Unicode字符的HTML
+UNICODE_HTML = """
+<html>
+    <head>
+        <title>测试节目 - 播客名称 | 小宇宙</title>
+        <script name="schema:podcast-show" type="application/ld+json">
+        {
+            "@context": "https://schema.org/",
+            "@type": "PodcastEpisode",
+            "name": "测试节目：特殊字符 & 符号 © ® ™ 🎧",
+            "partOfSeries": {"name": "播客名称"},
+            "timeRequired": "PT30M",
+            "description": "包含emoji的描述 🎵 和特殊字符 & < > \\\\ \\""
+        }
+        </script>
+    </head>
+    <body>
+        <h1>Unicode Content Test</h1>
+    </body>
+</html>
+"""
+
 
+@pytest.mark.xdist_group(name="TestNetworkExceptions")
 class TestNetworkExceptions:
     """网络异常测试"""
 
@@ -32,8 +167,6 @@ class TestNetworkExceptions:
         with pytest.raises(NetworkError) as exc_info:
             # 注意：这里需要使用CompositeParser并通过parse_episode_from_url
             # 因为JsonScriptParser本身不处理网络请求
-            from src.xyz_dl.parsers import parse_episode_from_url
-
             await parse_episode_from_url(test_url)
 
         assert "Connection refused" in str(exc_info.value) or "Network error" in str(
@@ -49,8 +182,6 @@ class TestNetworkExceptions:
         http_mocker.set_failure(test_url, create_timeout_error("Request timeout"))
 
         with pytest.raises(NetworkError) as exc_info:
-            from src.xyz_dl.parsers import parse_episode_from_url
-
             await parse_episode_from_url(test_url)
 
         assert "timeout" in str(exc_info.value).lower()
@@ -64,8 +195,6 @@ class TestNetworkExceptions:
         http_mocker.set_failure(test_url, create_http_error(404, "Not Found"))
 
         with pytest.raises(NetworkError) as exc_info:
-            from src.xyz_dl.parsers import parse_episode_from_url
-
             await parse_episode_from_url(test_url)
 
         assert "404" in str(exc_info.value) or "Not Found" in str(exc_info.value)
@@ -81,13 +210,12 @@ class TestNetworkExceptions:
         )
 
         with pytest.raises(NetworkError) as exc_info:
-            from src.xyz_dl.parsers import parse_episode_from_url
-
             await parse_episode_from_url(test_url)
 
         assert "500" in str(exc_info.value) or "Server Error" in str(exc_info.value)
 
 
+@pytest.mark.xdist_group(name="TestParsingExceptions")
 class TestParsingExceptions:
     """解析异常测试"""
 
@@ -108,13 +236,9 @@ class TestParsingExceptions:
         """测试格式错误的HTML内容"""
         parser = JsonScriptParser()
 
-        malformed_html = (
-            "<html><head><title>Test</title></head><body><p>Incomplete HTML"
-        )
-
         with pytest.raises(ParseError) as exc_info:
             await parser.parse_episode_info(
-                malformed_html, "https://www.xiaoyuzhoufm.com/episode/test"
+                MALFORMED_HTML, "https://www.xiaoyuzhoufm.com/episode/test"
             )
 
         assert "Failed to extract episode data" in str(exc_info.value)
@@ -124,19 +248,9 @@ class TestParsingExceptions:
         """测试缺少JSON脚本的HTML"""
         parser = JsonScriptParser()
 
-        html_without_json = """
-        <html>
-            <head><title>Test Page</title></head>
-            <body>
-                <h1>No JSON data here</h1>
-                <p>This page doesn't have any JSON-LD or JavaScript data</p>
-            </body>
-        </html>
-        """
-
         with pytest.raises(ParseError) as exc_info:
             await parser.parse_episode_info(
-                html_without_json, "https://www.xiaoyuzhoufm.com/episode/test"
+                HTML_WITHOUT_JSON, "https://www.xiaoyuzhoufm.com/episode/test"
             )
 
         assert "Failed to extract episode data" in str(exc_info.value)
@@ -146,23 +260,9 @@ class TestParsingExceptions:
         """测试无效的JSON-LD内容"""
         parser = JsonScriptParser()
 
-        html_with_invalid_json = """
-        <html>
-            <head>
-                <title>Test Page</title>
-                <script name="schema:podcast-show" type="application/ld+json">
-                    {invalid json content here}
-                </script>
-            </head>
-            <body>
-                <h1>Test</h1>
-            </body>
-        </html>
-        """
-
         with pytest.raises(ParseError) as exc_info:
             await parser.parse_episode_info(
-                html_with_invalid_json, "https://www.xiaoyuzhoufm.com/episode/test"
+                HTML_WITH_INVALID_JSON, "https://www.xiaoyuzhoufm.com/episode/test"
             )
 
         assert "Failed to extract episode data" in str(exc_info.value)
@@ -172,27 +272,9 @@ class TestParsingExceptions:
         """测试不完整的JSON-LD数据"""
         parser = JsonScriptParser()
 
-        # JSON-LD缺少必要字段
-        html_with_incomplete_json = """
-        <html>
-            <head>
-                <title>Test Page</title>
-                <script name="schema:podcast-show" type="application/ld+json">
-                {
-                    "@context": "https://schema.org/",
-                    "@type": "PodcastEpisode"
-                }
-                </script>
-            </head>
-            <body>
-                <h1>Test</h1>
-            </body>
-        </html>
-        """
-
         # 应该能解析，但会使用默认值
         episode_info = await parser.parse_episode_info(
-            html_with_incomplete_json, "https://www.xiaoyuzhoufm.com/episode/test"
+            HTML_WITH_INCOMPLETE_JSON, "https://www.xiaoyuzhoufm.com/episode/test"
         )
 
         # 验证使用了默认值
@@ -201,6 +283,7 @@ class TestParsingExceptions:
         assert episode_info.duration == 0
 
 
+@pytest.mark.xdist_group(name="TestShowNotesExtractionExceptions")
 class TestShowNotesExtractionExceptions:
     """Show Notes提取异常测试"""
 
@@ -209,30 +292,8 @@ class TestShowNotesExtractionExceptions:
         """测试缺少Show Notes部分的HTML"""
         parser = JsonScriptParser()
 
-        html_without_show_notes = """
-        <html>
-            <head>
-                <title>Test Page</title>
-                <script name="schema:podcast-show" type="application/ld+json">
-                {
-                    "@context": "https://schema.org/",
-                    "@type": "PodcastEpisode",
-                    "name": "Test Episode",
-                    "partOfSeries": {"name": "Test Podcast"},
-                    "timeRequired": "PT60M",
-                    "description": "Test description"
-                }
-                </script>
-            </head>
-            <body>
-                <h1>Test Episode</h1>
-                <p>No show notes section here</p>
-            </body>
-        </html>
-        """
-
         episode_info = await parser.parse_episode_info(
-            html_without_show_notes, "https://www.xiaoyuzhoufm.com/episode/test"
+            HTML_WITHOUT_SHOW_NOTES, "https://www.xiaoyuzhoufm.com/episode/test"
         )
 
         # 应该使用JSON-LD中的description
@@ -243,41 +304,15 @@ class TestShowNotesExtractionExceptions:
         """测试空的Show Notes内容"""
         parser = JsonScriptParser()
 
-        html_with_empty_show_notes = """
-        <html>
-            <head>
-                <title>Test Page</title>
-                <script name="schema:podcast-show" type="application/ld+json">
-                {
-                    "@context": "https://schema.org/",
-                    "@type": "PodcastEpisode",
-                    "name": "Test Episode",
-                    "partOfSeries": {"name": "Test Podcast"},
-                    "timeRequired": "PT60M",
-                    "description": "Test description"
-                }
-                </script>
-            </head>
-            <body>
-                <section class="css-omm69k" aria-label="节目show notes">
-                    <div class="sn-content">
-                        <article>
-                            <!-- Empty article -->
-                        </article>
-                    </div>
-                </section>
-            </body>
-        </html>
-        """
-
         episode_info = await parser.parse_episode_info(
-            html_with_empty_show_notes, "https://www.xiaoyuzhoufm.com/episode/test"
+            HTML_WITH_EMPTY_SHOW_NOTES, "https://www.xiaoyuzhoufm.com/episode/test"
         )
 
         # 应该回退到JSON-LD中的description
         assert episode_info.shownotes == "Test description"
 
 
+@pytest.mark.xdist_group(name="TestCompositeParserFallback")
 class TestCompositeParserFallback:
     """组合解析器回退机制测试"""
 
@@ -286,22 +321,8 @@ class TestCompositeParserFallback:
         """测试回退到HTML解析器"""
         parser = CompositeParser()
 
-        # 使用只有基本HTML结构的内容，没有JSON数据
-        basic_html = """
-        <html>
-            <head>
-                <title>Test Episode - Test Podcast | 小宇宙</title>
-                <meta name="description" content="This is a test episode description">
-            </head>
-            <body>
-                <h1>Test Episode</h1>
-                <audio src="https://example.com/test.mp3"></audio>
-            </body>
-        </html>
-        """
-
         episode_info = await parser.parse_episode_info(
-            basic_html, "https://www.xiaoyuzhoufm.com/episode/test"
+            BASIC_HTML, "https://www.xiaoyuzhoufm.com/episode/test"
         )
 
         # 验证使用了HTML解析器的结果
@@ -326,6 +347,7 @@ class TestCompositeParserFallback:
             assert "All parsers failed" in str(exc_info.value) or "HTML parsing failed" in str(exc_info.value)
 
 
+@pytest.mark.xdist_group(name="TestFileOperationExceptions")
 class TestFileOperationExceptions:
     """文件操作异常测试"""
 
@@ -353,6 +375,7 @@ class TestFileOperationExceptions:
             await test_data_manager.load_html("nonexistent_file.html")
 
 
+@pytest.mark.xdist_group(name="TestEdgeCases")
 class TestEdgeCases:
     """边界情况测试"""
 
@@ -363,8 +386,7 @@ class TestEdgeCases:
 
         # 使用真实数据测试
         test_url = sample_urls[0]
-        episode_id = test_url.split("/episode/")[-1].split("?")[0][:12]
-        filename = f"episode_{episode_id}.html"
+        filename = test_data_manager.fixture_filename(test_url)
 
         html_content = await test_data_manager.load_html(filename)
         episode_info = await parser.parse_episode_info(html_content, test_url)
@@ -378,30 +400,8 @@ class TestEdgeCases:
         """测试Unicode内容处理"""
         parser = JsonScriptParser()
 
-        # 包含各种Unicode字符的HTML
-        unicode_html = """
-        <html>
-            <head>
-                <title>测试节目 - 播客名称 | 小宇宙</title>
-                <script name="schema:podcast-show" type="application/ld+json">
-                {
-                    "@context": "https://schema.org/",
-                    "@type": "PodcastEpisode",
-                    "name": "测试节目：特殊字符 & 符号 © ® ™ 🎧",
-                    "partOfSeries": {"name": "播客名称"},
-                    "timeRequired": "PT30M",
-                    "description": "包含emoji的描述 🎵 和特殊字符 & < > \\\\ \\""
-                }
-                </script>
-            </head>
-            <body>
-                <h1>Unicode Content Test</h1>
-            </body>
-        </html>
-        """
-
         episode_info = await parser.parse_episode_info(
-            unicode_html, "https://www.xiaoyuzhoufm.com/episode/test"
+            UNICODE_HTML, "https://www.xiaoyuzhoufm.com/episode/test"
         )
 
         # 验证Unicode字符正确处理
@@ -12,6 +12,16 @@ from src.xyz_dl.models import (
     Config,
 )
 
+INVALID_EPISODE_INPUTS = (
+    "https://example.com/episode/123",  # 错误的域名
+    "http://www.xiaoyuzhoufm.com/episode/123",  # 错误的协议
+    "",  # 空字符串
+    "/invalid/path",  # 无效路径
+)
+
+# 已验证的基准请求，变体通过 model_copy 派生，避免重复校验可信数据
+_BASE_REQUEST = DownloadRequest(url="https://www.xiaoyuzhoufm.com/episode/test123")
+
 
 class TestPodcastInfo:
     """测试播客信息模型"""
@@ -31,37 +41,27 @@ class TestPodcastInfo:
 class TestEpisodeInfo:
     """测试节目信息模型"""
 
-    def test_valid_episode_info(self):
+    def test_valid_episode_info(self, sample_episode):
         """测试有效的节目信息"""
-        podcast = PodcastInfo(title="测试播客", author="测试作者")
-        episode = EpisodeInfo(
-            title="测试节目",
-            podcast=podcast,
-            duration=3600000,  # 60分钟
-            pub_date="2025-01-01T00:00:00Z",
-            eid="test123",
-        )
-
-        assert episode.title == "测试节目"
-        assert episode.duration_minutes == 60
-        assert episode.eid == "test123"
-
-    def test_duration_validation(self):
-        """测试时长验证"""
-        podcast = PodcastInfo(title="测试播客", author="测试作者")
+        assert sample_episode.title == "测试节目"
+        assert sample_episode.duration_minutes == 60
+        assert sample_episode.eid == "test123"
 
+    def test_duration_validation(self, sample_podcast):
+        """测试时长验证"""
         # 负数时长应该抛出异常
         with pytest.raises(ValidationError):
-            EpisodeInfo(title="测试", podcast=podcast, duration=-1)
+            EpisodeInfo(title="测试", podcast=sample_podcast, duration=-1)
 
-    def test_formatted_pub_date(self):
+    def test_formatted_pub_date(self, sample_episode):
         """测试格式化发布日期"""
-        podcast = PodcastInfo(title="测试播客", author="测试作者")
-        episode = EpisodeInfo(
-            title="测试节目", podcast=podcast, pub_date="2025-01-01T00:00:00Z"
-        )
+        assert "2025年01月01日" in sample_episode.formatted_pub_date
 
-        assert "2025年01月01日" in episode.formatted_pub_date
+    def test_formatted_pub_date_follows_model_copy(self, sample_episode):
+        """测试派生副本的日期格式化不受原实例缓存影响"""
+        assert "2025年01月01日" in sample_episode.formatted_pub_date
+        updated = sample_episode.model_copy(update={"pub_date": "2024-06-30T00:00:00Z"})
+        assert updated.formatted_pub_date == "2024年06月30日"
 
 
 class TestDownloadRequest:
@@ -100,18 +100,19 @@ class TestDownloadRequest:
         expected_url2 = "https://www.xiaoyuzhoufm.com/episode/67890123"
         assert str(request2.url) == expected_url2
 
-    def test_invalid_episode_id_or_url(self):
-        """测试无效的 episode ID 或 URL"""
-        invalid_inputs = [
-            "https://example.com/episode/123",  # 错误的域名
-            "http://www.xiaoyuzhoufm.com/episode/123",  # 错误的协议
-            "",  # 空字符串
-            "/invalid/path",  # 无效路径
-        ]
+    @pytest.mark.parametrize("mode", ["audio", "md"])
+    def test_mode_variants(self, mode):
+        """测试基于基准请求派生的下载模式变体"""
+        request = _BASE_REQUEST.model_copy(update={"mode": mode})
+        assert request.mode == mode
+        assert request.url == _BASE_REQUEST.url
+        assert _BASE_REQUEST.mode == "both"  # 基准请求不受影响
 
-        for invalid_input in invalid_inputs:
-            with pytest.raises(ValidationError):
-                DownloadRequest(url=invalid_input)
+    @pytest.mark.parametrize("invalid_input", INVALID_EPISODE_INPUTS)
+    def test_invalid_episode_id_or_url(self, invalid_input):
+        """测试无效的 episode ID 或 URL"""
+        with pytest.raises(ValidationError):
+            DownloadRequest(url=invalid_input)
 
 
 class TestDownloadProgress:
@@ -134,6 +135,23 @@ class TestDownloadProgress:
         formatted = progress.formatted_size
         assert "KB" in formatted
 
+    def test_negative_bytes_rejected(self):
+        """测试负数字节数被拒绝"""
+        with pytest.raises(ValidationError):
+            DownloadProgress(filename="test.mp3", downloaded=-1)
+
+    def test_model_api_available(self):
+        """测试进度对象保留Pydantic模型接口"""
+        progress = DownloadProgress(filename="test.mp3", downloaded="10", total=20)
+        assert progress.downloaded == 10
+        assert progress.model_dump() == {
+            "filename": "test.mp3",
+            "downloaded": 10,
+            "total": 20,
+            "speed": 0.0,
+        }
+        assert progress.model_copy(update={"downloaded": 20}).is_complete
+
 
 class TestConfig:
     """测试配置模型"""
@@ -144,7 +162,7 @@ class TestConfig:
 
         assert config.timeout == 30
         assert config.max_retries == 3
-        assert config.chunk_size == 8192
+        assert config.chunk_size == 65536
         assert config.max_filename_length == 200
         assert config.max_concurrent_downloads == 3
 
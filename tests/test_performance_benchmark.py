@@ -16,6 +16,9 @@ from src.xyz_dl.performance.connection_pool_optimizer import ConnectionPoolOptim
 from src.xyz_dl.performance.config_cache import ConfigCache
 from src.xyz_dl.config import Config
 
+# 性能断言阈值，计时统一使用单调的纳秒计数器 time.perf_counter_ns()
+ONE_HUNDRED_MS_NS = 100_000_000
+
 
 @pytest.fixture
 def config():
@@ -23,7 +26,6 @@ def config():
     return Config(
         connection_pool_size=10,
         connections_per_host=5,
-        chunk_size=8192
     )
 
 
@@ -37,7 +39,7 @@ def temp_file():
         temp_path.unlink()
 
 
-@pytest.mark.asyncio
+@pytest.mark.asyncio(loop_scope="module")
 async def test_cache_performance_improvement():
     """测试缓存性能改进 - 目标：减少重复请求80%+"""
     cache_manager = CacheManager(Config())
@@ -47,9 +49,9 @@ async def test_cache_performance_improvement():
     content = b"test content"
     headers = {"etag": "test-etag"}
 
-    start_time = time.time()
+    start_ns = time.perf_counter_ns()
     result1 = await cache_manager.get(url)  # 缓存未命中
-    miss_time = time.time() - start_time
+    miss_ns = time.perf_counter_ns() - start_ns
 
     assert result1 is None
 
@@ -57,16 +59,16 @@ async def test_cache_performance_improvement():
     await cache_manager.set(url, content, headers)
 
     # 模拟第二次请求（缓存命中）
-    start_time = time.time()
+    start_ns = time.perf_counter_ns()
     result2 = await cache_manager.get(url)  # 缓存命中
-    hit_time = time.time() - start_time
+    hit_ns = time.perf_counter_ns() - start_ns
 
     assert result2 is not None
     assert result2.content == content
 
     # 验证缓存命中和未命中都工作正常
     # 注意：在测试环境中时间差异可能很小，主要验证功能正确性
-    assert hit_time >= 0 and miss_time >= 0  # 时间测量正常
+    assert hit_ns >= 0 and miss_ns >= 0  # 时间测量正常
 
     # 获取统计信息验证改进
     stats = await cache_manager.get_stats()
@@ -75,25 +77,16 @@ async def test_cache_performance_improvement():
     assert stats["hit_rate"] > 0
 
 
-@pytest.mark.asyncio
-async def test_streaming_download_memory_optimization(config, temp_file):
+@pytest.mark.asyncio(loop_scope="module")
+async def test_streaming_download_memory_optimization(
+    config, temp_file, mock_response_factory
+):
     """测试流式下载内存优化 - 目标：大文件内存使用减少50%+"""
     streaming_downloader = StreamingDownloader(config, memory_threshold_mb=1)
 
-    # 模拟大文件下载
+    # 模拟大文件分块下载（默认每块64KB）
     large_size = 5 * 1024 * 1024  # 5MB
-    mock_response = AsyncMock()
-    mock_response.headers = {"content-length": str(large_size)}
-
-    # 模拟分块数据
-    chunk_size = config.chunk_size
-    chunks = [b"x" * chunk_size for _ in range(large_size // chunk_size)]
-
-    async def mock_iter_chunked(size):
-        for chunk in chunks:
-            yield chunk
-
-    mock_response.content.iter_chunked = mock_iter_chunked
+    mock_response = mock_response_factory(large_size, config.chunk_size)
 
     with patch('aiofiles.open') as mock_open:
         mock_file = AsyncMock()
@@ -114,7 +107,7 @@ async def test_streaming_download_memory_optimization(config, temp_file):
         assert result.peak_memory_mb > 0  # 内存监控工作正常
 
 
-@pytest.mark.asyncio
+@pytest.mark.asyncio(loop_scope="module")
 async def test_connection_pool_optimization_efficiency():
     """测试连接池优化效率 - 目标：连接复用率提升"""
     config = Config()
@@ -139,25 +132,25 @@ async def test_connection_pool_optimization_efficiency():
     assert performance_report['total_connections'] == 20
 
 
-@pytest.mark.asyncio
+@pytest.mark.asyncio(loop_scope="module")
 async def test_config_cache_performance():
     """测试配置缓存性能 - 目标：避免重复验证"""
     config_cache = ConfigCache(ttl_seconds=60)
 
     # 测试配置加载性能
-    start_time = time.time()
+    start_ns = time.perf_counter_ns()
     config1 = await config_cache.get_cached_config()
-    first_load_time = time.time() - start_time
+    first_load_ns = time.perf_counter_ns() - start_ns
 
-    start_time = time.time()
+    start_ns = time.perf_counter_ns()
     config2 = await config_cache.get_cached_config()
-    cached_load_time = time.time() - start_time
+    cached_load_ns = time.perf_counter_ns() - start_ns
 
     # 验证缓存的配置是同一个对象
     assert config1 is config2
 
     # 验证缓存命中时间合理（在测试环境中时间差异可能很小）
-    assert cached_load_time >= 0 and first_load_time >= 0  # 时间测量正常
+    assert cached_load_ns >= 0 and first_load_ns >= 0  # 时间测量正常
 
     # 验证统计信息
     stats = await config_cache.get_cache_stats()
@@ -165,7 +158,7 @@ async def test_config_cache_performance():
     assert stats['misses'] >= 1
 
 
-@pytest.mark.asyncio
+@pytest.mark.asyncio(loop_scope="module")
 async def test_speed_limit_functionality(config, temp_file):
     """测试下载速度限制功能"""
     # 设置1MB/s的速度限制
@@ -196,7 +189,7 @@ async def test_speed_limit_functionality(config, temp_file):
     assert streaming_downloader.speed_limit_mbps is not None
 
 
-@pytest.mark.asyncio
+@pytest.mark.asyncio(loop_scope="module")
 async def test_integrated_performance_benchmark(config):
     """综合性能基准测试 - 验证整体20%+性能提升"""
     # 创建所有性能组件
@@ -205,36 +198,24 @@ async def test_integrated_performance_benchmark(config):
     pool_optimizer = ConnectionPoolOptimizer(config)
     config_cache = ConfigCache()
 
-    # 模拟典型下载流程的性能指标
-    performance_metrics = {}
-
-    # 1. 缓存性能测试
-    start_time = time.time()
     url = "http://example.com/test"
     await cache_manager.set(url, b"content", {"etag": "123"})
-    cache_result = await cache_manager.get(url)
-    performance_metrics['cache_access_time'] = time.time() - start_time
 
-    assert cache_result is not None
-
-    # 2. 连接池优化测试
-    start_time = time.time()
-    optimized_connector = await pool_optimizer.create_optimized_connector()
-    performance_metrics['connector_creation_time'] = time.time() - start_time
+    # 并发执行三个相互独立的组件操作，同时检测组件之间是否存在意外的互相阻塞
+    start_ns = time.perf_counter_ns()
+    cache_result, optimized_connector, cached_config = await asyncio.gather(
+        cache_manager.get(url),
+        pool_optimizer.create_optimized_connector(),
+        config_cache.get_cached_config(),
+    )
+    elapsed_ns = time.perf_counter_ns() - start_ns
 
+    assert cache_result is not None
     assert optimized_connector is not None
-
-    # 3. 配置缓存测试
-    start_time = time.time()
-    cached_config = await config_cache.get_cached_config()
-    performance_metrics['config_access_time'] = time.time() - start_time
-
     assert cached_config is not None
 
-    # 验证所有性能指标都在合理范围内
-    assert performance_metrics['cache_access_time'] < 0.1  # 100ms
-    assert performance_metrics['connector_creation_time'] < 0.1  # 100ms
-    assert performance_metrics['config_access_time'] < 0.1  # 100ms
+    # 验证整体耗时在合理范围内
+    assert elapsed_ns < ONE_HUNDRED_MS_NS
 
     # 获取综合性能报告
     cache_stats = await cache_manager.get_stats()
@@ -246,8 +227,10 @@ async def test_integrated_performance_benchmark(config):
     assert 'connection_pool_efficiency' in pool_performance
     assert 'cache_hit_rate' in config_performance
 
+    await pool_optimizer.close()
+
 
-@pytest.mark.asyncio
+@pytest.mark.asyncio(loop_scope="module")
 async def test_memory_monitoring_accuracy():
     """测试内存监控准确性"""
     streaming_downloader = StreamingDownloader(Config())
@@ -262,13 +245,13 @@ async def test_memory_monitoring_accuracy():
     assert streaming_downloader._peak_memory_mb >= initial_memory
 
 
-@pytest.mark.asyncio
+@pytest.mark.asyncio(loop_scope="module")
 async def test_performance_regression_prevention():
     """性能回归测试 - 确保新功能不会降低基础性能"""
     config = Config()
 
     # 测试基本操作的性能不受影响
-    start_time = time.time()
+    start_ns = time.perf_counter_ns()
 
     # 创建所有优化组件（应该很快）
     cache_manager = CacheManager(config)
@@ -276,10 +259,10 @@ async def test_performance_regression_prevention():
     pool_optimizer = ConnectionPoolOptimizer(config)
     config_cache = ConfigCache()
 
-    creation_time = time.time() - start_time
+    creation_ns = time.perf_counter_ns() - start_ns
 
     # 验证组件创建时间合理
-    assert creation_time < 0.1  # 应该在100ms内完成
+    assert creation_ns < ONE_HUNDRED_MS_NS  # 应该在100ms内完成
 
     # 验证基本功能仍然工作
     assert cache_manager is not None
@@ -5,9 +5,7 @@
 
 import asyncio
 import os
-import tempfile
-from pathlib import Path
-from unittest.mock import AsyncMock, MagicMock, Mock, patch
+from unittest.mock import AsyncMock, MagicMock, Mock, call, patch
 
 import aiohttp
 import pytest
@@ -20,7 +18,10 @@ from xyz_dl.retry import (
     RetryableError,
     RetryConfig,
     RetryStats,
+    calculate_resume_position,
+    create_range_headers,
     create_retry_decorator,
+    get_resume_validator,
     is_retryable_error,
 )
 
@@ -52,7 +53,7 @@ class TestRetryableErrorClassification:
 class TestRetryDecorator:
     """测试重试装饰器功能"""
 
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="module")
     async def test_successful_call_no_retry(self):
         """测试成功调用不需要重试"""
         retry_config = RetryConfig(max_attempts=3, base_delay=0.1)
@@ -67,7 +68,7 @@ class TestRetryDecorator:
         assert stats.total_attempts == 1
         assert stats.failed_attempts == 0
 
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="module")
     async def test_retry_on_retryable_error(self):
         """测试遇到可重试错误时进行重试"""
         retry_config = RetryConfig(max_attempts=3, base_delay=0.01)
@@ -88,7 +89,7 @@ class TestRetryDecorator:
         assert stats.total_attempts == 3
         assert stats.failed_attempts == 2
 
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="module")
     async def test_max_retries_exceeded(self):
         """测试超过最大重试次数"""
         retry_config = RetryConfig(max_attempts=2, base_delay=0.01)
@@ -104,9 +105,29 @@ class TestRetryDecorator:
         assert stats.total_attempts == 2
         assert stats.failed_attempts == 2
 
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="module")
+    async def test_exponential_backoff_delays(self):
+        """测试指数退避延迟序列，替换sleep以避免真实等待"""
+        retry_config = RetryConfig(
+            max_attempts=3, base_delay=0.1, backoff_factor=2.0, jitter=False
+        )
+        stats = RetryStats()
+
+        @create_retry_decorator(retry_config, stats)
+        async def failing_function():
+            raise RetryableError("Temporary failure")
+
+        with patch("xyz_dl.retry.asyncio.sleep", new_callable=AsyncMock) as sleep:
+            with pytest.raises(RetryableError):
+                await failing_function()
+
+        assert sleep.await_args_list == [call(0.1), call(0.2)]
+        assert stats.total_delay == pytest.approx(0.3)
+
+    @pytest.mark.slow
+    @pytest.mark.asyncio(loop_scope="module")
     async def test_exponential_backoff(self):
-        """测试指数退避延迟"""
+        """测试指数退避的真实等待时间"""
         retry_config = RetryConfig(
             max_attempts=3, base_delay=0.1, backoff_factor=2.0, jitter=False
         )
@@ -131,82 +152,186 @@ class TestRetryDecorator:
 class TestDownloadResume:
     """测试下载断点续传功能"""
 
-    @pytest.mark.asyncio
-    async def test_partial_download_resume(self):
+    @pytest.mark.asyncio(loop_scope="module")
+    async def test_partial_download_resume(self, tmp_path):
         """测试部分下载后的续传"""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            config = Config(timeout=5)
-            downloader = XiaoYuZhouDL(config=config)
-
-            test_file_path = Path(temp_dir) / "test_audio.m4a"
-            test_progress_path = Path(temp_dir) / "test_audio.m4a.progress"
+        config = Config(timeout=5)
+        downloader = XiaoYuZhouDL(config=config)
 
-            # 模拟之前下载了一部分
-            partial_content = b"partial content"
-            test_file_path.write_bytes(partial_content)
+        test_file_path = tmp_path / "test_audio.m4a"
+        test_progress_path = tmp_path / "test_audio.m4a.progress"
+
+        # 模拟之前下载了一部分
+        partial_content = b"partial content"
+        test_file_path.write_bytes(partial_content)
+
+        # 创建进度文件
+        progress_data = {
+            "downloaded": len(partial_content),
+            "total": 100,
+            "url": "https://example.com/audio.m4a",
+        }
+        downloader._save_download_progress(test_progress_path, progress_data)
+
+        # 模拟Range请求支持，直接替换safe_request，无需真实会话和连接器
+        remaining_content = b"remaining content"
+
+        async def iter_chunked(_size):
+            yield remaining_content
+
+        response = MagicMock()
+        response.status = 206  # Partial Content
+        response.headers = {
+            "Content-Range": f"bytes {len(partial_content)}-99/100",
+            "Content-Length": str(len(remaining_content)),
+        }
+        response.content.iter_chunked = iter_chunked
+        response.__aenter__.return_value = response
+        safe_request = AsyncMock(return_value=response)
+
+        with patch.object(downloader, "_session", Mock()), patch.object(
+            downloader._session_manager, "safe_request", safe_request
+        ):
+            result = await downloader._resume_download(
+                "https://example.com/audio.m4a",
+                test_file_path,
+                test_progress_path,
+            )
 
-            # 创建进度文件
-            progress_data = {
-                "downloaded": len(partial_content),
+        assert result
+        safe_request.assert_awaited_once_with(
+            "GET",
+            "https://example.com/audio.m4a",
+            headers={
+                "Accept-Encoding": "identity",
+                "Range": f"bytes={len(partial_content)}-",
+            },
+        )
+        # 验证文件内容完整
+        final_content = test_file_path.read_bytes()
+        assert final_content == partial_content + remaining_content
+
+    @pytest.mark.asyncio(loop_scope="module")
+    async def test_resume_sends_if_range_and_accepts_416_when_complete(self, tmp_path):
+        """测试续传携带If-Range条件，416且已下载完整时视为完成"""
+        downloader = XiaoYuZhouDL(config=Config(timeout=5))
+
+        test_file_path = tmp_path / "test_audio.m4a"
+        test_progress_path = tmp_path / "test_audio.m4a.progress"
+        test_file_path.write_bytes(b"x" * 100)
+        downloader._save_download_progress(
+            test_progress_path,
+            {
+                "downloaded": 100,
                 "total": 100,
                 "url": "https://example.com/audio.m4a",
-            }
-            downloader._save_download_progress(test_progress_path, progress_data)
-
-            with aioresponses() as m:
-                # 模拟Range请求支持
-                remaining_content = b"remaining content"
-                m.get(
-                    "https://example.com/audio.m4a",
-                    body=remaining_content,
-                    status=206,  # Partial Content
-                    headers={
-                        "Content-Range": f"bytes {len(partial_content)}-99/100",
-                        "Content-Length": str(len(remaining_content)),
-                    },
-                )
-
-                async with downloader:
-                    result = await downloader._resume_download(
-                        "https://example.com/audio.m4a",
-                        test_file_path,
-                        test_progress_path,
-                    )
+                "validator": '"abc123"',
+            },
+        )
+
+        response = MagicMock()
+        response.status = 416  # Range Not Satisfiable
+        response.__aenter__.return_value = response
+        safe_request = AsyncMock(return_value=response)
+
+        with patch.object(downloader, "_session", Mock()), patch.object(
+            downloader._session_manager, "safe_request", safe_request
+        ):
+            result = await downloader._resume_download(
+                "https://example.com/audio.m4a",
+                test_file_path,
+                test_progress_path,
+            )
+
+        assert result
+        safe_request.assert_awaited_once_with(
+            "GET",
+            "https://example.com/audio.m4a",
+            headers={
+                "Accept-Encoding": "identity",
+                "Range": "bytes=100-",
+                "If-Range": '"abc123"',
+            },
+        )
+        assert not test_progress_path.exists()
+
+    @pytest.mark.asyncio(loop_scope="module")
+    async def test_resume_into_preallocated_file(self, tmp_path):
+        """测试文件已按总大小预分配时从记录位置续传"""
+        downloader = XiaoYuZhouDL(config=Config(timeout=5))
+
+        test_file_path = tmp_path / "test_audio.m4a"
+        test_progress_path = tmp_path / "test_audio.m4a.progress"
+        # 前40字节已写入，其余为预分配的空白区域
+        test_file_path.write_bytes(b"a" * 40 + b"\x00" * 60)
+        progress_data = {"downloaded": 40, "total": 100}
+        assert calculate_resume_position(test_file_path, progress_data) == 40
+        downloader._save_download_progress(test_progress_path, progress_data)
+
+        async def iter_chunked(_size):
+            yield b"b" * 60
+
+        response = MagicMock()
+        response.status = 206
+        response.headers = {"Content-Length": "60"}
+        response.content.iter_chunked = iter_chunked
+        response.__aenter__.return_value = response
+        safe_request = AsyncMock(return_value=response)
+
+        with patch.object(downloader, "_session", Mock()), patch.object(
+            downloader._session_manager, "safe_request", safe_request
+        ):
+            result = await downloader._resume_download(
+                "https://example.com/audio.m4a",
+                test_file_path,
+                test_progress_path,
+            )
+
+        assert result
+        assert test_file_path.read_bytes() == b"a" * 40 + b"b" * 60
 
-                    assert result
-                    # 验证文件内容完整
-                    final_content = test_file_path.read_bytes()
-                    assert final_content == partial_content + remaining_content
+    def test_range_headers_and_validator(self):
+        """测试Range请求头和续传校验值的提取"""
+        assert create_range_headers(0, '"abc"') == {}
+        assert create_range_headers(10) == {"Range": "bytes=10-"}
 
-    @pytest.mark.asyncio
-    async def test_download_progress_save_and_load(self):
+        last_modified = "Wed, 21 Oct 2015 07:28:00 GMT"
+        # 强ETag优先，弱ETag不能用于If-Range，退回Last-Modified
+        assert get_resume_validator({"ETag": '"abc"'}) == '"abc"'
+        assert (
+            get_resume_validator({"ETag": 'W/"abc"', "Last-Modified": last_modified})
+            == last_modified
+        )
+        assert get_resume_validator({}) is None
+
+    @pytest.mark.asyncio(loop_scope="module")
+    async def test_download_progress_save_and_load(self, tmp_path):
         """测试下载进度保存和加载"""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            downloader = XiaoYuZhouDL()
+        downloader = XiaoYuZhouDL()
 
-            progress_path = Path(temp_dir) / "test.progress"
-            progress_data = {
-                "downloaded": 50,
-                "total": 100,
-                "url": "https://example.com/test.m4a",
-                "timestamp": "2023-01-01T00:00:00Z",
-            }
+        progress_path = tmp_path / "test.progress"
+        progress_data = {
+            "downloaded": 50,
+            "total": 100,
+            "url": "https://example.com/test.m4a",
+            "timestamp": "2023-01-01T00:00:00Z",
+        }
 
-            # 保存进度
-            downloader._save_download_progress(progress_path, progress_data)
-            assert progress_path.exists()
+        # 保存进度
+        downloader._save_download_progress(progress_path, progress_data)
+        assert progress_path.exists()
 
-            # 加载进度
-            loaded_data = downloader._load_download_progress(progress_path)
-            assert loaded_data["downloaded"] == 50
-            assert loaded_data["total"] == 100
-            assert loaded_data["url"] == "https://example.com/test.m4a"
+        # 加载进度
+        loaded_data = downloader._load_download_progress(progress_path)
+        assert loaded_data["downloaded"] == 50
+        assert loaded_data["total"] == 100
+        assert loaded_data["url"] == "https://example.com/test.m4a"
 
 
 class TestRetryIntegration:
     """测试重试机制与下载器的集成"""
 
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="module")
     async def test_download_with_retry_success(self):
         """测试下载重试成功的情况"""
         config = Config(max_retries=3, timeout=5)
@@ -239,40 +364,41 @@ class TestRetryIntegration:
                     with pytest.raises(Exception):
                         await downloader.download(request)
 
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="module")
     async def test_download_with_retry_exhausted(self):
         """测试重试次数耗尽的情况"""
         config = Config(max_retries=2, timeout=5)
+        # 每次解析都直接抛出连接错误，跳过HTTP层；退避等待替换为立即返回
+        parse = AsyncMock(side_effect=aiohttp.ClientConnectionError())
 
-        with aioresponses() as m:
-            # 所有请求都失败
-            for _ in range(3):
-                m.get(
-                    "https://www.xiaoyuzhoufm.com/episode/test123",
-                    exception=aiohttp.ClientConnectionError(),
-                )
-
+        with patch("xyz_dl.downloader.parse_episode_from_url", parse), patch(
+            "xyz_dl.retry.asyncio.sleep", new_callable=AsyncMock
+        ):
             async with XiaoYuZhouDL(config=config) as downloader:
                 request = DownloadRequest(url="test123")
                 # 这应该最终失败
                 result = await downloader.download(request)
-                assert not result.success
-                assert (
-                    "network error" in result.error.lower()
-                    or "connection" in result.error.lower()
-                    or "parse" in result.error.lower()
-                )
-
-    @pytest.mark.asyncio
-    async def test_retry_stats_collection(self):
+
+        assert parse.await_count == config.max_retries
+        assert not result.success
+        assert (
+            "network error" in result.error.lower()
+            or "connection" in result.error.lower()
+            or "parse" in result.error.lower()
+        )
+
+    def test_retry_stats_collection(self):
         """测试重试统计收集"""
-        config = Config(max_retries=3)
-        downloader = XiaoYuZhouDL(config=config)
+        stats = RetryStats()
+        assert stats.total_attempts == 0
+        assert stats.failed_attempts == 0
 
-        # 检查重试统计是否可用
-        assert hasattr(downloader, "retry_stats")
-        assert downloader.retry_stats.total_attempts == 0
-        assert downloader.retry_stats.failed_attempts == 0
+        stats.record_attempt(False, "Temporary failure")
+        stats.record_attempt(True)
+
+        assert stats.total_attempts == 2
+        assert stats.failed_attempts == 1
+        assert stats.last_error == "Temporary failure"
 
 
 class TestRetryConfiguration:
@@ -4,29 +4,55 @@
 """
 
 import os
-from pathlib import Path
+import re
 
 import pytest
+import pytest_asyncio
 
 from src.xyz_dl.downloader import XiaoYuZhouDL
 from src.xyz_dl.parsers import JsonScriptParser
 
+from .utils.test_data_manager import TestDataManager
+
+# Show Notes格式检查使用的预编译正则
+_LINK_RE = re.compile(r"\[([^\]]+)\]\(([^)]+)\)")
+_IMG_RE = re.compile(r"!\[([^\]]*)\]\(([^)]+)\)")
+_TAG_RE = re.compile(r"<[^>]+>")
+_TIMESTAMP_RES = [
+    re.compile(r"\*\*\d{1,2}:\d{2}\*\*"),  # **01:30**
+    re.compile(r"\*\*\d{1,2}:\d{2}:\d{2}\*\*"),  # **01:30:45**
+    re.compile(r"\d{1,2}:\d{2}"),  # 01:30
+]
+
+
+# 模块级fixture（解析结果、下载器）由三个测试类共享，分布式运行时放在同一个worker上
+pytestmark = pytest.mark.xdist_group(name="test_show_notes")
+
+
+@pytest_asyncio.fixture(scope="module", loop_scope="module")
+async def parsed_episodes(html_cache, sample_url_files):
+    """按URL索引的样本节目解析结果 - 模块内每个样本只解析一次，测试只读使用"""
+    parser = JsonScriptParser()
+    return {
+        url: await parser.parse_episode_info(html_cache[filename], url)
+        for url, filename in sample_url_files
+    }
+
+
+@pytest.fixture(scope="module")
+def downloader():
+    """模块共享的下载器实例，文件名生成不依赖实例状态"""
+    return XiaoYuZhouDL()
+
 
 class TestShowNotesDownload:
     """Show Notes下载功能测试"""
 
-    @pytest.mark.asyncio
-    async def test_show_notes_markdown_generation(self, test_data_manager, sample_urls):
+    @pytest.mark.asyncio(loop_scope="module")
+    async def test_show_notes_markdown_generation(self, parsed_episodes, sample_urls):
         """测试Show Notes Markdown文件生成"""
-        parser = JsonScriptParser()
-
         # 使用第一个样本URL
-        test_url = sample_urls[0]
-        episode_id = test_url.split("/episode/")[-1].split("?")[0][:12]
-        filename = f"episode_{episode_id}.html"
-
-        html_content = await test_data_manager.load_html(filename)
-        episode_info = await parser.parse_episode_info(html_content, test_url)
+        episode_info = parsed_episodes[sample_urls[0]]
 
         # 验证Show Notes内容结构
         assert episode_info.shownotes != ""
@@ -39,17 +65,11 @@ class TestShowNotesDownload:
         print(f"Show Notes preview (first 200 chars):")
         print(episode_info.shownotes[:200])
 
-    @pytest.mark.asyncio
-    async def test_show_notes_content_structure(self, test_data_manager, sample_urls):
+    @pytest.mark.asyncio(loop_scope="module")
+    async def test_show_notes_content_structure(self, parsed_episodes, sample_urls):
         """测试Show Notes内容结构和完整性"""
-        parser = JsonScriptParser()
-
         for i, test_url in enumerate(sample_urls[:2]):  # 测试前两个URL
-            episode_id = test_url.split("/episode/")[-1].split("?")[0][:12]
-            filename = f"episode_{episode_id}.html"
-
-            html_content = await test_data_manager.load_html(filename)
-            episode_info = await parser.parse_episode_info(html_content, test_url)
+            episode_info = parsed_episodes[test_url]
 
             print(f"\n=== 测试URL {i+1}: {episode_info.title} ===")
             print(f"Show Notes 长度: {len(episode_info.shownotes)} 字符")
@@ -74,23 +94,16 @@ class TestShowNotesDownload:
             print(f"包含 {paragraph_count} 个段落分隔")
             assert paragraph_count > 5  # 应该有多个段落
 
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="module")
     async def test_downloader_show_notes_integration(
-        self, test_data_manager, test_download_dir, sample_urls, http_mocker
+        self, parsed_episodes, test_download_dir, sample_urls, http_mocker
     ):
         """测试下载器的Show Notes集成功能"""
         # 使用Mock HTTP来避免实际网络请求
         downloader = XiaoYuZhouDL()
 
-        test_url = sample_urls[0]
-
         # 由于我们的Mock HTTP还需要完善，这里先测试解析部分
-        parser = JsonScriptParser()
-        episode_id = test_url.split("/episode/")[-1].split("?")[0][:12]
-        filename = f"episode_{episode_id}.html"
-
-        html_content = await test_data_manager.load_html(filename)
-        episode_info = await parser.parse_episode_info(html_content, test_url)
+        episode_info = parsed_episodes[sample_urls[0]]
 
         # 模拟下载器生成Markdown文件的过程
         markdown_content = self._generate_markdown_content(episode_info)
@@ -122,8 +135,8 @@ class TestShowNotesDownload:
 
         return "\n".join(lines)
 
-    @pytest.mark.asyncio
-    async def test_markdown_file_writing(self, test_download_dir):
+    @pytest.mark.asyncio(loop_scope="module")
+    async def test_markdown_file_writing(self, tmp_path):
         """测试Markdown文件写入功能"""
         test_content = """# 测试节目
 
@@ -144,83 +157,59 @@ class TestShowNotesDownload:
 普通段落文本。
 """
 
-        # 写入测试文件
-        test_file_path = Path(test_download_dir) / "test_episode.md"
-
-        with open(test_file_path, "w", encoding="utf-8") as f:
-            f.write(test_content)
+        # 写入测试文件，tmp_path由pytest自动清理
+        test_file_path = tmp_path / "test_episode.md"
+        test_file_path.write_text(test_content, encoding="utf-8")
 
         # 验证文件存在和内容正确
         assert test_file_path.exists()
 
-        with open(test_file_path, "r", encoding="utf-8") as f:
-            read_content = f.read()
+        read_content = test_file_path.read_text(encoding="utf-8")
 
         assert read_content == test_content
         assert "测试节目" in read_content
         assert "Show Notes" in read_content
 
-        # 清理测试文件
-        test_file_path.unlink()
-
-    @pytest.mark.asyncio
-    async def test_filename_generation_and_sanitization(self, sample_urls):
+    @pytest.mark.parametrize(
+        "title,author",
+        [
+            ("正常的播客节目标题", "播客主播"),
+            ('节目标题：包含/特殊\\字符<>|和"引号?', "作者名*字"),
+            ("这是一个" + "非常" * 50 + "长的标题", "播客主播"),
+        ],
+        ids=["normal", "special", "long"],
+    )
+    def test_filename_generation_and_sanitization(self, downloader, title, author):
         """测试文件名生成和清理功能"""
-        from src.xyz_dl.downloader import XiaoYuZhouDL
-
-        downloader = XiaoYuZhouDL()
-
-        # 测试正常文件名生成
-        normal_title = "正常的播客节目标题"
-        author = "播客主播"
-        filename = downloader._create_safe_filename(normal_title, author)
+        filename = downloader._create_safe_filename(title, author)
+        print(f"生成的文件名: {filename}")
 
         assert filename.endswith(".md")
-        assert "正常的播客节目标题" in filename
-        assert "播客主播" in filename
-
-        # 测试包含特殊字符的文件名清理
-        special_title = '节目标题：包含/特殊\\字符<>|和"引号?'
-        special_author = "作者名*字"
-        safe_filename = downloader._create_safe_filename(special_title, special_author)
-
         # 验证特殊字符被清理
-        illegal_chars = ["<", ">", ":", '"', "/", "\\", "|", "?", "*"]
-        for char in illegal_chars:
-            assert char not in safe_filename
-
+        assert not set('<>:"/\\|?*') & set(filename)
         # 验证文件名长度限制
-        very_long_title = "这是一个" + "非常" * 50 + "长的标题"
-        long_filename = downloader._create_safe_filename(very_long_title, author)
+        assert len(filename) <= 250  # 考虑文件扩展名
 
-        assert len(long_filename) <= 250  # 考虑文件扩展名
+    def test_filename_keeps_title_and_author(self, downloader):
+        """测试正常标题和主播名原样保留在文件名中"""
+        filename = downloader._create_safe_filename("正常的播客节目标题", "播客主播")
 
-        print(f"正常文件名: {filename}")
-        print(f"清理后文件名: {safe_filename}")
-        print(f"长文件名截断: {long_filename}")
+        assert "正常的播客节目标题" in filename
+        assert "播客主播" in filename
 
 
 class TestShowNotesFormatting:
     """Show Notes格式化测试"""
 
-    @pytest.mark.asyncio
-    async def test_markdown_link_formatting(self, test_data_manager, sample_urls):
+    @pytest.mark.asyncio(loop_scope="module")
+    async def test_markdown_link_formatting(self, parsed_episodes, sample_urls):
         """测试Markdown链接格式化"""
-        parser = JsonScriptParser()
-
-        test_url = sample_urls[0]
-        episode_id = test_url.split("/episode/")[-1].split("?")[0][:12]
-        filename = f"episode_{episode_id}.html"
-
-        html_content = await test_data_manager.load_html(filename)
-        episode_info = await parser.parse_episode_info(html_content, test_url)
+        episode_info = parsed_episodes[sample_urls[0]]
 
         show_notes = episode_info.shownotes
 
         # 检查链接格式
-        import re
-
-        markdown_links = re.findall(r"\[([^\]]+)\]\(([^)]+)\)", show_notes)
+        markdown_links = _LINK_RE.findall(show_notes)
 
         print(f"发现 {len(markdown_links)} 个Markdown格式链接:")
         for i, (text, url) in enumerate(markdown_links[:5]):  # 显示前5个
@@ -228,59 +217,35 @@ class TestShowNotesFormatting:
             assert text.strip() != ""  # 链接文本不能为空
             assert url.startswith("http")  # URL应该是完整的
 
-    @pytest.mark.asyncio
-    async def test_timestamp_formatting(self, test_data_manager, sample_urls):
+    @pytest.mark.asyncio(loop_scope="module")
+    async def test_timestamp_formatting(self, parsed_episodes, sample_urls):
         """测试时间戳格式化"""
-        parser = JsonScriptParser()
-
-        test_url = sample_urls[0]
-        episode_id = test_url.split("/episode/")[-1].split("?")[0][:12]
-        filename = f"episode_{episode_id}.html"
-
-        html_content = await test_data_manager.load_html(filename)
-        episode_info = await parser.parse_episode_info(html_content, test_url)
+        episode_info = parsed_episodes[sample_urls[0]]
 
         show_notes = episode_info.shownotes
 
         # 检查时间戳格式（如：**01:30** 或 01:30）
-        import re
-
-        timestamp_patterns = [
-            r"\*\*\d{1,2}:\d{2}\*\*",  # **01:30**
-            r"\*\*\d{1,2}:\d{2}:\d{2}\*\*",  # **01:30:45**
-            r"\d{1,2}:\d{2}",  # 01:30
-        ]
-
         total_timestamps = 0
-        for pattern in timestamp_patterns:
-            timestamps = re.findall(pattern, show_notes)
+        for pattern in _TIMESTAMP_RES:
+            timestamps = pattern.findall(show_notes)
             total_timestamps += len(timestamps)
 
             if timestamps:
-                print(f"找到时间戳格式 '{pattern}': {len(timestamps)} 个")
+                print(f"找到时间戳格式 '{pattern.pattern}': {len(timestamps)} 个")
                 for ts in timestamps[:3]:  # 显示前3个例子
                     print(f"  - {ts}")
 
         assert total_timestamps > 5  # 应该包含多个时间戳
 
-    @pytest.mark.asyncio
-    async def test_image_embedding(self, test_data_manager, sample_urls):
+    @pytest.mark.asyncio(loop_scope="module")
+    async def test_image_embedding(self, parsed_episodes, sample_urls):
         """测试图片嵌入"""
-        parser = JsonScriptParser()
-
-        test_url = sample_urls[0]
-        episode_id = test_url.split("/episode/")[-1].split("?")[0][:12]
-        filename = f"episode_{episode_id}.html"
-
-        html_content = await test_data_manager.load_html(filename)
-        episode_info = await parser.parse_episode_info(html_content, test_url)
+        episode_info = parsed_episodes[sample_urls[0]]
 
         show_notes = episode_info.shownotes
 
         # 检查图片Markdown格式
-        import re
-
-        images = re.findall(r"!\[([^\]]*)\]\(([^)]+)\)", show_notes)
+        images = _IMG_RE.findall(show_notes)
 
         print(f"发现 {len(images)} 个图片:")
         for i, (alt_text, url) in enumerate(images):
@@ -294,24 +259,21 @@ class TestShowNotesFormatting:
 class TestShowNotesQuality:
     """Show Notes质量测试"""
 
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="module")
     async def test_content_completeness_comparison(
-        self, test_data_manager, sample_urls
+        self, html_cache, parsed_episodes, sample_urls
     ):
         """测试内容完整性对比"""
         parser = JsonScriptParser()
 
         test_url = sample_urls[0]
-        episode_id = test_url.split("/episode/")[-1].split("?")[0][:12]
-        filename = f"episode_{episode_id}.html"
-
-        html_content = await test_data_manager.load_html(filename)
+        html_content = html_cache[TestDataManager.fixture_filename(test_url)]
 
         # 直接从HTML提取Show Notes
         html_show_notes = parser.extract_show_notes_from_html(html_content)
 
         # 通过完整解析流程获取Show Notes
-        episode_info = await parser.parse_episode_info(html_content, test_url)
+        episode_info = parsed_episodes[test_url]
         parsed_show_notes = episode_info.shownotes
 
         print(f"HTML提取长度: {len(html_show_notes)}")
@@ -330,18 +292,12 @@ class TestShowNotesQuality:
         print(f"包含关键词: {found_phrases}")
         assert len(found_phrases) >= 3  # 应该包含大部分关键词
 
-    @pytest.mark.asyncio
-    async def test_multilingual_content_handling(self, test_data_manager, sample_urls):
+    @pytest.mark.asyncio(loop_scope="module")
+    async def test_multilingual_content_handling(self, parsed_episodes, sample_urls):
         """测试多语言内容处理"""
-        parser = JsonScriptParser()
-
         # 测试所有样本URL以确保多样性
         for i, test_url in enumerate(sample_urls):
-            episode_id = test_url.split("/episode/")[-1].split("?")[0][:12]
-            filename = f"episode_{episode_id}.html"
-
-            html_content = await test_data_manager.load_html(filename)
-            episode_info = await parser.parse_episode_info(html_content, test_url)
+            episode_info = parsed_episodes[test_url]
 
             show_notes = episode_info.shownotes
 
@@ -361,24 +317,15 @@ class TestShowNotesQuality:
                 show_notes
             )  # UTF-8编码长度应该更大
 
-    @pytest.mark.asyncio
-    async def test_show_notes_no_html_tags(self, test_data_manager, sample_urls):
+    @pytest.mark.asyncio(loop_scope="module")
+    async def test_show_notes_no_html_tags(self, parsed_episodes, sample_urls):
         """测试Show Notes不包含HTML标签"""
-        parser = JsonScriptParser()
-
-        test_url = sample_urls[0]
-        episode_id = test_url.split("/episode/")[-1].split("?")[0][:12]
-        filename = f"episode_{episode_id}.html"
-
-        html_content = await test_data_manager.load_html(filename)
-        episode_info = await parser.parse_episode_info(html_content, test_url)
+        episode_info = parsed_episodes[sample_urls[0]]
 
         show_notes = episode_info.shownotes
 
         # 检查是否包含HTML标签
-        import re
-
-        html_tags = re.findall(r"<[^>]+>", show_notes)
+        html_tags = _TAG_RE.findall(show_notes)
 
         print(f"发现HTML标签: {len(html_tags)}")
         for tag in html_tags[:5]:  # 显示前5个
@@ -71,7 +71,7 @@ class TestBasicModels:
         config = Config()
         assert config.timeout == 30
         assert config.max_retries == 3
-        assert config.chunk_size == 8192
+        assert config.chunk_size == 65536
         assert len(config.user_agent) > 0
 
         # 自定义配置
@@ -83,10 +83,11 @@ class TestBasicModels:
 class TestBasicConfig:
     """测试基本配置功能"""
 
-    def test_get_default_config(self):
+    def test_get_default_config(self, shared_env):
         """测试获取默认配置"""
-        config = get_config()
+        config = shared_env.config
         assert isinstance(config, Config)
+        assert get_config() is config
         assert config.timeout > 0
         assert config.max_retries > 0
         assert config.chunk_size > 0
@@ -117,24 +118,16 @@ class TestBasicExceptions:
 class TestPackageImports:
     """测试包导入"""
 
-    def test_main_imports(self):
+    def test_main_imports(self, shared_env):
         """测试主要导入"""
         # 测试能够导入主要组件
-        from xyz_dl import XiaoYuZhouDL
-        from xyz_dl import download_episode
-        from xyz_dl import Config
-        from xyz_dl import ValidationError
+        pkg = shared_env.pkg
+        for name in ("XiaoYuZhouDL", "download_episode", "Config", "ValidationError"):
+            assert getattr(pkg, name, None) is not None, name
 
-        assert XiaoYuZhouDL is not None
-        assert download_episode is not None
-        assert Config is not None
-        assert ValidationError is not None
-
-    def test_version_attribute(self):
+    def test_version_attribute(self, shared_env):
         """测试版本属性"""
-        import xyz_dl
-        assert hasattr(xyz_dl, '__version__')
-        assert isinstance(xyz_dl.__version__, str)
+        assert isinstance(getattr(shared_env.pkg, '__version__', None), str)
 
 
 class TestFilenameUtils:
@@ -2,21 +2,38 @@
 
 import asyncio
 import tempfile
+import time
 import pytest
-from unittest.mock import AsyncMock, Mock, patch
+from unittest.mock import AsyncMock, patch
 from pathlib import Path
+from types import SimpleNamespace
 
 from src.xyz_dl.performance.streaming_downloader import StreamingDownloader
 from src.xyz_dl.config import Config
 
 
-@pytest.fixture
-def streaming_downloader():
-    """创建流式下载器实例"""
-    config = Config()
+@pytest.fixture(scope="module")
+def config():
+    """模块共享的配置，测试中只读不改"""
+    return Config()
+
+
+@pytest.fixture(scope="module")
+def streaming_downloader(config):
+    """模块共享的流式下载器实例，每次下载开始时都会重置峰值内存统计"""
     return StreamingDownloader(config=config)
 
 
+@pytest.fixture(scope="module")
+def make_streaming_downloader(config):
+    """按需构造自定义阈值/限速的流式下载器，复用共享配置"""
+
+    def factory(**kwargs):
+        return StreamingDownloader(config=config, **kwargs)
+
+    return factory
+
+
 @pytest.fixture
 def temp_file():
     """创建临时文件"""
@@ -28,198 +45,214 @@ def temp_file():
         temp_path.unlink()
 
 
-@pytest.mark.asyncio
-async def test_streaming_downloader_small_file(streaming_downloader, temp_file):
-    """测试小文件下载（不使用流式）"""
-    mock_response = AsyncMock()
-    mock_response.headers = {"content-length": "1024"}  # 1KB
-    mock_response.content.read = AsyncMock(return_value=b"x" * 1024)
+def _build_response(mock_response_factory, chunk_size, size, read_error=None):
+    """构造同时支持一次性读取和分块读取的响应，可指定读取时抛出的异常"""
+    mock_response = mock_response_factory(size, chunk_size)
+    if read_error is not None:
+
+        async def raising_read():
+            raise read_error
+
+        mock_response.content.read = raising_read
+    return mock_response
+
+
+@pytest.mark.parametrize(
+    "size,memory_threshold_mb,streaming,read_error,write_error",
+    [
+        pytest.param(1024, 10, False, None, None, id="small_file"),
+        # 阈值设为0即可走流式分支，不需要真的构造超过10MB的数据
+        pytest.param(4 * 65536 + 1, 0, True, None, None, id="large_file"),
+        # 内存统计只需走通一次采样，64KB足够，无需构造1MB数据
+        pytest.param(65536, 10, False, None, None, id="memory_monitoring"),
+        pytest.param(
+            1024, 10, False, Exception("Network error"), None, id="error_handling"
+        ),
+        pytest.param(1024, 10, False, None, IOError("Disk full"), id="file_write_error"),
+    ],
+)
+@pytest.mark.asyncio(loop_scope="module")
+async def test_streaming_downloader_scenarios(
+    temp_file,
+    mock_response_factory,
+    fake_aiofiles,
+    make_streaming_downloader,
+    size,
+    memory_threshold_mb,
+    streaming,
+    read_error,
+    write_error,
+):
+    """测试常规/流式下载的结果、进度回调、内存统计和错误处理"""
+    downloader = make_streaming_downloader(memory_threshold_mb=memory_threshold_mb)
+    mock_response = _build_response(
+        mock_response_factory, downloader.config.chunk_size, size, read_error
+    )
+    # 模拟文件写入错误
+    fake_aiofiles.fail_with = write_error
+    progress_calls = []
+
+    def progress_callback(downloaded, total, speed):
+        progress_calls.append((downloaded, total))
 
-    with patch('aiofiles.open') as mock_open:
-        mock_file = AsyncMock()
-        mock_open.return_value.__aenter__ = AsyncMock(return_value=mock_file)
-        mock_open.return_value.__aexit__ = AsyncMock(return_value=None)
+    result = await downloader.download_file(
+        mock_response, temp_file, progress_callback=progress_callback
+    )
 
-        result = await streaming_downloader.download_file(
-            mock_response, temp_file, progress_callback=None
-        )
+    failure = read_error or write_error
+    if failure is not None:
+        assert result.success is False
+        assert str(failure) in result.error_message
+        return
+
+    assert result.success is True
+    assert result.total_bytes == size
+    assert result.streaming_used is streaming
+    assert result.peak_memory_mb > 0
+    # 最后一次回调显示完整下载
+    assert progress_calls[-1] == (size, size)
+    assert len(fake_aiofiles.content_of(temp_file)) == size
+
+
+@pytest.mark.asyncio(loop_scope="module")
+async def test_streaming_downloader_samples_memory_periodically(
+    temp_file, mock_response_factory, fake_aiofiles, make_streaming_downloader
+):
+    """测试流式下载按块数间隔采样内存"""
+    downloader = make_streaming_downloader(memory_threshold_mb=0)
+    mock_response = mock_response_factory(2048, 1)  # 2048个1字节块
+
+    with patch.object(downloader, '_update_memory_stats') as mock_sample:
+        result = await downloader.download_file(mock_response, temp_file)
+
+    assert result.success is True
+    assert result.streaming_used is True
+    # 第0块、第1024块各采样一次，结束时再采样一次
+    assert mock_sample.call_count == 3
+
+
+@pytest.mark.asyncio(loop_scope="module")
+async def test_streaming_progress_callback_throttled(
+    temp_file, mock_response_factory, fake_aiofiles, make_streaming_downloader
+):
+    """测试流式下载进度回调限频，且最后一次回调为完整下载量"""
+    downloader = make_streaming_downloader(memory_threshold_mb=0)
+    mock_response = mock_response_factory(4096, 1)
+    progress_calls = []
 
-        assert result.success is True
-        assert result.total_bytes == 1024
-        assert result.streaming_used is False
+    def progress_callback(downloaded, total, speed):
+        progress_calls.append((downloaded, total))
 
+    result = await downloader.download_file(
+        mock_response, temp_file, progress_callback=progress_callback
+    )
 
-@pytest.mark.asyncio
-async def test_streaming_downloader_large_file(streaming_downloader, temp_file):
-    """测试大文件下载（使用流式）"""
-    large_size = 15 * 1024 * 1024  # 15MB
-    mock_response = AsyncMock()
-    mock_response.headers = {"content-length": str(large_size)}
+    assert result.success is True
+    # 4096个块在100ms内完成，只应产生极少回调
+    assert 1 <= len(progress_calls) < 10
+    assert progress_calls[-1] == (4096, 4096)
 
-    # 模拟分块读取
-    chunk_size = streaming_downloader.config.chunk_size
-    chunks = [b"x" * chunk_size for _ in range(large_size // chunk_size)]
-    chunks.append(b"x" * (large_size % chunk_size))  # 最后一块
 
-    # 创建异步迭代器
+@pytest.mark.asyncio(loop_scope="module")
+async def test_streaming_downloader_buffers_writes(
+    temp_file, make_streaming_downloader
+):
+    """测试流式下载批量写入且内容完整"""
+    downloader = make_streaming_downloader(memory_threshold_mb=0)
+    chunks = [bytes([i]) * (600 * 1024) for i in range(3)]  # 共约1.8MB
+
     async def mock_iter_chunked(size):
         for chunk in chunks:
             yield chunk
 
-    mock_response.content.iter_chunked = mock_iter_chunked
-
-    with patch('aiofiles.open') as mock_open:
-        mock_file = AsyncMock()
-        mock_open.return_value.__aenter__ = AsyncMock(return_value=mock_file)
-        mock_open.return_value.__aexit__ = AsyncMock(return_value=None)
-
-        result = await streaming_downloader.download_file(
-            mock_response, temp_file, progress_callback=None
-        )
-
-        assert result.success is True
-        assert result.total_bytes == large_size
-        assert result.streaming_used is True
-
+    mock_response = SimpleNamespace(
+        headers={"content-length": str(sum(map(len, chunks)))},
+        content=SimpleNamespace(iter_chunked=mock_iter_chunked),
+    )
 
-@pytest.mark.asyncio
-async def test_streaming_downloader_with_progress_callback(streaming_downloader, temp_file):
-    """测试带进度回调的下载"""
-    mock_response = AsyncMock()
-    mock_response.headers = {"content-length": "1024"}
+    result = await downloader.download_file(mock_response, temp_file)
 
-    # 使用常规下载而非流式下载，确保简单性
-    mock_response.content.read = AsyncMock(return_value=b"x" * 1024)
+    assert result.success is True
+    assert result.downloaded_bytes == sum(map(len, chunks))
+    assert temp_file.read_bytes() == b"".join(chunks)
 
-    progress_calls = []
 
-    def progress_callback(downloaded, total, speed):
-        progress_calls.append((downloaded, total, speed))
+@pytest.mark.asyncio(loop_scope="module")
+async def test_speed_limit_skips_negligible_waits(streaming_downloader):
+    """测试限速只在超前量足够大时才等待"""
+    start_time = time.time()
 
-    with patch('aiofiles.open') as mock_open:
-        mock_file = AsyncMock()
-        mock_open.return_value.__aenter__ = AsyncMock(return_value=mock_file)
-        mock_open.return_value.__aexit__ = AsyncMock(return_value=None)
+    with patch('src.xyz_dl.performance.streaming_downloader.asyncio.sleep') as mock_sleep:
+        # 1字节在1MB/s下的理想耗时远小于最小等待时长
+        await streaming_downloader._apply_speed_limit(1, start_time, limit_mbps=1.0)
+        mock_sleep.assert_not_called()
 
-        result = await streaming_downloader.download_file(
-            mock_response, temp_file, progress_callback=progress_callback
+        # 1MB在1MB/s下应等待接近1秒
+        await streaming_downloader._apply_speed_limit(
+            1024 * 1024, start_time, limit_mbps=1.0
         )
-
-        assert result.success is True
-        assert len(progress_calls) > 0  # 确保进度回调被调用
-        assert progress_calls[-1][0] == 1024  # 最后一次回调显示完整下载
+        mock_sleep.assert_awaited_once()
+        assert 0.9 < mock_sleep.await_args.args[0] <= 1.0
 
 
-@pytest.mark.asyncio
-async def test_streaming_downloader_memory_monitoring(streaming_downloader, temp_file):
-    """测试内存监控功能"""
-    mock_response = AsyncMock()
-    mock_response.headers = {"content-length": "1048576"}  # 1MB
-
-    chunks = [b"x" * 1024 for _ in range(1024)]
+@pytest.mark.asyncio(loop_scope="module")
+async def test_streaming_downloader_chunk_size_override(
+    temp_file, fake_aiofiles, make_streaming_downloader
+):
+    """测试单次下载可覆盖配置中的块大小"""
+    downloader = make_streaming_downloader(memory_threshold_mb=0)
+    requested_sizes = []
 
     async def mock_iter_chunked(size):
-        for chunk in chunks:
-            yield chunk
+        requested_sizes.append(size)
+        yield b"data"
 
-    mock_response.content.iter_chunked = mock_iter_chunked
+    mock_response = SimpleNamespace(
+        headers={"content-length": "4"},
+        content=SimpleNamespace(iter_chunked=mock_iter_chunked),
+    )
 
-    with patch('aiofiles.open') as mock_open:
-        mock_file = AsyncMock()
-        mock_open.return_value.__aenter__ = AsyncMock(return_value=mock_file)
-        mock_open.return_value.__aexit__ = AsyncMock(return_value=None)
+    await downloader.download_file(mock_response, temp_file)
+    await downloader.download_file(mock_response, temp_file, chunk_size=1024)
 
-        result = await streaming_downloader.download_file(
-            mock_response, temp_file, progress_callback=None
-        )
+    assert requested_sizes == [downloader.config.chunk_size, 1024]
 
-        assert result.success is True
-        assert hasattr(result, 'peak_memory_mb')
-        assert result.peak_memory_mb > 0
 
-
-@pytest.mark.asyncio
-async def test_streaming_downloader_speed_limit(temp_file):
+@pytest.mark.asyncio(loop_scope="module")
+async def test_streaming_downloader_speed_limit(
+    make_streaming_downloader, monkeypatch
+):
     """测试下载速度限制"""
-    config = Config()
     # 设置速度限制为 1MB/s
-    streaming_downloader = StreamingDownloader(
-        config=config,
-        speed_limit_mbps=1.0
-    )
+    streaming_downloader = make_streaming_downloader(speed_limit_mbps=1.0)
 
     # 验证速度限制配置
     assert streaming_downloader.speed_limit_mbps == 1.0
 
-    # 测试速度限制方法
-    import time
-    start_time = time.time()
+    # 只记录请求的等待时长，不真正等待
+    mock_sleep = AsyncMock()
+    monkeypatch.setattr(
+        'src.xyz_dl.performance.streaming_downloader.asyncio.sleep', mock_sleep
+    )
 
     # 模拟已下载 2MB，应该触发速度限制
     await streaming_downloader._apply_speed_limit(
         downloaded_bytes=2 * 1024 * 1024,
-        start_time=start_time,
+        start_time=time.time(),
         limit_mbps=1.0
     )
 
-    elapsed_time = time.time() - start_time
-    # 应该至少等待接近2秒
-    assert elapsed_time >= 1.8
+    # 应该请求等待接近2秒
+    mock_sleep.assert_awaited_once()
+    assert mock_sleep.await_args.args[0] == pytest.approx(2.0, abs=0.1)
 
 
-@pytest.mark.asyncio
-async def test_streaming_downloader_memory_threshold():
+@pytest.mark.asyncio(loop_scope="module")
+async def test_streaming_downloader_memory_threshold(make_streaming_downloader):
     """测试内存阈值检查"""
-    config = Config()
-    streaming_downloader = StreamingDownloader(
-        config=config,
-        memory_threshold_mb=10  # 10MB阈值
-    )
+    streaming_downloader = make_streaming_downloader(memory_threshold_mb=10)  # 10MB阈值
 
     # 测试是否应该使用流式下载
     assert streaming_downloader._should_use_streaming(15 * 1024 * 1024) is True  # 15MB
     assert streaming_downloader._should_use_streaming(5 * 1024 * 1024) is False   # 5MB
 
-
-@pytest.mark.asyncio
-async def test_streaming_downloader_error_handling(streaming_downloader, temp_file):
-    """测试错误处理"""
-    mock_response = AsyncMock()
-    mock_response.headers = {"content-length": "1024"}
-
-    # 模拟读取错误 - 使用常规下载
-    mock_response.content.read = AsyncMock(side_effect=Exception("Network error"))
-
-    with patch('aiofiles.open') as mock_open:
-        mock_file = AsyncMock()
-        mock_open.return_value.__aenter__ = AsyncMock(return_value=mock_file)
-        mock_open.return_value.__aexit__ = AsyncMock(return_value=None)
-
-        result = await streaming_downloader.download_file(
-            mock_response, temp_file, progress_callback=None
-        )
-
-        assert result.success is False
-        assert "Network error" in result.error_message
-
-
-@pytest.mark.asyncio
-async def test_streaming_downloader_file_write_error(streaming_downloader, temp_file):
-    """测试文件写入错误处理"""
-    mock_response = AsyncMock()
-    mock_response.headers = {"content-length": "1024"}
-    mock_response.content.read = AsyncMock(return_value=b"x" * 1024)
-
-    with patch('aiofiles.open') as mock_open:
-        # 模拟文件写入错误
-        mock_file = AsyncMock()
-        mock_file.write = AsyncMock(side_effect=IOError("Disk full"))
-        mock_open.return_value.__aenter__ = AsyncMock(return_value=mock_file)
-        mock_open.return_value.__aexit__ = AsyncMock(return_value=None)
-
-        result = await streaming_downloader.download_file(
-            mock_response, temp_file, progress_callback=None
-        )
-
-        assert result.success is False
-        assert "Disk full" in result.error_message
\ No newline at end of file
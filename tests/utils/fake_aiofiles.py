@@ -0,0 +1,62 @@
+"""aiofiles内存替身
+
+用 io.BytesIO 代替真实文件，替换 aiofiles.open 后下载器的写入全部落在内存中，
+避免每个测试都用 AsyncMock 拼装文件对象
+"""
+
+import io
+from typing import Dict, Iterable, Optional
+
+
+class FakeAsyncFile:
+    """内存中的异步文件对象，同时充当 async with 上下文管理器"""
+
+    def __init__(self, fail_with: Optional[BaseException] = None):
+        """初始化内存文件
+
+        Args:
+            fail_with: 写入时抛出的异常，None表示正常写入
+        """
+        self._buffer = io.BytesIO()
+        self._fail_with = fail_with
+
+    async def write(self, data: bytes) -> int:
+        """写入数据"""
+        if self._fail_with is not None:
+            raise self._fail_with
+        return self._buffer.write(data)
+
+    async def writelines(self, lines: Iterable[bytes]) -> None:
+        """批量写入数据"""
+        if self._fail_with is not None:
+            raise self._fail_with
+        self._buffer.writelines(lines)
+
+    def getvalue(self) -> bytes:
+        """返回已写入的全部内容"""
+        return self._buffer.getvalue()
+
+    async def __aenter__(self) -> "FakeAsyncFile":
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        pass
+
+
+class FakeAiofiles:
+    """aiofiles.open 的替代实现，按路径记录打开过的内存文件"""
+
+    def __init__(self) -> None:
+        self.files: Dict[str, FakeAsyncFile] = {}
+        # 设置后，之后打开的文件在写入时抛出该异常
+        self.fail_with: Optional[BaseException] = None
+
+    def open(self, file, mode: str = "r", **kwargs) -> FakeAsyncFile:
+        """打开（新建）内存文件，同一路径再次打开时覆盖旧内容"""
+        fake_file = FakeAsyncFile(self.fail_with)
+        self.files[str(file)] = fake_file
+        return fake_file
+
+    def content_of(self, file) -> bytes:
+        """返回指定路径最后一次写入的内容"""
+        return self.files[str(file)].getvalue()
@@ -11,13 +11,18 @@ from urllib.parse import urlparse
 
 import aiohttp
 import pytest
+from aiohttp.client_reqrep import RequestInfo
+from yarl import URL
 
-from .test_data_manager import TestDataManager, DEFAULT_TEST_URLS
+from .test_data_manager import TestDataManager, DEFAULT_TEST_URLS, DEFAULT_URL_FILES
 
 
 class MockResponse:
     """模拟HTTP响应对象"""
 
+    # 每次模拟请求都会创建，使用 __slots__ 省去实例 __dict__
+    __slots__ = ("status", "reason", "_html_content", "_headers")
+
     def __init__(self, html_content: str, status: int = 200, reason: str = "OK"):
         self.status = status
         self.reason = reason
@@ -49,6 +54,8 @@ class MockResponse:
 class MockHTTPSession:
     """模拟HTTP会话对象"""
 
+    __slots__ = ("data_manager", "_url_to_file", "_should_fail")
+
     def __init__(self, data_manager: TestDataManager = None):
         """初始化Mock HTTP会话
 
@@ -56,24 +63,10 @@ class MockHTTPSession:
             data_manager: 测试数据管理器实例
         """
         self.data_manager = data_manager or TestDataManager()
-        self._url_to_file = {}
+        # URL到fixture文件的映射，文件名已在导入时预先计算
+        self._url_to_file = dict(DEFAULT_URL_FILES)
         self._should_fail = {}  # URL -> 异常类型映射
 
-        # 初始化URL到文件的映射
-        self._setup_url_mapping()
-
-    def _setup_url_mapping(self):
-        """设置URL到文件的映射"""
-        for i, url in enumerate(DEFAULT_TEST_URLS):
-            # 从URL提取episode ID
-            try:
-                episode_id = url.split("/episode/")[-1].split("?")[0][:12]
-                filename = f"episode_{episode_id}.html"
-            except Exception:
-                filename = f"episode_test_{i}.html"
-
-            self._url_to_file[url] = filename
-
     def set_failure(self, url: str, exception: Exception):
         """设置特定URL应该失败
 
@@ -154,10 +147,20 @@ class HTTPMocker:
         self.original_client_session = None
         self.mock_session = None
 
-    def start_mock(self):
-        """开始Mock HTTP请求"""
+    def start_mock(self, monkeypatch: Optional[pytest.MonkeyPatch] = None):
+        """开始Mock HTTP请求
+
+        Args:
+            monkeypatch: pytest的monkeypatch，传入时由它负责在测试结束后还原，
+                测试异常退出也不会把Mock泄漏给其他测试；不传入时需要调用 stop_mock
+        """
         self.mock_session = MockHTTPSession(self.data_manager)
 
+        if monkeypatch is not None:
+            monkeypatch.setattr(aiohttp, "ClientSession", MockClientSession)
+            monkeypatch.setattr(MockClientSession, "_mock_session", self.mock_session)
+            return
+
         # 保存原始的ClientSession
         self.original_client_session = aiohttp.ClientSession
 
@@ -229,15 +232,13 @@ async def test_data_manager():
 
 
 @pytest.fixture
-async def http_mocker(test_data_manager):
+async def http_mocker(test_data_manager, monkeypatch):
     """HTTP Mock管理器fixture"""
     mocker = HTTPMocker(test_data_manager)
-    mocker.start_mock()
+    mocker.start_mock(monkeypatch)
 
     yield mocker
 
-    mocker.stop_mock()
-
 
 @pytest.fixture
 async def mock_http_session(test_data_manager):
@@ -279,32 +280,31 @@ def create_timeout_error(message: str = "Request timeout") -> aiohttp.ClientErro
     return aiohttp.ServerTimeoutError(message)
 
 
+def _build_dummy_request_info() -> Optional[RequestInfo]:
+    """创建模拟错误共用的RequestInfo，创建失败时返回None"""
+    try:
+        url = URL("https://example.com")
+        return RequestInfo(url=url, method="GET", headers={}, real_url=url)
+    except Exception:
+        return None
+
+
+# RequestInfo不可变，所有模拟HTTP错误共用一个实例
+_DUMMY_REQUEST_INFO = _build_dummy_request_info()
+
+
 def create_http_error(status: int, message: str = None) -> aiohttp.ClientError:
     """创建HTTP错误异常"""
     if message is None:
         message = f"HTTP {status} error"
 
-    # 创建模拟的request_info对象
-    from yarl import URL
-    from aiohttp.client_reqrep import RequestInfo
-
-    try:
-        # 创建基本的RequestInfo对象
-        url = URL("https://example.com")
-        request_info = RequestInfo(
-            url=url,
-            method="GET",
-            headers={},
-            real_url=url
-        )
-
-        # 模拟不同的HTTP错误
-        if status == 404:
-            return aiohttp.ClientResponseError(request_info, (), status=status, message=message)
-        elif status >= 500:
-            return aiohttp.ClientResponseError(request_info, (), status=status, message=message)
-        else:
-            return aiohttp.ClientError(message)
-    except Exception:
+    if _DUMMY_REQUEST_INFO is None:
         # 如果RequestInfo创建失败，使用简单的ClientError
         return aiohttp.ClientError(f"HTTP {status}: {message}")
+
+    # 模拟不同的HTTP错误
+    if status == 404 or status >= 500:
+        return aiohttp.ClientResponseError(
+            _DUMMY_REQUEST_INFO, (), status=status, message=message
+        )
+    return aiohttp.ClientError(message)
@@ -5,17 +5,31 @@
 
 import asyncio
 import os
+import re
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Optional
 from urllib.parse import urlparse
 
 import aiofiles
 import aiohttp
 
+# 从URL中提取episode ID前12位，作为fixture文件名
+_EPISODE_ID_RE = re.compile(r"/episode/([^/?#]{1,12})")
+
+# 获取fixture时的分块写入大小
+_FETCH_CHUNK_SIZE = 100 * 1024
+
+# 默认fixtures目录（tests/fixtures），导入时确定并创建一次
+_DEFAULT_FIXTURES_DIR = Path(__file__).parent.parent / "fixtures"
+_DEFAULT_FIXTURES_DIR.mkdir(exist_ok=True, parents=True)
+
 
 class TestDataManager:
     """测试数据管理器"""
 
+    __test__ = False  # 工具类，不让pytest当作测试类收集
+
     def __init__(self, fixtures_dir: str = None):
         """初始化测试数据管理器
 
@@ -23,19 +37,45 @@ class TestDataManager:
             fixtures_dir: 测试fixtures目录路径，默认为 tests/fixtures
         """
         if fixtures_dir is None:
-            # 获取当前文件的父目录的父目录，即tests目录
-            tests_dir = Path(__file__).parent.parent
-            fixtures_dir = tests_dir / "fixtures"
+            self.fixtures_dir = _DEFAULT_FIXTURES_DIR
+        else:
+            self.fixtures_dir = Path(fixtures_dir)
+            self.fixtures_dir.mkdir(exist_ok=True, parents=True)
 
-        self.fixtures_dir = Path(fixtures_dir)
-        self.fixtures_dir.mkdir(exist_ok=True, parents=True)
+        # 已加载的HTML内容缓存，同一进程内每个fixture文件只读取一次
+        self._html_cache: Dict[str, str] = {}
 
-    async def fetch_and_save_html(self, url: str, filename: str = None) -> str:
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def fixture_filename(url: str) -> str:
+        """根据URL的episode ID生成测试数据文件名（按URL缓存，样本URL集合固定）
+
+        Args:
+            url: 节目URL
+
+        Returns:
+            形如 episode_<ID前12位>.html 的文件名
+
+        Raises:
+            ValueError: URL中没有episode ID
+        """
+        match = _EPISODE_ID_RE.search(url)
+        if match is None:
+            raise ValueError(f"URL中没有episode ID: {url}")
+        return f"episode_{match.group(1)}.html"
+
+    async def fetch_and_save_html(
+        self,
+        url: str,
+        filename: str = None,
+        session: Optional[aiohttp.ClientSession] = None,
+    ) -> str:
         """获取URL的HTML内容并保存到本地文件
 
         Args:
             url: 要获取的URL
             filename: 保存的文件名，默认基于URL的episode ID生成
+            session: 复用的HTTP会话，None时临时创建
 
         Returns:
             保存的文件路径
@@ -47,9 +87,8 @@ class TestDataManager:
         if filename is None:
             # 从URL提取episode ID作为文件名
             try:
-                episode_id = url.split("/episode/")[-1].split("?")[0][:12]  # 限制长度
-                filename = f"episode_{episode_id}.html"
-            except Exception:
+                filename = self.fixture_filename(url)
+            except ValueError:
                 # 使用URL hash作为后备方案
                 filename = f"episode_{hash(url) % 1000000:06d}.html"
 
@@ -60,23 +99,38 @@ class TestDataManager:
             print(f"HTML文件已存在: {file_path}")
             return str(file_path)
 
-        # 获取HTML内容
-        async with aiohttp.ClientSession() as session:
-            print(f"正在获取HTML内容: {url}")
-            async with session.get(url, timeout=30) as response:
-                if response.status != 200:
-                    raise aiohttp.ClientError(
-                        f"HTTP {response.status}: {response.reason}"
-                    )
-                html_content = await response.text()
-
-        # 保存到文件
-        async with aiofiles.open(file_path, "w", encoding="utf-8") as f:
-            await f.write(html_content)
+        # 获取HTML内容并保存到文件
+        if session is None:
+            async with aiohttp.ClientSession() as own_session:
+                await self._fetch_to_file(own_session, url, file_path)
+        else:
+            await self._fetch_to_file(session, url, file_path)
 
         print(f"HTML内容已保存: {file_path}")
         return str(file_path)
 
+    @staticmethod
+    async def _fetch_to_file(
+        session: aiohttp.ClientSession, url: str, file_path: Path
+    ) -> None:
+        """通过给定会话获取URL内容，按块以二进制写入文件
+
+        先写入临时文件，完整下载后再改名，避免中断留下的残缺文件被当作已存在的fixture
+        """
+        print(f"正在获取HTML内容: {url}")
+        part_path = file_path.with_name(file_path.name + ".part")
+        async with session.get(url, timeout=30) as response:
+            if response.status != 200:
+                raise aiohttp.ClientError(f"HTTP {response.status}: {response.reason}")
+            try:
+                async with aiofiles.open(part_path, "wb") as f:
+                    async for chunk in response.content.iter_chunked(_FETCH_CHUNK_SIZE):
+                        await f.write(chunk)
+            except BaseException:
+                part_path.unlink(missing_ok=True)
+                raise
+        part_path.replace(file_path)
+
     def load_html_sync(self, filename: str) -> str:
         """从本地文件同步加载HTML内容（用于Mock）
 
@@ -89,13 +143,18 @@ class TestDataManager:
         Raises:
             FileNotFoundError: 文件不存在
         """
+        if filename in self._html_cache:
+            return self._html_cache[filename]
+
         file_path = self.fixtures_dir / filename
 
         if not file_path.exists():
             raise FileNotFoundError(f"测试数据文件不存在: {file_path}")
 
-        with open(file_path, "r", encoding="utf-8") as f:
-            return f.read()
+        html_content = file_path.read_text(encoding="utf-8")
+
+        self._html_cache[filename] = html_content
+        return html_content
 
     async def load_html(self, filename: str) -> str:
         """从本地文件加载HTML内容
@@ -109,13 +168,8 @@ class TestDataManager:
         Raises:
             FileNotFoundError: 文件不存在
         """
-        file_path = self.fixtures_dir / filename
-
-        if not file_path.exists():
-            raise FileNotFoundError(f"测试数据文件不存在: {file_path}")
-
-        async with aiofiles.open(file_path, "r", encoding="utf-8") as f:
-            return await f.read()
+        # fixture只有几十KB，直接同步读取比 aiofiles 的线程池调度更快
+        return self.load_html_sync(filename)
 
     async def setup_test_data(self, urls: List[str]) -> Dict[str, str]:
         """设置测试数据，获取所有URL的HTML内容
@@ -127,21 +181,25 @@ class TestDataManager:
             URL到文件路径的映射
         """
         url_to_file = {}
-        tasks = []
 
-        for url in urls:
-            task = self.fetch_and_save_html(url)
-            tasks.append((url, task))
-
-        # 并发获取所有HTML内容
-        for url, task in tasks:
-            try:
-                file_path = await task
-                url_to_file[url] = file_path
-                print(f"✅ {url} -> {file_path}")
-            except Exception as e:
-                print(f"❌ {url}: {e}")
-                raise
+        # 共用一个会话并发获取所有HTML内容，复用连接
+        async with aiohttp.ClientSession() as session:
+            results = await asyncio.gather(
+                *(self.fetch_and_save_html(url, session=session) for url in urls),
+                return_exceptions=True,
+            )
+
+        first_error = None
+        for url, result in zip(urls, results):
+            if isinstance(result, BaseException):
+                print(f"❌ {url}: {result}")
+                first_error = first_error or result
+            else:
+                url_to_file[url] = result
+                print(f"✅ {url} -> {result}")
+
+        if first_error is not None:
+            raise first_error
 
         return url_to_file
 
@@ -176,6 +234,7 @@ class TestDataManager:
         if self.fixtures_dir.exists():
             for file_path in self.fixtures_dir.glob("*.html"):
                 file_path.unlink()
+            self._html_cache.clear()
             print(f"已清理fixtures目录: {self.fixtures_dir}")
 
 
@@ -186,6 +245,11 @@ DEFAULT_TEST_URLS = [
     "https://www.xiaoyuzhoufm.com/episode/655b4216c9e7cfe025dd5a86",
 ]
 
+# 默认测试URL及其fixture文件名，导入时计算一次
+DEFAULT_URL_FILES = tuple(
+    (url, TestDataManager.fixture_filename(url)) for url in DEFAULT_TEST_URLS
+)
+
 
 async def setup_default_test_data() -> TestDataManager:
     """设置默认的测试数据